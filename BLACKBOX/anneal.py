@@ -0,0 +1,168 @@
+"""
+anneal.py  – simulated annealing over (fa, fb, ga, gb) tables
+
+Candidates are scored like test.py's evaluate_strategy: the number of
+legal MS-C pairs whose every MS-A outcome lands in the allowed set.  A
+move changes one table entry, and only the pairs that entry can reach
+are re-scored:
+
+    fa[a_c]  → the pairs of line a_c
+    fb[box]  → the pairs of box
+    ga[p]    → the pairs whose current MS-A lines include pattern p
+    gb[s]    → the pairs of the box that situation s belongs to
+
+Each restart cools geometrically from T_START to T_END.  Restarts run in
+separate processes (ctoa.py --engine anneal --workers N) that share the
+best entry found so far through ANNEAL_FILE: a restart begins from that
+entry, slightly shaken, half of the time.
+"""
+import json, math, os, random
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from backtrack import N_FA, N_FB, N_GA, N_GB, R_FA, R_FB, R_GA, R_GB, Game, \
+                      Table, compile_pairs
+from bnb       import Near, games_key
+from space     import table_index
+
+ANNEAL_FILE = Path("anneal_best.json")
+STEPS       = 60_000                 # moves per restart
+T_START     = 2.0
+T_END       = 0.05
+SHAKE       = 6                      # random entries changed when reusing the best
+
+SIZES  = (N_FA, N_FB, N_GA, N_GB)
+RADIX  = (R_FA, R_FB, R_GA, R_GB)
+N_VARS = sum(SIZES)
+
+class Model:
+    """compile_pairs output rearranged for one-entry re-scoring."""
+
+    def __init__(self, msa: Game, msc: Game):
+        pairs, lines, rel = compile_pairs(msa, msc)
+        self.games = games_key(msa, msc)
+        self.pairs = pairs
+        self.lines = {key: tuple(ps) for key, ps in lines.items()}
+        # ok[k][p]: allowed (g_A choice, g_B bit) as a bitmask over ch * R_GB + bit
+        self.sit = [[rel[k][p][0] for p in range(N_GA)] for k in range(len(pairs))]
+        self.ok  = [[sum(1 << (ch * R_GB + bit) for ch, bit in rel[k][p][1])
+                     for p in range(N_GA)] for k in range(len(pairs))]
+        self.by_fa = [[k for k, (a, _) in enumerate(pairs) if a == a_c] for a_c in range(N_FA)]
+        self.by_fb = [[k for k, (_, b) in enumerate(pairs) if b == box] for box in range(N_FB)]
+        self.by_gb = [sorted({k for k in range(len(pairs)) for p in range(N_GA)
+                              if self.sit[k][p] == s}) for s in range(N_GB)]
+        # variable v → (table, entry) over the concatenated tables
+        self.var = [(t, i) for t, n in enumerate(SIZES) for i in range(n)]
+
+    def won(self, tables, k: int) -> bool:
+        fa, fb, ga, gb = tables
+        a_c, box = self.pairs[k]
+        ok, sit = self.ok[k], self.sit[k]
+        for p in self.lines[(fa[a_c], fb[box])]:
+            if not ok[p] >> (ga[p] * R_GB + gb[sit[p]]) & 1:
+                return False
+        return True
+
+    def touched(self, tables, t: int, i: int) -> List[int]:
+        if t == 0:
+            return self.by_fa[i]
+        if t == 1:
+            return self.by_fb[i]
+        if t == 3:
+            return self.by_gb[i]
+        fa, fb = tables[0], tables[1]
+        return [k for k, (a_c, box) in enumerate(self.pairs)
+                if i in self.lines[(fa[a_c], fb[box])]]
+
+    def near(self, tables) -> Near:
+        tables = tuple(tuple(t) for t in tables)
+        failed = [self.pairs[k] for k in range(len(self.pairs)) if not self.won(tables, k)]
+        return Near(len(self.pairs) - len(failed), table_index(*tables) + 1,
+                    *tables, failed)
+
+# ──────────────────────────  one restart  ───────────────────────
+def anneal(model: Model, rng: random.Random, start: Optional[Table] = None,
+           steps: int = STEPS) -> Tuple[int, Table]:
+    """Best (wins, tables) of one cooling run, stopping early when perfect."""
+    tables = ([list(t) for t in start] if start else
+              [[rng.randrange(r) for _ in range(n)] for n, r in zip(SIZES, RADIX)])
+    won  = [model.won(tables, k) for k in range(len(model.pairs))]
+    wins = sum(won)
+    best = (wins, tuple(tuple(t) for t in tables))
+    full = len(model.pairs)
+    cool = (T_END / T_START) ** (1 / steps)
+    temp = T_START
+    for _ in range(steps):
+        if wins == full:
+            break
+        t, i = model.var[rng.randrange(N_VARS)]
+        old  = tables[t][i]
+        new  = rng.randrange(RADIX[t] - 1)
+        new += new >= old                                     # any value but old
+        ks = model.touched(tables, t, i)        # the same before and after the move
+        tables[t][i] = new
+        now = {k: model.won(tables, k) for k in ks}
+        delta = sum(now.values()) - sum(won[k] for k in ks)
+        if delta >= 0 or rng.random() < math.exp(delta / temp):
+            for k, v in now.items():
+                won[k] = v
+            wins += delta
+            if wins > best[0]:
+                best = (wins, tuple(tuple(t) for t in tables))
+        else:
+            tables[t][i] = old
+        temp *= cool
+    return best
+
+def shake(rng: random.Random, tables: Table, n: int = SHAKE) -> Table:
+    out = [list(t) for t in tables]
+    for _ in range(n):
+        t = rng.randrange(len(SIZES))
+        out[t][rng.randrange(SIZES[t])] = rng.randrange(RADIX[t])
+    return tuple(tuple(t) for t in out)
+
+# ──────────────────────────  shared best  ───────────────────────
+def load_best(games: str, path: Path = ANNEAL_FILE) -> Optional[Near]:
+    """The shared best for this pair of games, if there is one."""
+    try:
+        d = json.loads(path.read_text())
+        return Near.from_json(d) if d.get("games") == games else None
+    except (OSError, ValueError, KeyError):
+        return None
+
+def offer_best(model: Model, near: Near, lock, path: Path = ANNEAL_FILE) -> bool:
+    """Replace the shared best when `near` wins more pairs; True if it did."""
+    with lock:
+        cur = load_best(model.games, path)
+        if cur is not None and cur.wins >= near.wins:
+            return False
+        tmp = Path(f"{path}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"games": model.games,
+                                   **near.to_json(len(model.pairs))}))
+        tmp.replace(path)
+        return True
+
+def restarts(model: Model, seed: int, lock, stop, report,
+             limit: int = 0, path: Path = ANNEAL_FILE) -> int:
+    """
+    Worker loop: anneal until `stop` is set, a perfect entry exists or
+    `limit` restarts ran (0 = no limit).  Improvements of the shared best
+    go to report(near).  Returns the restarts done: 0 when `path` already
+    holds a perfect entry for these games.
+    """
+    rng  = random.Random(seed)
+    full = len(model.pairs)
+    n = 0
+    while not stop.is_set() and (not limit or n < limit):
+        shared = load_best(model.games, path)
+        if shared is not None and shared.wins == full:
+            break
+        start = None
+        if shared is not None and rng.random() < 0.5:
+            start = shake(rng, (shared.fa, shared.fb, shared.ga, shared.gb))
+        _, tables = anneal(model, rng, start)
+        n += 1
+        near = model.near(tables)
+        if offer_best(model, near, lock, path):
+            report(near)
+    return n
@@ -0,0 +1,173 @@
+"""
+backtrack.py  – constraint-propagating MS-C → MS-A reduction search
+
+Variables are assigned one at a time in product order: the 6 f_A
+entries, the 9 f_B entries, the 8 g_A cells and the 18 g_B cells.
+Once f_A(a_c) and f_B(box) are fixed, every MS-A outcome line of that
+pair becomes a binary constraint between one g_A cell and one g_B cell;
+arc consistency over those domains prunes each partial assignment.
+Solutions come out in the same order the exhaustive loop would hit them.
+"""
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from space import PATTERNS, SHAPE, pattern_id, pattern_pool, situation
+
+Game  = Dict[Tuple[int,int], List[dict]]
+Table = Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]
+Keep  = Callable[[Tuple[int, ...], Tuple[int, ...]], bool]
+
+N_FA, N_FB, N_GA, N_GB = (n for n, _ in SHAPE)
+R_FA, R_FB, R_GA, R_GB = (r for _, r in SHAPE)
+FULL_GA = (1 << R_GA) - 1
+FULL_GB = (1 << R_GB) - 1
+
+# ──────────────────────────  compiled constraints  ──────────────
+def compile_pairs(msa: Game, msc: Game):
+    """
+    Returns (pairs, lines, rel):
+      pairs : legal MS-C (a_c, box) in range(6) × range(9) order
+      lines : lines[(a_A, b_A)] → sorted MS-A Alice pattern ids
+      rel   : rel[k][p] → (situation, [(ga_choice, bit), ...]) that keep
+              pair k inside the MS-C allowed set for MS-A pattern p
+    """
+    pairs = [(a, b) for a in range(6) for b in range(9) if msc.get((a, b))]
+    lines = {key: sorted({pattern_id(o["alice_vec"]) for o in outs})
+             for key, outs in msa.items()}
+    rel = []
+    for a_c, box in pairs:
+        allowed = {(tuple(o["alice_vec"]), o["bob_bit"]) for o in msc[(a_c, box)]}
+        per_p = {}
+        for p, line in enumerate(PATTERNS):
+            pool = pattern_pool(p)
+            ok = [(ch, bit) for ch in range(R_GA) for bit in range(R_GB)
+                  if (pool[ch], bit) in allowed]
+            per_p[p] = (situation(box, line), ok)
+        rel.append(per_p)
+    return pairs, lines, rel
+
+def _revise(cons, ga_dom, gb_dom) -> bool:
+    """Arc consistency in place; False on a domain wipe-out."""
+    changed = True
+    while changed:
+        changed = False
+        for p, s, ok in cons:
+            ga, gb = ga_dom[p], gb_dom[s]
+            new_ga = new_gb = 0
+            for ch, bit in ok:
+                if ga >> ch & 1 and gb >> bit & 1:
+                    new_ga |= 1 << ch
+                    new_gb |= 1 << bit
+            if not new_ga:
+                return False
+            if new_ga != ga or new_gb != gb:
+                ga_dom[p], gb_dom[s] = new_ga, new_gb
+                changed = True
+    return True
+
+def _pair_ok(per_p, pats) -> bool:
+    """Can a single pair be satisfied on its own?"""
+    ga_dom, gb_dom = [FULL_GA]*N_GA, [FULL_GB]*N_GB
+    cons = [(p, *per_p[p]) for p in pats]
+    return _revise(cons, ga_dom, gb_dom)
+
+# ──────────────────────────  search  ────────────────────────────
+def solve(msa: Game, msc: Game,
+          prefix: Optional[Callable[[tuple, tuple], Optional[Keep]]] = None
+          ) -> Iterator[Table]:
+    """
+    Yield every perfect (fa, fb, ga, gb) in itertools.product order.
+
+    `prefix(fa, fb)` is asked once per complete (f_A, f_B): None skips the
+    prefix, otherwise it returns keep(ga, gb) that filters its solutions
+    (symmetry.solve_canonical uses this to skip non-canonical orbits).
+    """
+    pairs, lines, rel = compile_pairs(msa, msc)
+
+    by_fa: Dict[int, List[int]] = {a: [] for a in range(N_FA)}
+    by_fb: Dict[int, List[int]] = {b: [] for b in range(N_FB)}
+    for k, (a_c, box) in enumerate(pairs):
+        by_fa[a_c].append(k)
+        by_fb[box].append(k)
+
+    # pair_ok[k][(x, y)] – pair k survives f_A(a_c)=x, f_B(box)=y alone
+    pair_ok = [{(x, y): _pair_ok(rel[k], lines[(x, y)])
+                for x in range(R_FA) for y in range(R_FB)}
+               for k in range(len(pairs))]
+    fa_ok = {(a, x): all(any(pair_ok[k][(x, y)] for y in range(R_FB))
+                         for k in by_fa[a])
+             for a in range(N_FA) for x in range(R_FA)}
+
+    fa: List[Optional[int]] = [None]*N_FA
+    fb: List[Optional[int]] = [None]*N_FB
+    ga: List[Optional[int]] = [None]*N_GA
+    gb: List[Optional[int]] = [None]*N_GB
+
+    def constraints(n_fb: int):
+        """(p, situation, ok) for every pair whose f_A/f_B are fixed."""
+        cons = []
+        for box in range(n_fb):
+            for k in by_fb[box]:
+                per_p = rel[k]
+                cons.extend((p, *per_p[p])
+                            for p in lines[(fa[pairs[k][0]], fb[box])])
+        return cons
+
+    def propagate(cons):
+        """g_A / g_B domains after arc consistency, or None."""
+        ga_dom = [FULL_GA if v is None else 1 << v for v in ga]
+        gb_dom = [FULL_GB if v is None else 1 << v for v in gb]
+        if not _revise(cons, ga_dom, gb_dom):
+            return None
+        return ga_dom, gb_dom
+
+    def assign_fa(i: int):
+        if i == N_FA:
+            yield from assign_fb(0)
+            return
+        for x in range(R_FA):
+            if fa_ok[(i, x)]:
+                fa[i] = x
+                yield from assign_fa(i + 1)
+        fa[i] = None
+
+    def assign_fb(i: int):
+        if i == N_FB:
+            keep = prefix(tuple(fa), tuple(fb)) if prefix else None
+            if prefix is None or keep is not None:
+                yield from assign_ga(0, constraints(N_FB), keep)
+            return
+        for y in range(R_FB):
+            fb[i] = y
+            if all(pair_ok[k][(fa[pairs[k][0]], y)] for k in by_fb[i]) \
+                    and propagate(constraints(i + 1)) is not None:
+                yield from assign_fb(i + 1)
+        fb[i] = None
+
+    def assign_ga(i: int, cons, keep):
+        if i == N_GA:
+            yield from assign_gb(0, cons, keep)
+            return
+        doms = propagate(cons)
+        if doms is None:
+            return
+        for ch in range(R_GA):
+            if doms[0][i] >> ch & 1:
+                ga[i] = ch
+                yield from assign_ga(i + 1, cons, keep)
+        ga[i] = None
+
+    def assign_gb(i: int, cons, keep):
+        if i == N_GB:
+            if propagate(cons) is not None and (keep is None or keep(tuple(ga), tuple(gb))):
+                yield tuple(fa), tuple(fb), tuple(ga), tuple(gb)
+            return
+        doms = propagate(cons)
+        if doms is None:
+            return
+        for bit in range(R_GB):
+            if doms[1][i] >> bit & 1:
+                gb[i] = bit
+                yield from assign_gb(i + 1, cons, keep)
+        gb[i] = None
+
+    yield from assign_fa(0)
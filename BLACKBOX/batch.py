@@ -0,0 +1,58 @@
+"""
+batch.py  – vectorized g_B evaluation for a fixed (f_A, f_B, g_A) prefix
+
+Every g_B table is an 18-bit integer in itertools.product order (the
+first situation is the most significant bit), so the whole 2^18 space
+fits in one uint32 array.  A fixed prefix turns each (a_c, box, MS-A
+line) check into "this bit must be 0/1", and the survivors are the
+tables that match both masks.
+"""
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from space import SHAPE
+
+N_GB, R_GB = SHAPE[3]
+GB_SPACE   = np.arange(R_GB ** N_GB, dtype=np.uint32)      # every g_B table
+
+def gb_bit(s: int) -> int:
+    """Mask of situation s inside a packed g_B table."""
+    return 1 << (N_GB - 1 - s)
+
+def prefix_masks(compiled, fa: Sequence[int], fb: Sequence[int],
+                 ga: Sequence[int]) -> Optional[Tuple[int, int]]:
+    """
+    (must_one, must_zero) over packed g_B tables for this prefix, or None
+    when no g_B can rescue it (g_A alone already leaves the allowed set).
+    """
+    pairs, lines, rel = compiled
+    must_one = must_zero = 0
+    for k, (a_c, box) in enumerate(pairs):
+        per_p = rel[k]
+        for p in lines[(fa[a_c], fb[box])]:
+            s, ok  = per_p[p]
+            bits   = {bit for ch, bit in ok if ch == ga[p]}
+            if not bits:
+                return None
+            if len(bits) == 1:
+                if 1 in bits:
+                    must_one  |= gb_bit(s)
+                else:
+                    must_zero |= gb_bit(s)
+    if must_one & must_zero:
+        return None
+    return must_one, must_zero
+
+def surviving_gb(compiled, fa, fb, ga, tables: np.ndarray = GB_SPACE) -> np.ndarray:
+    """
+    Indices into `tables` of the g_B tables that make the prefix perfect.
+    `compiled` is backtrack.compile_pairs(msa, msc).
+    """
+    masks = prefix_masks(compiled, fa, fb, ga)
+    if masks is None:
+        return np.empty(0, dtype=np.intp)
+    must_one, must_zero = (np.uint32(m) for m in masks)
+    ok = (tables & must_one) == must_one
+    ok &= (tables & must_zero) == 0
+    return np.flatnonzero(ok)
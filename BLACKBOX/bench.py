@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+bench.py  – random games, planted reductions and engine timings
+
+Every case draws a random target game T, a random reduction into it,
+and a source game S whose allowed sets are exactly the images of T's
+outcomes under that reduction plus random extra outcomes.  The planted
+reduction is therefore perfect, and everything else the engines report
+about the pair can be cross-checked against verify():
+
+  generic   any sizes: verify() against a scalar evaluate_strategy-style
+            loop, plus loading (JSON compile and .gtb map)
+  ms        MS-C / MS-A shapes (6×9 and 6×6 inputs, 3-bit lines): also
+            success_rate, CheckOrder, a brute window around the planted
+            index, batch.surviving_gb on its prefix, anneal's per-pair
+            scoring and the first backtrack solutions
+
+    python bench.py --inputs 6 12 24 --bits 2 3 --density 0.3 0.6
+    python bench.py -o new.json --compare bench.json
+
+The report is one JSON object with sorted keys, so two runs diff
+cleanly; --compare prints the per-engine time ratio against an older
+report.  The exit status is 1 when any engine disagrees.
+"""
+import argparse, itertools, json, platform, random, tempfile, time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from gametable import GameTable, compile_game, load_table, write_table
+from space     import SHAPE, decode_index, table_index
+from verify    import from_space, verify
+
+REPORT_FILE  = Path("bench.json")
+VERIFY_CHUNK = 16384                  # candidates per verify() call
+
+class Case(NamedTuple):
+    name:    str
+    params:  dict
+    seconds: Dict[str, float]         # engine → wall time
+    items:   Dict[str, int]           # engine → candidates / pairs it handled
+    checks:  Dict[str, bool]          # cross-check → passed
+
+    @property
+    def agree(self) -> bool:
+        return all(self.checks.values())
+
+    def to_json(self) -> dict:
+        return {"name": self.name, "params": self.params, "agree": self.agree,
+                "seconds": {k: round(v, 6) for k, v in self.seconds.items()},
+                "us_per_item": {k: round(1e6 * v / self.items[k], 3)
+                                for k, v in self.seconds.items() if self.items.get(k)},
+                "items": self.items, "checks": self.checks}
+
+class Timer:
+    """Accumulates wall time per engine name."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+
+    def __call__(self, name: str, fn, *args, **kw):
+        t0 = time.perf_counter()
+        out = fn(*args, **kw)
+        self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - t0
+        return out
+
+# ──────────────────────────  random games  ──────────────────────
+def random_masks(rng: random.Random, n_a: int, n_b: int, n_out: int,
+                 density: float) -> Dict[Tuple[int, int], int]:
+    """Each outcome allowed with probability `density`, at least one per pair."""
+    masks = {}
+    for a in range(n_a):
+        for b in range(n_b):
+            m = sum(1 << o for o in range(n_out) if rng.random() < density)
+            masks[(a, b)] = m or 1 << rng.randrange(n_out)
+    return masks
+
+def save_game(dst: Path, masks, n_a: int, n_b: int, alice_bits: int,
+              bob_bits: int, bob_vec: bool) -> GameTable:
+    write_table(dst, masks, n_a, n_b, alice_bits, bob_bits, bob_vec)
+    return load_table(dst)
+
+def plant(rng: random.Random, target: GameTable, fa, fb, ga, gb, n_a: int, n_b: int,
+          alice_bits: int, bob_bits: int, density: float, legal: float
+          ) -> Dict[Tuple[int, int], int]:
+    """
+    Source masks under which verify()-form tables (one candidate, no
+    batch axis) are perfect: a legal pair allows the images of its
+    mapped T outcomes plus random extras; the others stay empty.
+    """
+    n_out = 1 << (alice_bits + bob_bits)
+    masks = {}
+    for a in range(n_a):
+        for b in range(n_b):
+            if rng.random() >= legal:
+                continue
+            t = target.mask(fa[a], fb[b])
+            image = {ga[a][o] << bob_bits | gb[b][o]
+                     for o in range(t.bit_length()) if t >> o & 1}
+            image.update(o for o in range(n_out) if rng.random() < density)
+            masks[(a, b)] = sum(1 << o for o in image)
+    return masks
+
+# ──────────────────────────  reference check  ───────────────────
+def scalar_wins(source: GameTable, target: GameTable, fa, fb, ga, gb) -> int:
+    """test.py's evaluate_strategy on verify()-form tables of one candidate."""
+    wins, shift = 0, source.bob_bits
+    for a, b in source.pairs():
+        t, allowed = target.mask(fa[a], fb[b]), source.mask(a, b)
+        won = t != 0
+        for o in range(t.bit_length()):
+            if t >> o & 1 and not allowed >> (ga[a][o] << shift | gb[b][o]) & 1:
+                won = False
+                break
+        wins += won
+    return wins
+
+def verify_wins(source: GameTable, target: GameTable, fa, fb, ga, gb) -> np.ndarray:
+    """verify() wins, VERIFY_CHUNK candidates at a time."""
+    return np.concatenate([verify(source, target, fa[lo:lo + VERIFY_CHUNK],
+                                  fb[lo:lo + VERIFY_CHUNK], ga[lo:lo + VERIFY_CHUNK],
+                                  gb[lo:lo + VERIFY_CHUNK]).wins
+                           for lo in range(0, len(fa), VERIFY_CHUNK)])
+
+def space_wins(source: GameTable, target: GameTable, fa, fb, ga, gb) -> np.ndarray:
+    """verify_wins() for stacked space.py tables, converted one chunk at a time."""
+    return np.concatenate([verify_wins(source, target, *from_space(
+                               *(t[lo:lo + VERIFY_CHUNK] for t in (fa, fb, ga, gb))))
+                           for lo in range(0, len(fa), VERIFY_CHUNK)])
+
+def load_both(tm: Timer, game: GameTable, dst: Path):
+    """Time the JSON compile path and the raw .gtb map for one game."""
+    src = dst.with_suffix(".json")
+    src.write_text(json.dumps({f"{a},{b}": game[(a, b)] for a, b in game}))
+    tm("load_json", compile_game, src, dst.with_suffix(".re.gtb"))
+    again = tm("load_gtb", load_table, dst.with_suffix(".re.gtb"))
+    tm("load_gtb", lambda: [again.mask(a, b) for a, b in again])
+    return again
+
+# ──────────────────────────  generic case  ──────────────────────
+def generic_case(rng: random.Random, tmp: Path, n: int, bits: int, density: float,
+                 legal: float, k: int) -> Case:
+    params = {"inputs": n, "bits": bits, "density": density, "legal": legal,
+              "candidates": k}
+    tm, items, checks = Timer(), {}, {}
+    n_out = 1 << (2 * bits)
+    target = save_game(tmp / "t.gtb", random_masks(rng, n, n, n_out, density),
+                       n, n, bits, bits, True)
+    nprng = np.random.default_rng(rng.randrange(1 << 32))
+    fa = nprng.integers(0, n, (k, n))
+    fb = nprng.integers(0, n, (k, n))
+    ga = nprng.integers(0, 1 << bits, (k, n, n_out))
+    gb = nprng.integers(0, 1 << bits, (k, n, n_out))
+    masks = tm("generate", plant, rng, target, *(t[0].tolist() for t in (fa, fb, ga, gb)),
+               n, n, bits, bits, density, legal)
+    source = save_game(tmp / "s.gtb", masks, n, n, bits, bits, True)
+
+    wins = tm("verify", verify_wins, source, target, fa, fb, ga, gb)
+    ref = [tm("scalar", scalar_wins, source, target,
+              *(t[i].tolist() for t in (fa, fb, ga, gb))) for i in range(k)]
+    items.update(verify=k, scalar=k)
+    checks["planted_perfect"] = bool(wins[0] == len(source.pairs()))
+    checks["verify_vs_scalar"] = [int(w) for w in wins] == ref
+
+    again = load_both(tm, source, tmp / "s.gtb")
+    items.update(load_json=n * n, load_gtb=n * n)
+    checks["load_roundtrip"] = all(again.mask(a, b) == source.mask(a, b) for a, b in source)
+    return Case(f"generic n={n} bits={bits} d={density}", params, tm.seconds, items, checks)
+
+# ──────────────────────────  MS-shaped case  ────────────────────
+def _mutate(rng: random.Random, tables, n: int):
+    out = [list(t) for t in tables]
+    for _ in range(n):
+        t = rng.randrange(len(SHAPE))
+        out[t][rng.randrange(SHAPE[t][0])] = rng.randrange(SHAPE[t][1])
+    return tuple(tuple(t) for t in out)
+
+def ms_case(rng: random.Random, tmp: Path, density: float, legal: float, k: int,
+            window: int, solutions: int) -> Case:
+    from anneal     import Model
+    from backtrack  import compile_pairs, solve
+    from batch      import GB_SPACE, surviving_gb
+    from checkorder import CheckOrder
+    from ctoa       import success_rate
+    from space      import candidates_from, to_closures
+
+    params = {"shape": "ms", "density": density, "legal": legal, "candidates": k,
+              "window": window, "solutions": solutions}
+    tm, items, checks = Timer(), {}, {}
+    target = save_game(tmp / "a.gtb", random_masks(rng, 6, 6, 64, density),
+                       6, 6, 3, 3, True)
+    planted = tuple(tuple(rng.randrange(r) for _ in range(n)) for n, r in SHAPE)
+    v = from_space(*([t] for t in planted))
+    masks = tm("generate", plant, rng, target, *(t[0].tolist() for t in v), 6, 9, 3, 1,
+               density, legal)
+    source = save_game(tmp / "c.gtb", masks, 6, 9, 3, 1, False)
+    full = len(source.pairs())
+
+    # planted, its neighbours, and random tables
+    cands = [planted] + [_mutate(rng, planted, 1 + i % 3) for i in range(k // 2)]
+    cands += [tuple(tuple(rng.randrange(r) for _ in range(n)) for n, r in SHAPE)
+              for _ in range(k - len(cands))]
+    stacked = [np.array([c[t] for c in cands]) for t in range(4)]
+    wins = tm("verify", space_wins, source, target, *stacked)
+    perfect = [bool(w == full) for w in wins]
+    rate = [tm("success_rate", success_rate, target, source, *to_closures(*c)) == 1.0
+            for c in cands]
+    order = CheckOrder(target, source)
+    depth = [tm("checkorder", order.fail_depth, *to_closures(*c)) == full for c in cands]
+    model = Model(target, source)
+    scored = [tm("anneal_score", lambda c: model.near(c).wins, c) for c in cands]
+    items.update(verify=k, success_rate=k, checkorder=k, anneal_score=k)
+    checks["planted_perfect"] = perfect[0]
+    checks["success_rate_vs_verify"] = rate == perfect
+    checks["checkorder_vs_verify"] = depth == perfect
+    checks["anneal_vs_verify"] = scored == [int(w) for w in wins]
+
+    # brute window around the planted index
+    at = table_index(*planted)
+    lo = max(0, at - window // 2)
+    walk = CheckOrder(target, source)
+    def brute():
+        return [lo + i for i, c in zip(range(window), candidates_from(lo))
+                if walk.fail_depth(*c.closures()) == full]
+    found = tm("brute", brute)
+    tables = [decode_index(lo + i) for i in range(window)]
+    window_wins = space_wins(source, target,
+                             *(np.array([t[j] for t in tables]) for j in range(4)))
+    items["brute"] = window
+    checks["brute_vs_verify"] = found == [lo + i for i, w in enumerate(window_wins) if w == full]
+    checks["brute_finds_planted"] = at in found
+
+    # batch: every g_B for the planted prefix
+    compiled = tm("compile", compile_pairs, target, source)
+    survivors = tm("batch", surviving_gb, compiled, *planted[:3])
+    prefix = [np.repeat(np.array([t]), len(GB_SPACE), 0) for t in planted[:3]]
+    gb_all = (GB_SPACE[:, None] >> np.arange(SHAPE[3][0] - 1, -1, -1)) & 1
+    gb_wins = space_wins(source, target, *prefix, gb_all)
+    items["batch"] = len(GB_SPACE)
+    checks["batch_vs_verify"] = np.array_equal(survivors, np.flatnonzero(gb_wins == full))
+
+    # backtrack: the first solutions in product order are all perfect
+    sols = tm("backtrack", lambda: list(itertools.islice(solve(target, source), solutions)))
+    if sols:
+        sol_wins = space_wins(source, target,
+                              *(np.array([s[j] for s in sols]) for j in range(4)))
+        checks["backtrack_perfect"] = bool((sol_wins == full).all())
+        checks["backtrack_ordered"] = [table_index(*s) for s in sols] == \
+                                      sorted(table_index(*s) for s in sols)
+    items["backtrack"] = len(sols)
+
+    again = load_both(tm, source, tmp / "c.gtb")
+    items.update(load_json=54, load_gtb=54)
+    checks["load_roundtrip"] = all(again.mask(a, b) == source.mask(a, b) for a, b in source)
+    return Case(f"ms d={density} legal={legal:.2g}", params, tm.seconds, items, checks)
+
+# ──────────────────────────  report  ────────────────────────────
+def report(cases: List[Case], seed: int) -> dict:
+    return {"seed": seed, "python": platform.python_version(),
+            "numpy": np.__version__, "cases": [c.to_json() for c in cases]}
+
+def compare(new: dict, old: dict) -> List[str]:
+    """Per-engine new/old time ratios for cases present in both reports."""
+    before = {c["name"]: c for c in old["cases"]}
+    out = []
+    for c in new["cases"]:
+        prev = before.get(c["name"])
+        if prev is None:
+            continue
+        for eng, s in sorted(c["seconds"].items()):
+            if prev["seconds"].get(eng):
+                out.append(f"{c['name']:<28} {eng:<14} {s / prev['seconds'][eng]:6.2f}×")
+    return out
+
+def _line(case: Case) -> str:
+    times = "  ".join(f"{k}={v:.3f}s" for k, v in case.seconds.items())
+    return f"{'ok ' if case.agree else 'BAD'}  {case.name:<28} {times}"
+
+def main():
+    ap = argparse.ArgumentParser(description="benchmark the reduction engines on random games")
+    ap.add_argument("--inputs", type=int, nargs="*", default=[6, 12],
+                    help="generic: inputs per player")
+    ap.add_argument("--bits", type=int, nargs="*", default=[2, 3],
+                    help="generic: output bits per player")
+    ap.add_argument("--density", type=float, nargs="+", default=[0.5, 0.8],
+                    help="probability an outcome is allowed")
+    ap.add_argument("--legal", type=float, default=1 / 3,
+                    help="share of source input pairs that are legal (MS-C: 18/54)")
+    ap.add_argument("--candidates", type=int, default=2000)
+    ap.add_argument("--window", type=int, default=4096,
+                    help="ms: brute candidates around the planted index")
+    ap.add_argument("--solutions", type=int, default=10,
+                    help="ms: backtrack solutions to time and check")
+    ap.add_argument("--no-ms", action="store_true", help="skip the MS-shaped cases")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("-o", "--out", type=Path, default=REPORT_FILE)
+    ap.add_argument("--compare", type=Path, help="older report to compare against")
+    args = ap.parse_args()
+
+    rng, cases = random.Random(args.seed), []
+    with tempfile.TemporaryDirectory() as d:
+        tmp = Path(d)
+        for n, bits, dens in itertools.product(args.inputs, args.bits, args.density):
+            cases.append(generic_case(rng, tmp, n, bits, dens, args.legal, args.candidates))
+            print(_line(cases[-1]))
+        if not args.no_ms:
+            for dens in args.density:
+                cases.append(ms_case(rng, tmp, dens, args.legal, args.candidates,
+                                     args.window, args.solutions))
+                print(_line(cases[-1]))
+
+    rep = report(cases, args.seed)
+    args.out.write_text(json.dumps(rep, indent=1, sort_keys=True) + "\n")
+    print(f"wrote {args.out}")
+    if args.compare:
+        print("\n".join(compare(rep, json.loads(args.compare.read_text()))))
+    bad = [f"{c.name}: {k}" for c in cases for k, ok in c.checks.items() if not ok]
+    if bad:
+        print("DISAGREE  " + "\n          ".join(bad))
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
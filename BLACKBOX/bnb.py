@@ -0,0 +1,316 @@
+"""
+bnb.py  – branch-and-bound search for the best MS-C → MS-A reductions
+
+success_rate() only says perfect / not perfect.  Here a candidate scores
+the number of legal MS-C pairs it wins (test.py's wins / len(legal_pairs))
+and the search keeps the K best it has seen.
+
+f entries are assigned in f_order(), which interleaves f_A and f_B so
+pairs are fixed early, then the g_A and g_B cells in table order.  A
+pair is lost as soon as its fixed part can no longer be completed on its
+own: no value of its open f entry works, its (f_A, f_B) fixes an MS-A
+pair it cannot survive, or arc consistency over its g cells wipes out.
+The bound adds two kinds of losses to lost[]:
+
+  conflicts   two live fixed pairs that share a g cell but cannot both
+              be won under the current domains cost at least one more;
+              a greedy set of disjoint such couples adds one each
+  lookahead   an open f entry loses, whatever its value, at least the
+              fewest of its half-fixed pairs some value fails
+
+so wins ≤ pairs − lost − conflicts − lookahead.  A subtree is cut when
+that bound, with the lowest index it contains (open entries at 0), could
+not enter the board: a tie with the K-th best entry is kept only below
+its index, as offer() does.  Values are tried fewest-losses first, then
+in index order, so good entries fill the board early.
+"""
+import hashlib, heapq, json, os
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from backtrack import (FULL_GA, FULL_GB, N_FA, N_FB, N_GA, N_GB, R_FA, R_FB,
+                       R_GA, R_GB, Game, _pair_ok, _revise, compile_pairs)
+from space     import table_index
+
+LEADERBOARD = Path("leaderboard.json")
+
+class Near(NamedTuple):
+    wins:   int
+    index:  int                          # 1-based, same count as the brute loop
+    fa:     Tuple[int, ...]
+    fb:     Tuple[int, ...]
+    ga:     Tuple[int, ...]
+    gb:     Tuple[int, ...]
+    failed: List[Tuple[int, int]]        # MS-C pairs it loses
+
+    def to_json(self, n_pairs: int) -> dict:
+        return {"score": self.wins / n_pairs, "wins": self.wins, "index": self.index,
+                "fA": self.fa, "fB": self.fb, "gA": self.ga, "gB": self.gb,
+                "failed": self.failed}
+
+    @classmethod
+    def from_json(cls, d: dict) -> "Near":
+        return cls(d["wins"], d["index"], tuple(d["fA"]), tuple(d["fB"]),
+                   tuple(d["gA"]), tuple(d["gB"]), [tuple(p) for p in d["failed"]])
+
+# ──────────────────────────  leaderboard  ───────────────────────
+def games_key(msa, msc) -> str:
+    """Fingerprint of the two compiled tables a board belongs to."""
+    return hashlib.sha1(bytes(msa.buf) + bytes(msc.buf)).hexdigest()[:16]
+
+class Leaderboard:
+    """
+    Top-K entries by wins (ties keep the lower index), persisted after
+    every change.  A saved board is reloaded on start, so a resumed run
+    prunes against everything the previous one found.
+    """
+
+    def __init__(self, k: int, n_pairs: int, games: str = "",
+                 path: Optional[Path] = LEADERBOARD):
+        self.k       = k
+        self.n_pairs = n_pairs
+        self.games   = games
+        self.path    = Path(path) if path else None
+        self.heap: List[Tuple[int, int, Near]] = []      # min-heap on (wins, -index)
+        if self.path and self.path.exists():
+            saved = json.loads(self.path.read_text())
+            if saved.get("games") == games and saved.get("pairs") == n_pairs:
+                for d in saved["entries"]:
+                    self.offer(Near.from_json(d), save=False)
+
+    @property
+    def threshold(self) -> int:
+        """Wins a new entry must beat; -1 until the board is full."""
+        return self.heap[0][0] if len(self.heap) >= self.k else -1
+
+    def beats(self, wins: int, index: int) -> bool:
+        """Would an entry with these wins and this index get onto the board?"""
+        return len(self.heap) < self.k or (wins, -index) > self.heap[0][:2]
+
+    def offer(self, near: Near, save: bool = True) -> bool:
+        key = (near.wins, -near.index)
+        if any(e.index == near.index for _, _, e in self.heap):
+            return False
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, (*key, near))
+        elif key > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, (*key, near))
+        else:
+            return False
+        if save:
+            self.save()
+        return True
+
+    def entries(self) -> List[Near]:
+        """Best first."""
+        return [e for *_, e in sorted(self.heap, reverse=True)]
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = Path(f"{self.path}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"games": self.games, "pairs": self.n_pairs,
+                                   "entries": [e.to_json(self.n_pairs)
+                                               for e in self.entries()]}))
+        tmp.replace(self.path)
+
+# ──────────────────────────  search  ────────────────────────────
+def f_order(pairs) -> List[Tuple[int, int]]:
+    """
+    f entries as (0, a_c) / (1, box), each step taking the one that fixes
+    the most pairs with those already placed (f_A first, lowest on ties),
+    so pairs can conflict as early as possible.
+    """
+    todo = [(0, a) for a in range(N_FA)] + [(1, b) for b in range(N_FB)]
+    placed, order = set(), []
+    def closes(e):
+        side, i = e
+        return sum((1 - side, p[1 - side]) in placed for p in pairs if p[side] == i)
+    while todo:
+        e = max(todo, key=lambda e: (closes(e), -todo.index(e)))
+        todo.remove(e)
+        placed.add(e)
+        order.append(e)
+    return order
+
+def search(msa: Game, msc: Game, board: Leaderboard) -> Iterator[Near]:
+    """Fill `board` with the best reductions, yielding each one it accepts."""
+    pairs, lines, rel = compile_pairs(msa, msc)
+    n_pairs = len(pairs)
+
+    by_fa: Dict[int, List[int]] = {a: [] for a in range(N_FA)}
+    by_fb: Dict[int, List[int]] = {b: [] for b in range(N_FB)}
+    for k, (a_c, box) in enumerate(pairs):
+        by_fa[a_c].append(k)
+        by_fb[box].append(k)
+
+    pair_ok = [{(x, y): _pair_ok(rel[k], lines[(x, y)])
+                for x in range(R_FA) for y in range(R_FB)}
+               for k in range(n_pairs)]
+    fa_ok = [[any(pair_ok[k][(x, y)] for y in range(R_FB)) for x in range(R_FA)]
+             for k in range(n_pairs)]
+    fb_ok = [[any(pair_ok[k][(x, y)] for x in range(R_FA)) for y in range(R_FB)]
+             for k in range(n_pairs)]
+    order = f_order(pairs)
+
+    fa: List[Optional[int]] = [None]*N_FA
+    fb: List[Optional[int]] = [None]*N_FB
+    ga_dom = [FULL_GA]*N_GA
+    gb_dom = [FULL_GB]*N_GB
+    lost   = [False]*n_pairs
+    cons:  List[Optional[list]] = [None]*n_pairs       # per pair, once its f is fixed
+    cells: List[int] = [0]*n_pairs                     # its g cells as a mask, g_B after g_A
+    sid:   List[int] = [0]*n_pairs                     # (k, x, y) as one int
+    by_ga: List[List[int]] = [[] for _ in range(N_GA)]
+    by_gb: List[List[int]] = [[] for _ in range(N_GB)]
+    clash: Dict[int, bool] = {}                         # couples under full g domains
+
+    n_sid = n_pairs * R_FA * R_FB
+    sid_cons, sid_cells = [], []
+    for k in range(n_pairs):
+        for x in range(R_FA):
+            for y in range(R_FB):
+                c = [(p, *rel[k][p]) for p in lines[(x, y)]]
+                sid_cons.append(c)
+                sid_cells.append(sum(1 << p for p in {p for p, _, _ in c})
+                                 | sum(1 << (N_GA + s) for s in {s for _, s, _ in c}))
+
+    def alive(k: int) -> bool:
+        return _revise(cons[k], list(ga_dom), list(gb_dom))
+
+    def fix(k: int):
+        a_c, box = pairs[k]
+        sid[k] = (k * R_FA + fa[a_c]) * R_FB + fb[box]
+        cons[k], cells[k] = sid_cons[sid[k]], sid_cells[sid[k]]
+
+    def conflicts(g_stage: bool) -> int:
+        """Disjoint couples of live fixed pairs sharing a g cell that cannot both be won."""
+        live = [k for k in range(n_pairs) if cons[k] is not None and not lost[k]]
+        used = n = 0
+        for i, k in enumerate(live):
+            if used >> k & 1:
+                continue
+            for j in live[i + 1:]:
+                if used >> j & 1 or not cells[k] & cells[j]:
+                    continue
+                if g_stage:
+                    bad = not _revise(cons[k] + cons[j], list(ga_dom), list(gb_dom))
+                else:
+                    key = sid[k] * n_sid + sid[j]
+                    bad = clash.get(key)
+                    if bad is None:
+                        bad = clash[key] = not _revise(cons[k] + cons[j],
+                                                       [FULL_GA]*N_GA, [FULL_GB]*N_GB)
+                if bad:
+                    used |= 1 << k | 1 << j
+                    n += 1
+                    break
+        return n
+
+    def lookahead() -> int:
+        """
+        Each open f entry loses, whatever its value, at least the fewest of
+        its live pairs with the other side fixed that some value fails.
+        Those pairs belong to no other open entry, so the minima add up.
+        """
+        n = 0
+        for f, other, by, radix, side in ((fa, fb, by_fa, R_FA, 0), (fb, fa, by_fb, R_FB, 1)):
+            for i, v in enumerate(f):
+                if v is not None:
+                    continue
+                ks = [k for k in by[i] if not lost[k] and other[pairs[k][1 - side]] is not None]
+                if ks:
+                    keys = [(k, other[pairs[k][1 - side]]) for k in ks]
+                    n += min(sum(not pair_ok[k][(u, w) if side == 0 else (w, u)]
+                                 for k, w in keys) for u in range(radix))
+        return n
+
+    def extra(newly, g_stage: bool = False) -> int:
+        """Losses the bound adds beyond lost[], with `newly` counted as lost."""
+        for k in newly:
+            lost[k] = True
+        n = conflicts(g_stage) + (0 if g_stage else lookahead())
+        for k in newly:
+            lost[k] = False
+        return n
+
+    def floor() -> int:
+        """Lowest 1-based index under the current assignment: open entries at 0."""
+        return table_index([v or 0 for v in fa], [v or 0 for v in fb],
+                           [d.bit_length() - 1 if not d & d - 1 else 0 for d in ga_dom],
+                           [d.bit_length() - 1 if not d & d - 1 else 0 for d in gb_dom]) + 1
+
+    def branch(n_lost: int, options):
+        """
+        Try (losses, bound losses, value, newly lost pairs, lowest index)
+        options best-first while the bound can still enter the board.
+        """
+        for n_new, n_bound, value, newly, low in sorted(options, key=lambda o: (o[1], o[2])):
+            if not board.beats(n_pairs - n_lost - n_bound, low):
+                return                             # sorted: the rest are no better
+            for k in newly:
+                lost[k] = True
+            yield value, n_lost + n_new
+            for k in newly:
+                lost[k] = False
+
+    def assign_f(step: int, n_lost: int):
+        if step == len(order):
+            for g in by_ga + by_gb:
+                g.clear()
+            for k in range(n_pairs):
+                if not lost[k]:
+                    for p, s, _ in cons[k]:
+                        by_ga[p].append(k)
+                        by_gb[s].append(k)
+            yield from assign_g(0, n_lost)
+            return
+        side, i = order[step]
+        table, radix, ks, one_ok = ((fa, R_FA, by_fa[i], fa_ok) if side == 0 else
+                                    (fb, R_FB, by_fb[i], fb_ok))
+        live = [k for k in ks if not lost[k]]
+        closed = [k for k in live if (fb[pairs[k][1]] if side == 0 else fa[pairs[k][0]])
+                  is not None]
+        opts = []
+        for v in range(radix):
+            table[i] = v
+            newly = [k for k in live if not (pair_ok[k][(fa[pairs[k][0]], fb[pairs[k][1]])]
+                                             if k in closed else one_ok[k][v])]
+            for k in closed:
+                fix(k)
+            opts.append((len(newly), len(newly) + extra(newly), v, newly, floor()))
+        for v, n in branch(n_lost, opts):
+            table[i] = v
+            for k in closed:
+                fix(k)
+            yield from assign_f(step + 1, n)
+        for k in closed:
+            cons[k] = None
+        table[i] = None
+
+    def assign_g(i: int, n_lost: int):
+        """g_A cells 0..7 then g_B cells 8..25."""
+        if i == N_GA + N_GB:
+            yield n_lost
+            return
+        dom, cell, radix, touched = ((ga_dom, i, R_GA, by_ga[i]) if i < N_GA else
+                                     (gb_dom, i - N_GA, R_GB, by_gb[i - N_GA]))
+        touched = sorted({k for k in touched if not lost[k]})
+        saved, opts = dom[cell], []
+        for v in range(radix):
+            dom[cell] = 1 << v
+            newly = [k for k in touched if not alive(k)]
+            opts.append((len(newly), len(newly) + extra(newly, True), v, newly, floor()))
+        for v, n in branch(n_lost, opts):
+            dom[cell] = 1 << v
+            yield from assign_g(i + 1, n)
+        dom[cell] = saved
+
+    for n_lost in assign_f(0, 0):
+        ga = tuple(d.bit_length() - 1 for d in ga_dom)
+        gb = tuple(d.bit_length() - 1 for d in gb_dom)
+        near = Near(n_pairs - n_lost, table_index(fa, fb, ga, gb) + 1,
+                    tuple(fa), tuple(fb), ga, gb,
+                    [pairs[k] for k in range(n_pairs) if lost[k]])
+        if board.offer(near):
+            yield near
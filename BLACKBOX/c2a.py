@@ -1,11 +1,10 @@
-import json
 from pathlib import Path
 
-msa_path = Path("MSA/msa_blackbox_outputs.json")
-msc_path = Path("MSC/msc_blackbox_outputs.json")   
+from gametable import code_vec, load_game
+from verify    import verify
 
-msa = json.loads(msa_path.read_text())
-msc = json.loads(msc_path.read_text())
+msa = load_game(Path("MSA/msa_blackbox_outputs.json"))
+msc = load_game(Path("MSC/msc_blackbox_outputs.json"))
 
 
 def decode_line(idx):
@@ -25,35 +24,21 @@ def map_inputs_msc_to_msa(a_msc, b_msc):
     else:                                  # Alice has column a_idx
         return a_msc, r_b                  # Bob queries *row*    r_b  in MS-A
 
-legal_pairs = 0
-working_pairs = 0
-
-for a_msc in range(6):
-    for b_msc in range(9):
-        msc_key = f"{a_msc},{b_msc}"
-        if not msc[msc_key]:               # empty list ⇒ illegal pair
-            continue
-
-        legal_pairs += 1
-
-        a_msa, b_msa = map_inputs_msc_to_msa(a_msc, b_msc)
-        msa_key = f"{a_msa},{b_msa}"
-
-        msa_outs = msa[msa_key]
-        msc_outs = {(tuple(o["alice_vec"]), o["bob_bit"]) for o in msc[msc_key]}
-
-        ok = True
-        for out in msa_outs:
-            alice_vec  = out["alice_vec"]
-            r_b, c_b   = cell_coords(b_msc)
-            derived_bit = alice_vec[c_b] if a_msc < 3 else alice_vec[r_b]
-
-            if (tuple(alice_vec), derived_bit) not in msc_outs:
-                ok = False
-                break
-
-        working_pairs += ok
-
+# Bob's MS-A input and bit depend on the whole MS-C pair here, so fb / gb
+# use verify()'s per-pair form: fb[k, a, b] and gb[k, a, b, o].
+n_out  = 1 << (msa.alice_bits + msa.bob_bits)
+lines  = [code_vec(o >> msa.bob_bits, msa.alice_bits) for o in range(n_out)]
+fa     = [[map_inputs_msc_to_msa(a_msc, 0)[0] for a_msc in range(6)]]
+fb     = [[[map_inputs_msc_to_msa(a_msc, b_msc)[1] for b_msc in range(9)]
+           for a_msc in range(6)]]
+ga     = [[[o >> msa.bob_bits for o in range(n_out)] for _ in range(6)]]
+gb     = [[[[line[cell_coords(b_msc)[1]] if a_msc < 3 else line[cell_coords(b_msc)[0]]
+             for line in lines]
+            for b_msc in range(9)] for a_msc in range(6)]]
+result = verify(msc, msa, fa, fb, ga, gb)
+
+legal_pairs   = len(result.pairs)
+working_pairs = int(result.wins[0])
 
 success = 100 * working_pairs / legal_pairs if legal_pairs else 0
 print(f"Legal input pairs   : {legal_pairs}")
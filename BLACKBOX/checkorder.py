@@ -0,0 +1,112 @@
+"""
+checkorder.py  – fail-first ordering of success_rate's checks
+
+fail_depth() in ctoa.py walks msc.pairs() in table order and each
+pair's MS-A lines in code order.  Most candidates die on a handful of
+checks, so walking those first cuts the work per rejection.
+
+CheckOrder keeps decayed counters of where candidates are rejected:
+
+    pair k        rejects at k  /  candidates that reached k
+    (k, line)     rejects on that MS-A line of pair k
+
+Every REORDER_EVERY rejections the pairs are re-sorted by reject rate
+and every counter is multiplied by DECAY, so the order follows the part
+of the space the scan is currently in.  Lines of a pair are tried in
+reject order too; that order is cached per (pair, f_A, f_B) value.
+With every=0 (--fixed-order) nothing is re-sorted: pairs and lines keep
+fail_depth()'s table order.
+
+checks_per_reject() is the mean number of line checks a rejected
+candidate cost since the last call; `failed` holds the (pair, line) of
+the latest rejection for nogood.py.
+"""
+from typing import Dict, List, Tuple
+
+from gametable import vec_code
+
+REORDER_EVERY = 1 << 16              # rejections between re-sorts
+DECAY         = 0.5                  # counter weight kept at each re-sort
+
+class CheckOrder:
+    def __init__(self, msa, msc, every: int = REORDER_EVERY, decay: float = DECAY):
+        self.msa    = msa
+        self.pairs  = list(msc.pairs())
+        self.masks  = [msc.mask(a_c, box_c) for a_c, box_c in self.pairs]
+        self.shift  = msc.bob_bits
+        self.every  = every
+        self.decay  = decay
+        n = len(self.pairs)
+        self.order  = list(range(n))
+        self.fails  = [0.0]*n            # rejects at pair k
+        self.seen   = [0.0]*n            # candidates that reached pair k
+        self.depths = [0]*(n + 1)        # fail depths since the last re-sort
+        self.line_fails: Dict[Tuple[int, tuple], float] = {}
+        self.lines: Dict[Tuple[int, int, int], tuple] = {}
+        self.rejected = 0
+        self.checks   = 0                # line checks of those rejections
+        self.window   = (0, 0)           # (rejected, checks) at the last report
+        self.failed: Tuple[int, tuple] = (-1, ())
+
+    def fail_depth(self, f_A, f_B, g_A, g_B) -> int:
+        """Pairs passed, in the current order, before the first failure."""
+        pairs, masks, shift, cache = self.pairs, self.masks, self.shift, self.lines
+        checks = 0
+        for depth, k in enumerate(self.order):
+            a_c, box_c = pairs[k]
+            key = (k, f_A(a_c), f_B(box_c))
+            lines = cache.get(key)
+            if lines is None:
+                lines = self._sort_lines(key)
+            allowed = masks[k]
+            for line in lines:
+                checks += 1
+                if not allowed >> (vec_code(g_A(a_c, line)) << shift | g_B(box_c, line)) & 1:
+                    self._reject(k, line, depth, checks)
+                    return depth
+        self.depths[-1] += 1
+        return len(pairs)
+
+    def _sort_lines(self, key) -> tuple:
+        """Lines of pair k at (x, y), in reject order; in code order when every=0."""
+        k, x, y = key
+        lines = tuple(tuple(ln) for ln in self.msa.alice_lines(x, y))
+        if self.every:
+            lines = tuple(sorted(lines, key=lambda ln: -self.line_fails.get((k, ln), 0.0)))
+        self.lines[key] = lines
+        return lines
+
+    def _reject(self, k: int, line: tuple, depth: int, checks: int):
+        self.failed = (k, line)
+        self.fails[k] += 1
+        self.line_fails[(k, line)] = self.line_fails.get((k, line), 0.0) + 1
+        self.depths[depth] += 1
+        self.rejected += 1
+        self.checks += checks
+        if self.every and not self.rejected % self.every:
+            self.reorder()
+
+    def reorder(self):
+        """Fold the depth counts into per-pair reach, decay, and re-sort."""
+        reached = sum(self.depths)
+        for depth, k in enumerate(self.order):
+            self.seen[k] += reached
+            reached -= self.depths[depth]
+        self.depths = [0]*len(self.depths)
+        rate = [f / s if s else 0.0 for f, s in zip(self.fails, self.seen)]
+        self.order.sort(key=lambda k: -rate[k])
+        d = self.decay
+        self.fails = [f * d for f in self.fails]
+        self.seen  = [s * d for s in self.seen]
+        self.line_fails = {key: v * d for key, v in self.line_fails.items()}
+        self.lines.clear()
+
+    def checks_per_reject(self) -> float:
+        """Mean line checks per rejected candidate since the previous call."""
+        rejected, checks = self.rejected - self.window[0], self.checks - self.window[1]
+        self.window = (self.rejected, self.checks)
+        return checks / rejected if rejected else 0.0
+
+    def current(self) -> List[Tuple[int, int]]:
+        """MS-C pairs in the order they are checked now."""
+        return [self.pairs[k] for k in self.order]
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+classical.py  – exact classical value of a game by meet-in-the-middle
+
+The classical value is the largest fraction of legal input pairs (pairs
+with at least one allowed outcome, as in verify()) that one
+deterministic strategy pair wins: Alice answers code A[a], Bob answers
+B[b].  Once A is fixed Bob's best reply splits by column,
+
+    wins(A) = Σ_b max_β #{a : (A[a], β) allowed on (a, b)}
+
+so only Alice's side is enumerated.  Every (a, α) choice becomes a win
+profile over Bob's (b, β) cells; an Alice strategy's profile is the sum
+of its rows' profiles and its score is the per-column max, summed.
+
+  dominance   an answer whose cells are a subset of another answer's
+              for the same input is never needed and is dropped, on
+              both sides; profiles only keep Bob's remaining cells
+  halves      Alice's inputs are split in two; each half's strategies
+              are summed into profiles, and strategies with the same
+              profile (symmetric answers, irrelevant inputs) collapse
+              into one
+  meet        Σ_b max is at most the sum of the halves' own Σ_b max,
+              so with both halves sorted by that bound a left profile
+              only meets the right profiles that can still beat the
+              best score, in one vectorised pass
+
+The side with fewer strategies after dominance plays "Alice".  The
+result carries optimal answers for both players, re-scored directly.
+
+    python classical.py MSA/msa_blackbox_outputs.json MSB/msb_blackbox_outputs.json
+"""
+import argparse, math, time
+from pathlib import Path
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+from gametable import GameTable, code_vec, load_game
+
+class Value(NamedTuple):
+    wins:     int
+    pairs:    int                    # legal input pairs
+    alice:    Tuple[int, ...]        # output code per Alice input
+    bob:      Tuple[int, ...]        # output code per Bob input
+    profiles: Tuple[int, int]        # distinct half profiles after collapsing
+
+    @property
+    def value(self) -> float:
+        return self.wins / self.pairs if self.pairs else 0.0
+
+# ──────────────────────────  win tables  ────────────────────────
+def win_table(game: GameTable) -> np.ndarray:
+    """W[a, α, b, β]: (α, β) is allowed on the legal pair (a, b)."""
+    n_al, n_be = 1 << game.alice_bits, 1 << game.bob_bits
+    w = np.zeros((game.n_a, n_al, game.n_b, n_be), dtype=bool)
+    for a, b in game.pairs():
+        m = game.mask(a, b)
+        for o in range(m.bit_length()):
+            if m >> o & 1:
+                w[a, o >> game.bob_bits, b, o & n_be - 1] = True
+    return w
+
+def undominated(rows: np.ndarray) -> List[int]:
+    """Answers whose win cells are not contained in another answer's."""
+    flat = rows.reshape(len(rows), -1)
+    keep = []
+    for i, r in enumerate(flat):
+        sub = (flat >= r).all(1)                     # answers covering r
+        sub[i] = False
+        same = (flat == r).all(1)
+        # dominated by a strict superset, or by an identical earlier answer
+        if not (sub & ~same).any() and not same[:i].any():
+            keep.append(i)
+    return keep or [0]
+
+# ──────────────────────────  halves  ────────────────────────────
+def half_profiles(w: np.ndarray, inputs: List[int], options: List[List[int]]
+                  ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (profiles (m, cells), choices (m, len(inputs))): one representative
+    strategy per distinct summed profile of the given Alice inputs, over
+    w's flattened (b, β) cells.
+    """
+    cells = w.shape[2]
+    prof = np.zeros((1, cells), dtype=np.int16)
+    choice = np.zeros((1, 0), dtype=np.intp)
+    for a in inputs:
+        rows = w[a, options[a]].astype(np.int16)
+        prof = (prof[:, None, :] + rows[None, :, :]).reshape(-1, cells)
+        choice = np.concatenate([np.repeat(choice, len(rows), 0),
+                                 np.tile(np.asarray(options[a]), len(choice))[:, None]], 1)
+        prof, first = np.unique(prof, axis=0, return_index=True)
+        choice = choice[first]
+    return prof, choice
+
+def _best(prof: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Σ over Bob's inputs of the best answer's count, per profile."""
+    return np.maximum.reduceat(prof, starts, axis=1).sum(1)
+
+# ──────────────────────────  value  ─────────────────────────────
+def classical_value(game: GameTable) -> Value:
+    w = win_table(game)
+    pairs = len(game.pairs())
+    opts_a = [undominated(w[a]) for a in range(game.n_a)]
+    wt = w.transpose(2, 3, 0, 1)
+    opts_b = [undominated(wt[b]) for b in range(game.n_b)]
+    swap = (sum(math.log(len(o)) for o in opts_b) < sum(math.log(len(o)) for o in opts_a))
+    if swap:
+        w, opts_a, opts_b = wt, opts_b, opts_a
+    n_a = w.shape[0]
+    cols = [(b, beta) for b, o in enumerate(opts_b) for beta in o]
+    starts = np.cumsum([0] + [len(o) for o in opts_b[:-1]])
+    w = w[:, :, [b for b, _ in cols], [beta for _, beta in cols]]   # (a, α, cell)
+
+    left, right = list(range(n_a // 2)), list(range(n_a // 2, n_a))
+    lp, lc = half_profiles(w, left, opts_a)
+    rp, rc = half_profiles(w, right, opts_a)
+    lb, rb = _best(lp, starts), _best(rp, starts)
+    lo, ro = np.argsort(-lb, kind="stable"), np.argsort(-rb, kind="stable")
+    lp, lc, lb, rp, rc, rb = lp[lo], lc[lo], lb[lo], rp[ro], rc[ro], rb[ro]
+
+    best, arg = -1, (0, 0)
+    for i in range(len(lp)):
+        if lb[i] + rb[0] <= best:
+            break
+        t = int(np.searchsorted(-rb, lb[i] - best, side="left"))   # rb[j] > best - lb[i]
+        sc = _best(lp[i] + rp[:t], starts)
+        j = int(sc.argmax()) if t else 0
+        if t and sc[j] > best:
+            best, arg = int(sc[j]), (i, j)
+
+    i, j = arg
+    mine = tuple(int(v) for v in np.concatenate([lc[i], rc[j]]))
+    both = lp[i] + rp[j]
+    reply = tuple(o[int(both[s:s + len(o)].argmax())] for s, o in zip(starts, opts_b))
+    alice, bob = (reply, mine) if swap else (mine, reply)
+    wins = score(game, alice, bob)
+    if wins != best:
+        raise RuntimeError(f"direct re-score {wins} disagrees with the search's {best}")
+    return Value(wins, pairs, alice, bob, (len(lp), len(rp)))
+
+def score(game: GameTable, alice, bob) -> int:
+    """Legal pairs won by fixed answers (the reference check)."""
+    return sum(game.mask(a, b) >> (alice[a] << game.bob_bits | bob[b]) & 1
+               for a, b in game.pairs())
+
+# ──────────────────────────  main  ──────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="exact classical value of games")
+    ap.add_argument("games", type=Path, nargs="+", help="JSON or .gtb games")
+    args = ap.parse_args()
+    for path in args.games:
+        game = load_game(path)
+        t0 = time.perf_counter()
+        v = classical_value(game)
+        dt = time.perf_counter() - t0
+        print(f"{path}: {v.wins}/{v.pairs} = {v.value:.6f}  "
+              f"({v.profiles[0]:,}+{v.profiles[1]:,} half profiles, {dt:.2f} s)")
+        print("  alice:", [code_vec(c, game.alice_bits) for c in v.alice])
+        print("  bob:  ", [code_vec(c, game.bob_bits) if game.bob_vec else c for c in v.bob])
+
+if __name__ == "__main__":
+    main()
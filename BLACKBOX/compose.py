@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+compose.py  – compose reductions and search the graph of known ones
+
+Reductions chain: with R₁ from S to M and R₂ from M to T (verify()-form
+tables, one candidate), S's players run
+
+    x = fa₁[a], y = fb₁[b]          M inputs
+    fa₂[x], fb₂[y]                   T inputs
+    α = ga₂[x][o], β = gb₂[y][o]     M outputs for the T outcome o
+    ga₁[a][α·β], gb₁[b][α·β]         S outputs            (α·β = α << M.bob_bits | β)
+
+compose() builds those tables with NumPy indexing.  Per-pair forms
+(fb[a][b], gb[a][b][o]) pass through, and the result drops back to the
+plain form wherever it does not depend on Alice's input.  ga₁ must not
+read M's Bob code, since verify() has no per-pair ga; local reductions
+(reduction.py, ctoa.py's space, test.py, c2a.py) never do.
+
+Graph takes its edges from the reductions the verdict cache (verdicts.py)
+last found perfect, without re-checking them: opening a Graph is one
+query.  path() is a breadth-first search over game files; reduce()
+re-checks only the edges on the path it found against the current games
+(dropping stale ones and searching again), composes the path, checks the
+result with verify_one() and stores it as a new edge.  `refresh`
+re-checks every stored reduction first.
+
+    python compose.py edges
+    python compose.py query MSC MSA
+    python compose.py refresh
+"""
+import argparse, json
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from gametable import GameTable, load_game
+from verdicts  import VERDICT_DB, VerdictCache
+from verify    import Result, verify_one
+
+NAMES = {
+    "MSA": "MSA/msa_blackbox_outputs.json",
+    "MSB": "MSB/msb_blackbox_outputs.json",
+    "MSC": "MSC/msc_blackbox_outputs.json",
+}
+
+class Edge(NamedTuple):
+    id:     str
+    source: str
+    target: str
+    label:  str
+
+# ──────────────────────────  composition  ───────────────────────
+def _same(t: np.ndarray, axis: int) -> bool:
+    return bool((t == t.take([0], axis)).all())
+
+def compose(mid: GameTable, first, second) -> List[np.ndarray]:
+    """verify()-form tables of `first` (S → mid) followed by `second` (mid → T)."""
+    fa1, fb1, ga1, gb1 = (np.asarray(t, dtype=np.intp) for t in first)
+    fa2, fb2, ga2, gb2 = (np.asarray(t, dtype=np.intp) for t in second)
+    n_a = len(fa1)
+    n_b = fb1.shape[-1] if fb1.ndim == 2 else len(fb1)
+    a = np.arange(n_a)[:, None]
+    b = np.arange(n_b)[None, :]
+    x = np.broadcast_to(fa1[a], (n_a, n_b))
+    y = fb1[a, b] if fb1.ndim == 2 else np.broadcast_to(fb1[b], (n_a, n_b))
+
+    fa = fa2[fa1]
+    fb = fb2[x, y] if fb2.ndim == 2 else fb2[y]                      # (n_a, n_b)
+    alpha = ga2[x]                                                    # (n_a, n_b, o)
+    beta  = gb2[x, y] if gb2.ndim == 3 else gb2[y]
+    o_mid = alpha << mid.bob_bits | beta
+    ga = ga1[a[..., None], o_mid]
+    gb = gb1[a[..., None], b[..., None], o_mid] if gb1.ndim == 3 else gb1[b[..., None], o_mid]
+
+    if not _same(ga, 1):
+        raise ValueError("composed Alice output depends on Bob's input: the first "
+                         "reduction's ga reads the intermediate game's Bob code")
+    return [fa, fb[0] if _same(fb, 0) else fb, ga[:, 0], gb[0] if _same(gb, 0) else gb]
+
+def compose_path(games: List[GameTable], tables: List[list]) -> List[np.ndarray]:
+    """Fold compose() over a chain; games[i] sits between tables[i-1] and tables[i]."""
+    out = [np.asarray(t, dtype=np.intp) for t in tables[0]]
+    for mid, nxt in zip(games[1:], tables[1:]):
+        out = compose(mid, out, nxt)
+    return out
+
+# ──────────────────────────  graph  ─────────────────────────────
+class Graph:
+    """Perfect reductions in the verdict cache, by source game file."""
+
+    def __init__(self, cache: VerdictCache):
+        self.cache = cache
+        self.load()
+
+    def load(self):
+        self.out: Dict[str, List[Edge]] = {}
+        for rid, src, tgt, label in self.cache.db.execute(
+                "SELECT id, source, target, label FROM reductions "
+                "WHERE wins = pairs AND pairs > 0 ORDER BY rowid"):
+            self.out.setdefault(src, []).append(Edge(rid, src, tgt, label))
+
+    def refresh(self):
+        """Re-check every stored reduction and reload the edges."""
+        for _ in self.cache.refresh():
+            pass
+        self.load()
+
+    def edges(self) -> List[Edge]:
+        return [e for es in self.out.values() for e in es]
+
+    def path(self, source: str, target: str) -> Optional[List[Edge]]:
+        """Fewest-edge chain of known reductions, None when there is none."""
+        prev: Dict[str, Optional[Edge]] = {source: None}
+        todo = deque([source])
+        while todo:
+            node = todo.popleft()
+            if node == target:
+                chain = []
+                while prev[node] is not None:
+                    chain.append(prev[node])
+                    node = prev[node].source
+                return chain[::-1]
+            for e in self.out.get(node, ()):
+                if e.target not in prev:
+                    prev[e.target] = e
+                    todo.append(e.target)
+        return None
+
+    @staticmethod
+    def _perfect(v) -> bool:
+        return v.pairs > 0 and v.wins == v.pairs
+
+    def tables(self, rid: str) -> list:
+        (text,) = self.cache.db.execute(
+            "SELECT tables FROM reductions WHERE id=?", (rid,)).fetchone()
+        return json.loads(text)
+
+    def reduce(self, source: str, target: str
+               ) -> Optional[Tuple[List[Edge], List[np.ndarray], Result]]:
+        """(path, composed tables, verify_one result), stored when perfect."""
+        loaded: Dict[str, GameTable] = {}
+
+        def game(p: str) -> GameTable:
+            if p not in loaded:
+                loaded[p] = load_game(Path(p))
+            return loaded[p]
+
+        while True:
+            chain = self.path(source, target)
+            if not chain:
+                return None
+            games = [game(e.source) for e in chain] + [game(target)]
+            stale = [e for e, s, t in zip(chain, games, games[1:])
+                     if not self._perfect(self.cache.check(e.id, s, t))]
+            self.cache.commit()
+            if not stale:
+                break
+            for e in stale:                      # no longer perfect on the current games
+                self.out[e.source].remove(e)
+        tables = compose_path(games, [self.tables(e.id) for e in chain])
+        res = verify_one(games[0], games[-1], *tables)
+        if len(chain) > 1 and res.wins[0] == len(res.pairs):
+            via = " → ".join(Path(e.target).stem for e in chain[:-1])
+            rid = self.cache.add(source, target, *tables, label=f"composed via {via}")
+            self.cache.check(rid, games[0], games[-1])
+            self.cache.commit()
+        return chain, tables, res
+
+# ──────────────────────────  main  ──────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="compose known reductions")
+    ap.add_argument("cmd", choices=["edges", "query", "refresh"])
+    ap.add_argument("games", nargs="*", help="query: SOURCE TARGET (MSA/MSB/MSC or paths)")
+    ap.add_argument("--db", type=Path, default=VERDICT_DB)
+    args = ap.parse_args()
+
+    graph = Graph(VerdictCache(args.db))
+    if args.cmd == "refresh":
+        graph.refresh()
+        print(f"{len(graph.edges()):,} perfect reduction(s) after re-checking")
+        return
+    if args.cmd == "edges":
+        for e in graph.edges():
+            print(f"{e.id}  {e.source} → {e.target}  {e.label}")
+        return
+    if len(args.games) != 2:
+        ap.error("query takes SOURCE TARGET")
+    source, target = (NAMES.get(g, g) for g in args.games)
+    if source == target:
+        print("a game reduces to itself")
+        return
+    found = graph.reduce(source, target)
+    if found is None:
+        print(f"no known chain {source} → {target}")
+        return
+    chain, tables, res = found
+    for e in chain:
+        print(f"  {e.source} → {e.target}  [{e.id}] {e.label}")
+    wins = int(res.wins[0])
+    print(f"composed: {wins}/{len(res.pairs)}"
+          + ("" if wins == len(res.pairs) else f"  first failure {res.failure(0)}"))
+    print(json.dumps({k: t.tolist() for k, t in zip(("fa", "fb", "ga", "gb"), tables)}))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+count.py  – exact number of perfect MS-C → MS-A reductions
+
+Once g_A is fixed the remaining problem splits along boxes: every g_B
+situation belongs to exactly one box, and a legal pair (a_c, box) only
+ties f_A(a_c) to that box's f_B value and g_B cells.  For one g_A table
+
+    N(g_A) = Σ_fa  Π_box  C_box[fa restricted to the lines through box]
+
+where C_box counts the (f_B(box), g_B cells of box) choices that keep
+every pair of the box perfect.  The sum over f_A is one einsum, done
+for a whole chunk of g_A tables at a time, so the 6^15 (f_A, f_B)
+prefixes are never walked.
+
+N(g_A) is invariant under the position symmetries of symmetry.py, so
+with a group only one g_A per ψ-class is evaluated and weighted by the
+size of its class.
+"""
+import string
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from backtrack import N_FA, N_FB, N_GA, R_FA, R_FB, R_GA, R_GB, Game, compile_pairs
+from space     import PATTERNS, situation
+
+GA_SPACE = np.array(np.unravel_index(np.arange(R_GA**N_GA), (R_GA,)*N_GA)).T   # (4^8, 8)
+CHUNK    = 4096                                 # g_A tables per einsum
+EINSUM   = ("greedy", 1 << 28)                  # allow intermediates past input size
+
+class Tally(NamedTuple):
+    total:      int                 # perfect reductions
+    ga_tables:  int                 # g_A tables that admit at least one
+    ga_classes: int                 # g_A tables actually evaluated
+
+class Box(NamedTuple):
+    lines: Tuple[int, ...]          # a_c with (a_c, box) legal
+    cells: Tuple[int, ...]          # its g_B situations
+    pairs: Tuple[int, ...]          # compile_pairs index of (a_c, box), per line
+
+# ──────────────────────────  structure  ─────────────────────────
+def boxes(compiled) -> List[Box]:
+    pairs = compiled[0]
+    out, seen = [], set()
+    for box in range(N_FB):
+        cells = tuple(sorted({situation(box, line) for line in PATTERNS}))
+        if seen & set(cells):
+            raise ValueError(f"g_B cells of box {box} are shared with another box")
+        seen.update(cells)
+        ks = [k for k, (_, b) in enumerate(pairs) if b == box]
+        out.append(Box(tuple(pairs[k][0] for k in ks), cells, tuple(ks)))
+    return out
+
+def _pair_sat(compiled, box: Box, k: int, pats: Tuple[int, ...],
+              ga: np.ndarray) -> np.ndarray:
+    """(G, 2^cells) – pair k perfect for each g_A row and g_B cell combination."""
+    rel = compiled[2]
+    n = len(box.cells)
+    combos = np.arange(1 << n)
+    ok = np.ones((len(ga), 1 << n), dtype=bool)
+    for p in pats:
+        s, allowed = rel[k][p]
+        table = np.zeros((R_GA, R_GB), dtype=bool)
+        for ch, bit in allowed:
+            table[ch, bit] = True
+        bit = combos >> (n - 1 - box.cells.index(s)) & 1
+        ok &= table[ga[:, p]][:, bit]
+    return ok
+
+def box_table(compiled, box: Box, ga: np.ndarray) -> np.ndarray:
+    """C_box for each g_A row: shape (G,) + (R_FA,) * len(box.lines)."""
+    n_lines = len(box.lines)
+    letters = string.ascii_lowercase[:n_lines]
+    lines = compiled[1]
+    table = np.zeros((len(ga),) + (R_FA,)*n_lines, dtype=np.int64)
+    memo: Dict[tuple, np.ndarray] = {}                          # MS-A line sets repeat
+    def sat(k, x, y):
+        key = (k, tuple(lines[(x, y)]))
+        if key not in memo:
+            memo[key] = _pair_sat(compiled, box, k, key[1], ga)
+        return memo[key]
+    for y in range(R_FB):
+        ops = [np.stack([sat(k, x, y) for x in range(R_FA)], 1).astype(np.int64)
+               for k in box.pairs]                              # (G, R_FA, 2^cells)
+        if ops:
+            subs = ",".join(f"z{c}Y" for c in letters)
+            table += np.einsum(f"{subs}->z{letters}", *ops)
+        else:
+            table += 1 << len(box.cells)
+    return table
+
+def per_ga(compiled, ga: np.ndarray) -> List[int]:
+    """N(g_A) for each row of `ga` (g_A tables as digit rows)."""
+    bx = boxes(compiled)
+    used = sorted({a for b in bx for a in b.lines})
+    letter = {a: string.ascii_lowercase[i] for i, a in enumerate(used)}
+    free = R_FA ** (N_FA - len(used))                          # f_A entries no pair reads
+    out: List[int] = []
+    for lo in range(0, len(ga), CHUNK):
+        chunk = ga[lo:lo + CHUNK]
+        ops, subs = [], []
+        for b in bx:
+            ops.append(box_table(compiled, b, chunk))
+            subs.append("z" + "".join(letter[a] for a in b.lines))
+        n = np.einsum(",".join(subs) + "->z", *ops, optimize=EINSUM)
+        out.extend(free * int(v) for v in n)
+    return out
+
+# ──────────────────────────  symmetry classes  ──────────────────
+def ga_classes(group, ga: np.ndarray = GA_SPACE) -> Tuple[np.ndarray, np.ndarray]:
+    """(representatives, class sizes) of the g_A tables under the group's ψ."""
+    weights = R_GA ** np.arange(N_GA - 1, -1, -1)
+    index = ga @ weights
+    canon = index.copy()
+    for psi in {h.psi for h in group.positions}:
+        image = np.stack([np.asarray(psi[p])[ga[:, p]] for p in range(N_GA)], 1)
+        np.minimum(canon, image @ weights, out=canon)
+    reps, sizes = np.unique(canon, return_counts=True)
+    return ga[reps], sizes
+
+# ──────────────────────────  count  ─────────────────────────────
+def count(msa: Game, msc: Game, group=None) -> Tally:
+    """
+    Exact number of perfect reductions.  With a symmetry.Group only one
+    g_A per class is evaluated.
+    """
+    compiled = compile_pairs(msa, msc)
+    if group is None:
+        reps, sizes = GA_SPACE, np.ones(len(GA_SPACE), dtype=np.int64)
+    else:
+        reps, sizes = ga_classes(group)
+    n = per_ga(compiled, reps)
+    total = sum(int(w) * v for w, v in zip(sizes, n))
+    tables = sum(int(w) for w, v in zip(sizes, n) if v)
+    return Tally(total, tables, len(reps))
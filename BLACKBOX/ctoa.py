@@ -3,15 +3,31 @@
 ctoa.py  – exhaustive MS-C → MS-A reduction search
 with checkpoint / resume and persistent logging
 """
-import json, itertools, atexit, signal, logging, argparse, math
+import json, itertools, atexit, signal, logging, argparse, math, os, time
+import multiprocessing as mp
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
 from typing   import Dict, List, Tuple
 
+from space     import PATTERNS, SHAPE, TOTAL, candidates_from, decode_index, \
+                      product_from, table_index, to_closures
+from backtrack import compile_pairs, solve
+from gametable import load_game, vec_code
+from telemetry import SAMPLE_MASK, Telemetry, describe
+from checkorder import REORDER_EVERY, CheckOrder
+from nogood    import Nogoods
+from journal   import CheckpointWriter, Journal, replay
+
 # ──────────────────────────  constants  ──────────────────────────
 CHECKPOINT   = Path("checkpoint.json")
 BEST_FILE    = Path("best.json")
+SHARD_DIR    = Path("shards")         # per-worker checkpoints + hit journals
 LOG_FILE     = "search.log"
-SAVE_EVERY   = 1_000_000          # iterations between checkpoints
+SAVE_SECONDS = 10.0               # wall-clock seconds between checkpoints
+CLOCK_MASK   = 0xFFF              # brute: read the clock every 4,096 tested candidates
+
+JOURNAL      = Journal()            # results.jsonl: every hit + progress record
+CKPT_WRITER  = CheckpointWriter(CHECKPOINT, JOURNAL)   # does every write of the above
 
 # ──────────────────────────  logging  ──────────────────────────
 logging.basicConfig(
@@ -24,72 +40,64 @@ logging.basicConfig(
 )
 log = logging.getLogger("search")
 
-# ──────────────────────────  helper loaders  ────────────────────
-def load_game(path: Path) -> Dict[Tuple[int,int], List[dict]]:
-    raw = json.loads(path.read_text())
-    return {tuple(map(int, k.split(","))): v for k, v in raw.items()}
-
-def box_coords(box: int) -> Tuple[int, int]:
-    return divmod(box, 3)
-
-# ──────────────────────────  candidate generators  ──────────────
-def generate_F_A():
-    for mapping in itertools.product(range(6), repeat=6):      # 6^6
-        yield lambda a, m=mapping: m[a]
-
-def generate_F_B():
-    for mapping in itertools.product(range(6), repeat=9):      # 6^9
-        yield lambda box, m=mapping: m[box]
-
-EVEN_ROWS = [(0,0,0),(0,1,1),(1,0,1),(1,1,0)]
-ODD_COLS  = [(0,0,1),(0,1,0),(1,0,0),(1,1,1)]
-PATTERNS  = EVEN_ROWS + ODD_COLS
-
-def generate_G_A():
-    tgt_even, tgt_odd = EVEN_ROWS, ODD_COLS
-    for choices in itertools.product(range(4), repeat=8):      # 4^8
-        def g_A(a_c, line, ch=choices):
-            idx  = PATTERNS.index(tuple(line))
-            pool = tgt_even if idx < 4 else tgt_odd
-            return list(pool[ch[idx]])
-        yield g_A
-
-def generate_G_B():
-    situations = [(ln,pos) for ln in range(6) for pos in range(3)]  # 18
-    for bits in itertools.product([0,1], repeat=18):               # 2^18
-        table = {s:b for s,b in zip(situations, bits)}
-        def g_B(box_c, line, tbl=table):
-            r,c       = box_coords(box_c)
-            line_idx  = r if sum(line)%2==0 else 3+c
-            pos       = c if line_idx < 3 else r
-            return tbl[(line_idx,pos)]
-        yield g_B
-
 # ──────────────────────────  success-rate  ──────────────────────
+def fail_depth(msa, msc, f_A, f_B, g_A, g_B) -> int:
+    """
+    Legal MS-C pairs passed before the first failure (all of them when
+    perfect).  msa / msc are gametable.GameTable: allowed sets are bitmasks.
+    """
+    shift = msc.bob_bits
+    for depth, (a_c, box_c) in enumerate(msc.pairs()):
+        allowed = msc.mask(a_c, box_c)
+        for line in msa.alice_lines(f_A(a_c), f_B(box_c)):
+            code = vec_code(g_A(a_c,line)) << shift | g_B(box_c,line)
+            if not allowed >> code & 1:
+                return depth             # early fail
+    return len(msc.pairs())
+
 def success_rate(msa, msc, f_A, f_B, g_A, g_B):
-    for a_c in range(6):
-        for box_c in range(9):
-            outs_c = msc.get((a_c, box_c), [])
-            if not outs_c:
-                continue
-            allowed = {(tuple(o["alice_vec"]), o["bob_bit"]) for o in outs_c}
-            outs_a = msa[(f_A(a_c), f_B(box_c))]
-            for out in outs_a:
-                line = out["alice_vec"]
-                if (tuple(g_A(a_c,line)), g_B(box_c,line)) not in allowed:
-                    return 0.0           # early fail
-    return 1.0                           # perfect
+    if fail_depth(msa, msc, f_A, f_B, g_A, g_B) == len(msc.pairs()):
+        return 1.0                       # perfect
+    return 0.0
 
 # ──────────────────────────  checkpoint helpers  ────────────────
-def save_ckpt(state: dict):
-    CHECKPOINT.write_text(json.dumps(state))
+def save_ckpt(state: dict, wait: bool = False):
+    """
+    Journal the state and hand it to the background writer; `wait` blocks
+    until it is on disk (exit paths).
+    """
+    CKPT_WRITER.progress(state)
+    # decoded coordinates of the next candidate, for humans and tooling;
+    # resume itself only needs total_tested
+    if state["total_tested"] < TOTAL:
+        fa, fb, ga, gb = decode_index(state["total_tested"])
+        state = {**state, "next": {"fA": fa, "fB": fb, "gA": ga, "gB": gb}}
+    CKPT_WRITER.submit(state)
+    if wait:
+        CKPT_WRITER.flush()
     log.info(f"checkpoint saved at {state['total_tested']:,}")
 
 def load_ckpt():
     if CHECKPOINT.exists():
-        return json.loads(CHECKPOINT.read_text())
+        try:
+            return json.loads(CHECKPOINT.read_text())
+        except ValueError:
+            log.warning(f"{CHECKPOINT} unreadable – rebuilding it from {JOURNAL.path}")
+    if JOURNAL.path.exists():
+        return replay(JOURNAL.path)
     return None
 
+def on_term(*_):
+    """SIGTERM: leave the search loop the way Ctrl-C does, saving on the way out."""
+    raise KeyboardInterrupt
+
+def record_hit(engine: str, index: int):
+    """Queue a perfect hit for the journal and point best.json at it."""
+    fa, fb, ga, gb = decode_index(index - 1)
+    tables = {"fA": fa, "fB": fb, "gA": ga, "gB": gb}
+    CKPT_WRITER.hit(engine, index, **tables)
+    CKPT_WRITER.replace(BEST_FILE, json.dumps({"index": index, **tables}))
+
 # # ── helper to expose internals of the lambdas ───────────────────
 # def dump_f_A(f_A):
 #     """Return list[6] showing where each a_C maps."""
@@ -154,90 +162,598 @@ def dump_g_B_dict(g_B):
     return d
 
 
+# ──────────────────────────  backtrack engine  ──────────────────
+def run_backtrack(msa, msc, max_hits: int = 0, symmetry: bool = False):
+    """
+    Enumerate perfect reductions with backtrack.solve (0 = all).  With
+    `symmetry`, only one canonical representative per orbit is searched;
+    `python symmetry.py --expand best.json` lists the rest of an orbit.
+    """
+    if symmetry:
+        from symmetry import automorphisms, orbit_size, solve_canonical
+        group = automorphisms(msa, msc)
+        log.info(f"Starting canonical backtrack search, group order {group.order:,}")
+        hits, covered = solve_canonical(msa, msc, group), 0
+    else:
+        log.info("Starting backtrack search")
+        hits = solve(msa, msc)
+    signal.signal(signal.SIGTERM, on_term)
+    perfect_hits, index = 0, 0
+    try:
+        for fa, fb, ga, gb in hits:
+            perfect_hits += 1
+            index = table_index(fa, fb, ga, gb) + 1      # same count as brute loop
+            size  = ""
+            if symmetry:
+                n = orbit_size(group, fa, fb, ga, gb)
+                covered += n
+                size = f" orbit={n:,}"
+            log.info(f"[+] PERFECT #{perfect_hits} at {index:,}{size}  "
+                     f"fA={list(fa)} fB={list(fb)} gA={list(ga)} gB={list(gb)}")
+            record_hit("backtrack", index)
+            if max_hits and perfect_hits >= max_hits:
+                log.info(f"stopping after {perfect_hits:,} perfect hits")
+                return
+    except KeyboardInterrupt:
+        log.warning(f"Interrupted – {perfect_hits:,} perfect hits, "
+                    f"{f'the last at {index:,}' if index else 'none yet'} "
+                    f"(hits come in index order)")
+        return
+    if perfect_hits and symmetry:
+        log.info(f"search space exhausted: {perfect_hits:,} orbits covering "
+                 f"{covered:,} perfect reductions")
+    elif perfect_hits:
+        log.info(f"search space exhausted: {perfect_hits:,} perfect reductions")
+    else:
+        log.info("search space exhausted: no perfect reduction exists")
+
+# ──────────────────────────  known chains  ──────────────────────
+def log_known_chain(msc_path: Path, msa_path: Path):
+    """Report a composed MS-C → MS-A reduction from the verdict cache, if any."""
+    from compose  import Graph
+    from verdicts import VERDICT_DB, VerdictCache
+
+    if not VERDICT_DB.exists():
+        return
+    found = Graph(VerdictCache()).reduce(str(msc_path), str(msa_path))
+    if found and found[2].wins[0] == len(found[2].pairs):
+        via = " → ".join(e.target for e in found[0][:-1])
+        log.info(f"{'composed via ' + via if via else 'stored'} perfect reduction in "
+                 f"{VERDICT_DB} (python compose.py query MSC MSA); the scan still "
+                 f"enumerates every candidate")
+
+# ──────────────────────────  exact count  ───────────────────────
+def run_count(msa, msc, symmetry: bool = False):
+    """Number of perfect reductions, without enumerating them (count.py)."""
+    from count import count
+
+    group = None
+    if symmetry:
+        from symmetry import automorphisms
+        group = automorphisms(msa, msc)
+    t0 = time.time()
+    tally = count(msa, msc, group)
+    log.info(f"{tally.total:,} perfect reductions ({tally.total / TOTAL:.3e} of the space), "
+             f"{tally.ga_tables:,} g_A tables admit one; "
+             f"{tally.ga_classes:,} g_A classes evaluated in {time.time() - t0:.1f}s")
+
+# ──────────────────────────  SAT engine  ────────────────────────
+def run_sat(msa, msc, max_hits: int = 0, solver: str = "", dimacs: Path = None):
+    """Enumerate perfect reductions as SAT models with blocking clauses."""
+    from sat import find_external, solutions
+
+    external = find_external() if solver == "auto" else solver or None
+    log.info(f"Starting SAT search with {external or 'the built-in CDCL solver'}")
+    signal.signal(signal.SIGTERM, on_term)
+    perfect_hits, index = 0, 0
+    try:
+        for fa, fb, ga, gb in solutions(msa, msc, external, dimacs):
+            perfect_hits += 1
+            index = table_index(fa, fb, ga, gb) + 1
+            f_A, f_B, g_A, g_B = to_closures(fa, fb, ga, gb)
+            log.info(f"[+] PERFECT #{perfect_hits} at {index:,}\n"
+                     f"  fA: {dump_f_A_dict(f_A)}\n"
+                     f"  fB: {dump_f_B_dict(f_B)}\n"
+                     f"  gA: {dump_g_A_dict(g_A)}\n"
+                     f"  gB: {dump_g_B_dict(g_B)}")
+            record_hit("sat", index)
+            if max_hits and perfect_hits >= max_hits:
+                log.info(f"stopping after {perfect_hits:,} perfect hits")
+                return
+    except KeyboardInterrupt:
+        log.warning(f"Interrupted – {perfect_hits:,} models found, "
+                    f"{f'the last at {index:,}' if index else 'none yet'}; "
+                    f"models come in no particular order, so a rerun starts over")
+        return
+    if perfect_hits:
+        log.info(f"formula exhausted: {perfect_hits:,} perfect reductions")
+    else:
+        log.info("formula unsatisfiable: no perfect reduction exists")
+
+# ──────────────────────────  branch-and-bound engine  ───────────
+def run_bnb(msa, msc, top: int = 10):
+    """Keep the `top` best reductions by MS-C pairs won (see bnb.py)."""
+    from bnb import LEADERBOARD, Leaderboard, games_key, search
+
+    n_pairs = len(msc.pairs())
+    board = Leaderboard(top, n_pairs, games_key(msa, msc))
+    log.info(f"Starting branch-and-bound search for the top {top}, "
+             f"{len(board.heap)} entries loaded from {LEADERBOARD}")
+    signal.signal(signal.SIGTERM, on_term)
+    try:
+        for near in search(msa, msc, board):
+            log.info(f"[+] {near.wins}/{n_pairs} at {near.index:,}  "
+                     f"board min={max(board.threshold, 0)}/{n_pairs}  "
+                     f"failed={near.failed}")
+    except KeyboardInterrupt:
+        log.warning(f"Interrupted – leaderboard kept in {LEADERBOARD}.")
+        return
+    best = board.entries()
+    log.info(f"search space exhausted: best {best[0].wins if best else 0}/{n_pairs}, "
+             f"{len(best)} entries in {LEADERBOARD}")
+
+# ──────────────────────────  batch engine  ──────────────────────
+def run_batch(msa, msc, state: dict, tm: Telemetry):
+    """Exhaustive loop testing all 2^18 g_B tables per prefix with NumPy."""
+    from batch import GB_SPACE, surviving_gb
+
+    compiled    = compile_pairs(msa, msc)
+    block       = len(GB_SPACE)
+
+    # a partial block left by the brute loop is re-scanned, but hits below
+    # the saved index were already counted and journaled there
+    done  = state["total_tested"]
+    start = done // block
+    prefixes = product_from(start, SHAPE[:3]) if start < TOTAL // block else ()
+
+    def on_exit(*_):
+        save_ckpt(dict(state), wait=True)
+    atexit.register(on_exit)
+    signal.signal(signal.SIGTERM, on_term)
+
+    log.info(f"Starting batch search at iteration {done:,}")
+    next_save = time.monotonic() + SAVE_SECONDS
+    try:
+        for fa, fb, ga in prefixes:
+            base = state["total_tested"] // block * block
+            for gb_idx in surviving_gb(compiled, fa, fb, ga):
+                index = base + int(gb_idx) + 1
+                if index <= done:
+                    continue
+                state["perfect_hits"] += 1
+                log.info(f"[+] PERFECT #{state['perfect_hits']} at {index:,}")
+                record_hit("batch", index)
+                tm.hit(index)
+            state["total_tested"] = base + block
+
+            if time.monotonic() >= next_save:
+                next_save = time.monotonic() + SAVE_SECONDS
+                save_ckpt(dict(state))
+                rec = tm.progress(state["total_tested"], best=state["best_score"])
+                log.info(f"{describe(rec)}  best={state['best_score']:.3f}  "
+                         f"fA={list(fa)} fB={list(fb)} gA={list(ga)}")
+    except KeyboardInterrupt:
+        log.warning("Interrupted by user – saving checkpoint and exiting.")
+        on_exit()
+        atexit.unregister(on_exit)              # saved once; not again at exit
+
+# ──────────────────────────  sharded search  ────────────────────
+# A shard is a contiguous index range [lo, hi).  Its worker keeps
+# shards/<lo>.json (progress) and shards/<lo>.jsonl (perfect-hit journal);
+# the coordinator folds finished shards into checkpoint.json in index
+# order, so total_tested stays a "everything below is done" watermark.
+GB_BLOCK = 2**18
+
+_worker = {}
+
+def _init_worker(msa_path, msc_path, stop):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)     # coordinator decides
+    _worker["msa"], _worker["msc"] = load_game(msa_path), load_game(msc_path)
+    _worker["stop"] = stop
+
+def _shard_paths(lo: int) -> Tuple[Path, Path]:
+    return SHARD_DIR / f"{lo}.json", SHARD_DIR / f"{lo}.jsonl"
+
+def _scan_shard(lo: int, hi: int, engine: str, parent: int,
+                reorder: int = REORDER_EVERY, skip: bool = True) -> dict:
+    """Worker: test [lo, hi), resuming from the shard's own checkpoint."""
+    msa, msc, stop = _worker["msa"], _worker["msc"], _worker["stop"]
+    ck_path, journal = _shard_paths(lo)
+    st = (json.loads(ck_path.read_text()) if ck_path.exists()
+          else {"lo": lo, "hi": hi, "done": 0, "best_score": 0.0})
+    pos = lo + st["done"]
+
+    def save():
+        st["done"] = pos - lo
+        tmp = ck_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(st))
+        tmp.replace(ck_path)
+
+    def halted() -> bool:
+        return stop.is_set() or os.getppid() != parent
+
+    with journal.open("a") as jf:
+        def hit(index: int):
+            jf.write(json.dumps({"index": index}) + "\n")
+            jf.flush()
+
+        if engine == "batch":
+            from batch import surviving_gb
+            compiled = compile_pairs(msa, msc)
+            # whole g_B blocks, but hits at or below the resume point are
+            # already journaled (a coordinator may start mid-block)
+            done, next_save = pos, time.monotonic() + SAVE_SECONDS
+            pos -= pos % GB_BLOCK
+            for fa, fb, ga in product_from(pos // GB_BLOCK, SHAPE[:3]):
+                if pos >= hi or halted():
+                    break
+                for gb_idx in surviving_gb(compiled, fa, fb, ga):
+                    if pos + int(gb_idx) + 1 > done:
+                        hit(pos + int(gb_idx) + 1)
+                pos += GB_BLOCK
+                if time.monotonic() >= next_save:
+                    next_save = time.monotonic() + SAVE_SECONDS
+                    save()
+        else:
+            checks, perfect = CheckOrder(msa, msc, reorder), len(msc.pairs())
+            nogoods = Nogoods(msa, msc) if skip else None
+            tested, next_save = 0, time.monotonic() + SAVE_SECONDS
+            while pos < hi and not halted():
+                for cand in candidates_from(pos):
+                    if pos >= hi:
+                        break
+                    pos += 1
+                    tested += 1
+                    jump = False
+                    if checks.fail_depth(*cand.closures()) == perfect:
+                        hit(pos)
+                    elif nogoods:
+                        nxt = min(nogoods.next_index(pos - 1, cand, *checks.failed), hi)
+                        jump, pos = nxt > pos, nxt
+                    # by the clock: after a skip the index races ahead
+                    if (jump or not tested & CLOCK_MASK) and time.monotonic() >= next_save:
+                        next_save = time.monotonic() + SAVE_SECONDS
+                        save()
+                    if jump or not tested & 0xFFFF and halted():
+                        break
+                else:
+                    break
+    save()
+    return st
+
+def _journal_hits(lo: int) -> List[int]:
+    """Unique hit indices of a shard (a resumed worker may re-log a hit)."""
+    _, journal = _shard_paths(lo)
+    if not journal.exists():
+        return []
+    return sorted({json.loads(ln)["index"] for ln in journal.read_text().splitlines() if ln})
+
+def run_sharded(args, state: dict, tm: Telemetry):
+    """Coordinator: keep `args.workers` shard workers busy and fold results."""
+    SHARD_DIR.mkdir(exist_ok=True)
+    size = args.shard_size or (2**34 if args.engine == "batch" else 2**24)
+    if args.engine == "batch":
+        size = max(GB_BLOCK, size - size % GB_BLOCK)
+
+    # shards left by an earlier coordinator: drop folded ones, resume the rest
+    pending = []
+    for ck in sorted(SHARD_DIR.glob("*.json"), key=lambda p: int(p.stem)):
+        st = json.loads(ck.read_text())
+        if st["hi"] <= state["total_tested"]:
+            for p in _shard_paths(st["lo"]):
+                p.unlink(missing_ok=True)
+        else:
+            pending.append((st["lo"], st["hi"]))
+    frontier = max([hi for _, hi in pending], default=state["total_tested"])
+
+    def new_shards():
+        nonlocal frontier
+        while frontier < TOTAL:
+            lo, frontier = frontier, min((frontier // size + 1) * size, TOTAL)
+            yield lo, frontier
+    shards   = itertools.chain(pending, new_shards())
+    finished: Dict[int, dict] = {}
+    folded:   List[int] = []                       # their files wait for a checkpoint
+    next_save = time.monotonic() + SAVE_SECONDS
+
+    def checkpoint(wait: bool = False):
+        save_ckpt(dict(state), wait=wait)
+        for lo in folded:                           # only after the checkpoint
+            for p in _shard_paths(lo):
+                p.unlink(missing_ok=True)
+        folded.clear()
+
+    def fold():
+        nonlocal next_save
+        while state["total_tested"] in finished:
+            st = finished.pop(state["total_tested"])
+            for index in _journal_hits(st["lo"]):
+                state["perfect_hits"] += 1
+                log.info(f"[+] PERFECT #{state['perfect_hits']} at {index:,}")
+                record_hit("sharded", index)
+                tm.hit(index)
+            state["best_score"]   = max(state["best_score"], st["best_score"])
+            state["total_tested"] = st["hi"]
+            folded.append(st["lo"])
+        # by the clock: skipping shards can finish many times a second
+        if folded and time.monotonic() >= next_save:
+            next_save = time.monotonic() + SAVE_SECONDS
+            checkpoint()
+            rec = tm.progress(state["total_tested"], best=state["best_score"],
+                              in_flight=len(running))
+            log.info(f"{describe(rec)}  best={state['best_score']:.3f}  "
+                     f"in flight={len(running)}")
+
+    signal.signal(signal.SIGTERM, on_term)
+
+    stop = mp.Event()
+    log.info(f"Starting sharded search at iteration {state['total_tested']:,} "
+             f"with {args.workers} workers, shard size {size:,}")
+    running = {}
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker,
+                             initargs=(args.msa, args.msc, stop)) as pool:
+        def submit():
+            for lo, hi in itertools.islice(shards, 1):
+                fut = pool.submit(_scan_shard, lo, hi, args.engine, os.getpid(),
+                                  0 if args.fixed_order else REORDER_EVERY,
+                                  not args.no_skip)
+                running[fut] = lo
+        try:
+            for _ in range(args.workers):
+                submit()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    running.pop(fut)
+                    st = fut.result()
+                    if st["done"] >= st["hi"] - st["lo"]:
+                        finished[st["lo"]] = st
+                        submit()
+                fold()
+            checkpoint(wait=True)
+        except KeyboardInterrupt:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            log.warning("Interrupted – stopping workers; shards resume on restart.")
+            stop.set()
+            wait(running)
+            for fut in running:
+                st = fut.result()
+                if st["done"] >= st["hi"] - st["lo"]:
+                    finished[st["lo"]] = st
+            running.clear()
+            fold()
+            checkpoint(wait=True)
+
+# ──────────────────────────  annealing engine  ──────────────────
+def _init_anneal(msa_path, msc_path, lock, stop, queue):
+    from anneal import Model
+    signal.signal(signal.SIGINT, signal.SIG_IGN)     # coordinator decides
+    _worker["model"] = Model(load_game(msa_path), load_game(msc_path))
+    _worker.update(lock=lock, stop=stop, queue=queue)
+
+def _anneal_worker(seed: int, limit: int) -> int:
+    from anneal import restarts
+    w = _worker
+    return restarts(w["model"], seed, w["lock"], w["stop"], w["queue"].put, limit)
+
+def run_anneal(args):
+    """
+    Simulated-annealing restarts (anneal.py) in `args.workers` processes,
+    until one finds a perfect reduction or --restarts per worker ran out.
+    """
+    from queue  import Empty
+    from anneal import ANNEAL_FILE, load_best
+    from bnb    import games_key
+
+    msa, msc = load_game(args.msa), load_game(args.msc)
+    games, n_pairs = games_key(msa, msc), len(msc.pairs())
+    workers = max(1, args.workers)
+    prev = load_best(games)
+    if prev and args.fresh_best:
+        aside = ANNEAL_FILE.with_name(ANNEAL_FILE.name + ".prev")
+        ANNEAL_FILE.replace(aside)
+        log.info(f"moved {ANNEAL_FILE} ({prev.wins}/{n_pairs}) to {aside}")
+        prev = None
+    elif prev and prev.wins == n_pairs:
+        log.warning(f"{ANNEAL_FILE} already holds a perfect entry at {prev.index:,}; "
+                    f"nothing to anneal (--fresh-best moves it aside and starts over)")
+        return
+    log.info(f"Starting annealing with {workers} worker(s), shared best in {ANNEAL_FILE}"
+             + (f" ({prev.wins}/{n_pairs})" if prev else ""))
+    lock, stop, queue = mp.Lock(), mp.Event(), mp.Queue()
+    t0 = time.time()
+    with ProcessPoolExecutor(workers, initializer=_init_anneal,
+                             initargs=(args.msa, args.msc, lock, stop, queue)) as pool:
+        futs = [pool.submit(_anneal_worker, int(t0) * 1000 + w, args.restarts)
+                for w in range(workers)]
+        try:
+            while not all(f.done() for f in futs) or not queue.empty():
+                try:
+                    near = queue.get(timeout=0.2)
+                except Empty:
+                    continue
+                log.info(f"[+] {near.wins}/{n_pairs} after {time.time() - t0:.2f}s  "
+                         f"at {near.index:,}  failed={near.failed}")
+                if near.wins == n_pairs:
+                    stop.set()
+                    record_hit("anneal", near.index)
+        except KeyboardInterrupt:
+            log.warning("Interrupted – stopping workers.")
+        stop.set()
+        done = sum(f.result() for f in futs)
+    best = load_best(games)
+    log.info(f"{done:,} restarts in {time.time() - t0:.1f}s, best "
+             f"{best.wins if best else 0}/{n_pairs} in {ANNEAL_FILE}")
+
 # ──────────────────────────  main  ──────────────────────────────
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--msa", type=Path, default="MSA/msa_blackbox_outputs.json")
     ap.add_argument("--msc", type=Path, default="MSC/msc_blackbox_outputs.json")
+    ap.add_argument("--engine", choices=["brute", "batch", "backtrack", "sat", "bnb", "anneal"],
+                    default="brute")
+    ap.add_argument("--max-hits", type=int, default=0,
+                    help="backtrack/sat: stop after this many perfect hits (0 = all)")
+    ap.add_argument("--top", type=int, default=10,
+                    help="bnb: leaderboard size")
+    ap.add_argument("--restarts", type=int, default=0,
+                    help="anneal: restarts per worker (0 = until a perfect hit)")
+    ap.add_argument("--fresh-best", action="store_true",
+                    help="anneal: move the saved shared best aside (to .prev) "
+                         "and start from scratch")
+    ap.add_argument("--symmetry", action="store_true",
+                    help="backtrack: one canonical reduction per symmetry orbit; "
+                         "count: evaluate one g_A per symmetry class")
+    ap.add_argument("--count", action="store_true",
+                    help="report the exact number of perfect reductions and exit")
+    ap.add_argument("--sat-solver", default="",
+                    help="sat: external DIMACS solver command, or 'auto' to "
+                         "look for kissat/cadical/… on PATH (default built-in)")
+    ap.add_argument("--dimacs", type=Path,
+                    help="sat: also write the CNF formula to this file")
+    ap.add_argument("--metrics", type=Path, default="metrics.jsonl",
+                    help="brute/batch: JSONL progress events (see telemetry.py)")
+    ap.add_argument("--fixed-order", action="store_true",
+                    help="brute: check MS-C pairs in table order instead of "
+                         "fail-first (see checkorder.py)")
+    ap.add_argument("--no-skip", action="store_true",
+                    help="brute: test every candidate instead of skipping the "
+                         "blocks a learned conflict rules out (see nogood.py)")
+    ap.add_argument("--profile-every", type=float, default=0.0,
+                    help="sample the main thread's stack every N seconds (0 = off)")
+    ap.add_argument("--workers", type=int, default=0,
+                    help="brute/batch: run shards across N processes; "
+                         "anneal: parallel restart processes")
+    ap.add_argument("--shard-size", type=int, default=0,
+                    help="candidates per shard (default depends on engine)")
     args = ap.parse_args()
+    atexit.register(CKPT_WRITER.close)          # runs last: after every final save
 
     msa = load_game(args.msa)
     msc = load_game(args.msc)
-
-    FA, FB, GA, GB = generate_F_A(), generate_F_B(), generate_G_A(), generate_G_B()
-    total_space = 6**6 * 6**9 * 4**8 * 2**18   # for % progress
+    log_known_chain(args.msc, args.msa)
+
+    if args.count:
+        run_count(msa, msc, args.symmetry)
+        return
+    if args.engine == "backtrack":
+        run_backtrack(msa, msc, args.max_hits, args.symmetry)
+        return
+    if args.engine == "sat":
+        run_sat(msa, msc, args.max_hits, args.sat_solver, args.dimacs)
+        return
+    if args.engine == "bnb":
+        run_bnb(msa, msc, args.top)
+        return
+    if args.engine == "anneal":
+        run_anneal(args)
+        return
 
-    # ── resume or fresh start
     # ── resume or fresh start
     state = load_ckpt() or {}
     state.setdefault("total_tested", 0)
     state.setdefault("perfect_hits", 0)
     state.setdefault("best_score", 0.0)
+    tm = Telemetry("sharded" if args.workers else args.engine, TOTAL, args.metrics,
+                   state["total_tested"], depths=len(msc.pairs()),
+                   profile_every=args.profile_every)
+    atexit.register(lambda: tm.close(done=state["total_tested"],
+                                     perfect_hits=state["perfect_hits"]))
+    if args.workers:
+        run_sharded(args, state, tm)
+        return
+    if args.engine == "batch":
+        run_batch(msa, msc, state, tm)
+        return
     total_tested   = state["total_tested"]
     perfect_hits   = state["perfect_hits"]
     best_score     = state["best_score"]
 
-    # rewind generators with islice skip
-    product_iter = itertools.islice(
-        itertools.product(FA, FB, GA, GB), total_tested, None
-    )
-
     # ensure checkpoint on exit / SIGTERM
     def on_exit(*_):
+        state.update(total_tested=total_tested, perfect_hits=perfect_hits,
+                     best_score=best_score)
         save_ckpt({"total_tested": total_tested,
                    "perfect_hits": perfect_hits,
-                   "best_score"  : best_score})
+                   "best_score"  : best_score}, wait=True)
     atexit.register(on_exit)
-    signal.signal(signal.SIGTERM, on_exit)
+    signal.signal(signal.SIGTERM, on_term)
 
     log.info(f"Starting search at iteration {total_tested:,}")
 
     # ── main loop
+    perfect   = len(msc.pairs())
+    hist      = tm.hist
+    checks    = CheckOrder(msa, msc, 0 if args.fixed_order else REORDER_EVERY)
+    check     = checks.fail_depth
+    nogoods   = None if args.no_skip else Nogoods(msa, msc)
+    perf      = time.perf_counter
+    mark      = 0.0                 # end of a sampled body: times the next generation
+    tested    = 0                   # candidates actually checked
+    next_save = perf() + SAVE_SECONDS
     try:
-        for f_A, f_B, g_A, g_B in product_iter:
-            total_tested += 1
-            score = success_rate(msa, msc, f_A, f_B, g_A, g_B)
-
-            if score == 1.0:
-                perfect_hits += 1
-                log.info(f"[+] PERFECT #{perfect_hits} at {total_tested:,}")
-                # persist the perfect quadruple immediately
-                BEST_FILE.write_text(json.dumps({"index": total_tested}))
-            elif score > best_score:
-                best_score = score
-
-            # if total_tested % SAVE_EVERY == 0:
-            #     save_ckpt({"total_tested": total_tested,
-            #                "perfect_hits": perfect_hits,
-            #                "best_score"  : best_score})
-            #     pct = 100 * total_tested / total_space
-            #     fA_index = total_tested // (6**9 * 4**8 * 2**18)
-            #     log.info(f"[{total_tested:,}]  {pct:.3e}%  best={best_score:.3f}"
-            #              f"... fA={dump_f_A(f_A)} "
-            #                 f"fB={dump_f_B(f_B)} "
-            #                 f"gA={dump_g_A(g_A)} "
-            #                 f"gB_bits={dump_g_B(g_B):036b}")
-            if total_tested % SAVE_EVERY == 0:
-                save_ckpt({"total_tested": total_tested,
-                        "perfect_hits": perfect_hits,
-                        "best_score"  : best_score})
-                pct = 100 * total_tested / total_space
-
-                # dictionaries
-                fa_dict = dump_f_A_dict(f_A)
-                fb_dict = dump_f_B_dict(f_B)
-                ga_dict = dump_g_A_dict(g_A)
-                gb_dict = dump_g_B_dict(g_B)
-
-                log.info(f"[{total_tested:,}]  {pct:.3e}%  best={best_score:.3f}\n"
-                        f"  fA: {fa_dict}\n"
-                        f"  fB: {fb_dict}\n"
-                        f"  gA: {ga_dict}\n"
-                        f"  gB: {gb_dict}")
+        while total_tested < TOTAL:
+            # seek straight to the first untested candidate
+            for cand in candidates_from(total_tested):
+                total_tested += 1
+                tested += 1
+                if mark:
+                    t0 = perf()
+                    depth = check(*cand.closures())
+                    t1 = perf()
+                    tm.gen_s += t0 - mark
+                    tm.check_s += t1 - t0
+                    mark = 0.0
+                else:
+                    depth = check(*cand.closures())
+                hist[depth] += 1
+
+                jump = False
+                if depth == perfect:
+                    perfect_hits += 1
+                    log.info(f"[+] PERFECT #{perfect_hits} at {total_tested:,}")
+                    # persist the perfect quadruple immediately
+                    record_hit("brute", total_tested)
+                    tm.hit(total_tested)
+                elif nogoods:
+                    # every candidate below nxt repeats this conflict
+                    nxt = nogoods.next_index(total_tested - 1, cand, *checks.failed)
+                    jump, total_tested = nxt > total_tested, nxt
+
+                # if total_tested % SAVE_EVERY == 0:
+                #     save_ckpt({"total_tested": total_tested,
+                #                "perfect_hits": perfect_hits,
+                #                "best_score"  : best_score})
+                #     pct = 100 * total_tested / total_space
+                #     fA_index = total_tested // (6**9 * 4**8 * 2**18)
+                #     log.info(f"[{total_tested:,}]  {pct:.3e}%  best={best_score:.3f}"
+                #              f"... fA={dump_f_A(f_A)} "
+                #                 f"fB={dump_f_B(f_B)} "
+                #                 f"gA={dump_g_A(g_A)} "
+                #                 f"gB_bits={dump_g_B(g_B):036b}")
+                # by the clock: after a skip the index races ahead
+                if (jump or not tested & CLOCK_MASK) and perf() >= next_save:
+                    next_save = perf() + SAVE_SECONDS
+                    save_ckpt({"total_tested": total_tested,
+                            "perfect_hits": perfect_hits,
+                            "best_score"  : best_score})
+                    # the checkpoint's "next" already holds the decoded tables
+                    rec = tm.progress(total_tested, best=best_score, tested=tested,
+                                      checks_per_reject=round(checks.checks_per_reject(), 3))
+                    log.info(f"{describe(rec)}  best={best_score:.3f}  "
+                             f"checks/reject={rec['checks_per_reject']:.2f}  "
+                             f"tested={tested:,}")
+                if not tested & SAMPLE_MASK:
+                    mark = perf()
+                if jump:
+                    break               # re-seek past the skipped block
+            else:
+                break
 
     except KeyboardInterrupt:
         log.warning("Interrupted by user – saving checkpoint and exiting.")
         on_exit()
+        atexit.unregister(on_exit)              # saved once; not again at exit
 
 if __name__ == "__main__":
     main()
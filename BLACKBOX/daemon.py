@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+daemon.py  – long-lived verification server over a Unix socket
+
+test.py, b2a.py and c2a.py pay interpreter start-up, game loading and
+index building on every run just to check one reduction.  `serve` loads
+and indexes the games once and answers requests on SOCKET_PATH until it
+is stopped; Client is the matching library.
+
+The protocol is one JSON value per line in each direction.  A request is
+
+    {"op": "verify", "source": "MSC", "target": "MSA",
+     "fa": ..., "fb": ..., "ga": ..., "gb": ..., "id": 7}
+
+with verify()-form tables stacked along a K axis, or instead
+
+    "space": [fa, fb, ga, gb]     ctoa.py space tables (MS-C → MS-A, K axis)
+    "index": [i, ...]             1-based candidate indices, as in best.json
+
+  verify   {"wins": [...], "pairs": P, "failure": [...]} per candidate
+  score    {"wins": [...], "pairs": P}
+  games    every loaded game with its path and shape
+  stop     shuts the server down
+
+A line holding a JSON array is a batch: its requests are answered in
+order as one array, so a client can pipeline many checks per round trip.
+Errors, including a table value outside its radix or a game path that
+cannot be read, come back as {"error": "..."} without closing the
+connection.
+"id" is echoed when given.
+
+Games are named MSA / MSB / MSC or given by path (JSON or .gtb).  Each
+is re-checked at most every RELOAD_SECONDS and reloaded, recompiling the
+.gtb if needed, when its file has changed.  A single candidate goes
+through verify_one(); batches use verify() on the cached outcome index.
+
+    python daemon.py serve &
+    python daemon.py bench
+"""
+import argparse, json, socket, socketserver, threading, time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from gametable import GameTable, load_game
+from space     import SHAPE, decode_index
+from verify    import from_space, outcome_index, verify, verify_one
+
+SOCKET_PATH    = Path("verify.sock")
+RELOAD_SECONDS = 1.0
+GAMES = {
+    "MSA": Path("MSA/msa_blackbox_outputs.json"),
+    "MSB": Path("MSB/msb_blackbox_outputs.json"),
+    "MSC": Path("MSC/msc_blackbox_outputs.json"),
+}
+KNOWN_PERFECT = 1893723469576753868069          # 1-based MS-C → MS-A hit
+
+# ──────────────────────────  game registry  ─────────────────────
+class Loaded(NamedTuple):
+    path:  Path
+    stamp: Tuple[int, int]                       # (mtime_ns, size) of path
+    game:  GameTable
+    index: Tuple[np.ndarray, np.ndarray]         # outcome_index(game)
+
+def _stamp(path: Path) -> Tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+class Games:
+    """Loaded games by name, reloaded when their file changes."""
+
+    def __init__(self, every: float = RELOAD_SECONDS):
+        self.every   = every
+        self.loaded: Dict[str, Loaded] = {}
+        self.checked: Dict[str, float] = {}
+        self.lock    = threading.Lock()
+
+    def get(self, name: str) -> Loaded:
+        now = time.monotonic()
+        cur = self.loaded.get(name)
+        if cur is not None and now - self.checked[name] < self.every:
+            return cur
+        with self.lock:
+            cur = self.loaded.get(name)
+            path = GAMES.get(name, Path(name))
+            if not path.exists():
+                raise ValueError(f"unknown game {name!r} (no file {path})")
+            stamp = _stamp(path)
+            if cur is None or cur.stamp != stamp:
+                game = load_game(path)
+                cur = Loaded(path, stamp, game, outcome_index(game))
+                self.loaded[name] = cur
+            self.checked[name] = now
+            return cur
+
+    def describe(self) -> List[dict]:
+        return [{"name": name, "path": str(l.path), "n_a": l.game.n_a, "n_b": l.game.n_b,
+                 "alice_bits": l.game.alice_bits, "bob_bits": l.game.bob_bits}
+                for name, l in sorted(self.loaded.items())]
+
+# ──────────────────────────  requests  ──────────────────────────
+def _check(name: str, table, length: Optional[int], radix: int) -> np.ndarray:
+    """`table` as an array, or ValueError unless its entries are ints in 0..radix-1."""
+    a = np.asarray(table)
+    if a.dtype.kind not in "iu" or a.ndim == 0:
+        raise ValueError(f"{name} must be an array of integers")
+    if length is not None and a.shape[-1] != length:
+        raise ValueError(f"{name} rows must have {length} entries, not {a.shape[-1]}")
+    if a.size and (a.min() < 0 or a.max() >= radix):
+        raise ValueError(f"{name} values must lie in 0..{radix - 1}")
+    return a
+
+def _tables(req: dict, src: GameTable, tgt: GameTable) -> list:
+    """
+    verify()-form (fa, fb, ga, gb) with the K axis, from any request form,
+    each value checked against its radix: numpy would wrap a negative
+    index and out-of-range codes would score instead of failing.
+    """
+    if "index" in req:
+        fa, fb, ga, gb = zip(*(decode_index(int(i) - 1) for i in req["index"]))
+        return list(from_space(fa, fb, ga, gb))
+    if "space" in req:
+        if len(req["space"]) != len(SHAPE):
+            raise ValueError(f"space holds {len(SHAPE)} tables (fa, fb, ga, gb)")
+        return list(from_space(*(_check(name, t, length, radix) for name, t, (length, radix)
+                                 in zip(("fa", "fb", "ga", "gb"), req["space"], SHAPE))))
+    radix = {"fa": tgt.n_a, "fb": tgt.n_b,
+             "ga": 1 << src.alice_bits, "gb": 1 << src.bob_bits}
+    return [_check(k, req[k], None, radix[k]) for k in ("fa", "fb", "ga", "gb")]
+
+def _jsonable(v):
+    if isinstance(v, np.integer):
+        return int(v)
+    if isinstance(v, (list, tuple)):
+        return [_jsonable(x) for x in v]
+    if isinstance(v, dict):
+        return {k: _jsonable(x) for k, x in v.items()}
+    return v
+
+def handle(games: Games, req: dict) -> dict:
+    op = req.get("op")
+    if op == "games":
+        return {"games": games.describe()}
+    if op not in ("verify", "score"):
+        raise ValueError(f"unknown op {op!r}")
+    src, tgt = games.get(req.get("source", "MSC")), games.get(req.get("target", "MSA"))
+    tables = _tables(req, src.game, tgt.game)
+    if len(tables[0]) == 1:
+        res = verify_one(src.game, tgt.game, *(t[0] for t in tables))
+    else:
+        res = verify(src.game, tgt.game, *tables, index=tgt.index)
+    out = {"wins": res.wins.tolist(), "pairs": len(res.pairs)}
+    if op == "verify":
+        out["failure"] = [_jsonable(res.failure(k)) for k in range(len(res.wins))]
+    return out
+
+def answer(games: Games, req) -> dict:
+    try:
+        if not isinstance(req, dict):
+            raise ValueError("a request is a JSON object")
+        out = handle(games, req)
+    except (ValueError, KeyError, IndexError, TypeError, OSError) as e:
+        out = {"error": f"{type(e).__name__}: {e}"}
+    if isinstance(req, dict) and "id" in req:
+        out["id"] = req["id"]
+    return out
+
+# ──────────────────────────  server  ────────────────────────────
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        games = self.server.games
+        for line in self.rfile:
+            try:
+                req = json.loads(line)
+            except ValueError as e:
+                out = {"error": f"bad JSON: {e}"}
+            else:
+                if isinstance(req, dict) and req.get("op") == "stop":
+                    self.wfile.write(b'{"stopped": true}\n')
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    return
+                out = ([answer(games, r) for r in req] if isinstance(req, list)
+                       else answer(games, req))
+            self.wfile.write(json.dumps(out).encode() + b"\n")
+
+class Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path = SOCKET_PATH, games: Optional[Games] = None):
+        self.games = games or Games()
+        path = Path(path)
+        if path.exists():
+            with socket.socket(socket.AF_UNIX) as probe:
+                try:
+                    probe.connect(str(path))
+                except OSError:
+                    path.unlink()                # stale socket of a dead server
+                else:
+                    raise RuntimeError(f"a server is already listening on {path}")
+        super().__init__(str(path), _Handler)
+        self.path = path
+
+    def server_close(self):
+        super().server_close()
+        self.path.unlink(missing_ok=True)
+
+def serve(path: Path = SOCKET_PATH, preload: Tuple[str, ...] = tuple(GAMES)):
+    with Server(path) as srv:
+        for name in preload:
+            srv.games.get(name)
+        print(f"serving on {path} ({', '.join(preload)} loaded)", flush=True)
+        try:
+            srv.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+# ──────────────────────────  client  ────────────────────────────
+class Client:
+    """
+    Connection to a running server.  request() is one round trip;
+    pipeline() sends a whole list as one batch line.
+    """
+
+    def __init__(self, path: Path = SOCKET_PATH):
+        self.sock = socket.socket(socket.AF_UNIX)
+        self.sock.connect(str(path))
+        self.f = self.sock.makefile("rwb")
+
+    def _send(self, value) -> object:
+        self.f.write(json.dumps(value).encode() + b"\n")
+        self.f.flush()
+        line = self.f.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        return json.loads(line)
+
+    def request(self, op: str, **fields) -> dict:
+        out = self._send({"op": op, **fields})
+        if "error" in out:
+            raise ValueError(out["error"])
+        return out
+
+    def pipeline(self, requests: List[dict]) -> List[dict]:
+        """Answers in request order; failed requests come back as {"error": ...}."""
+        return self._send(requests) if requests else []
+
+    def verify(self, fa, fb, ga, gb, source: str = "MSC", target: str = "MSA") -> dict:
+        tables = {k: np.asarray(t).tolist() for k, t in zip(("fa", "fb", "ga", "gb"),
+                                                           (fa, fb, ga, gb))}
+        return self.request("verify", source=source, target=target, **tables)
+
+    def score_indices(self, indices: List[int]) -> List[int]:
+        """MS-C → MS-A wins of 1-based candidate indices."""
+        return self.request("score", index=[int(i) for i in indices])["wins"]
+
+    def games(self) -> List[dict]:
+        return self.request("games")["games"]
+
+    def stop(self):
+        self._send({"op": "stop"})
+
+    def close(self):
+        self.f.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+# ──────────────────────────  main  ──────────────────────────────
+def bench(path: Path, n: int):
+    with Client(path) as c:
+        one = {"op": "verify", "index": [KNOWN_PERFECT]}
+        got = c.request(**one)
+        if got["wins"] != [got["pairs"]]:
+            raise RuntimeError(f"known perfect index {KNOWN_PERFECT} scored "
+                               f"{got['wins'][0]}/{got['pairs']}: {got['failure'][0]}")
+        t0 = time.perf_counter()
+        for _ in range(n):
+            c.request(**one)
+        single = (time.perf_counter() - t0) / n
+        t0 = time.perf_counter()
+        c.pipeline([one] * n)
+        piped = (time.perf_counter() - t0) / n
+        t0 = time.perf_counter()
+        c.request("score", index=[KNOWN_PERFECT - k for k in range(n)])
+        batched = (time.perf_counter() - t0) / n
+    print(f"{n:,} checks  one per round trip {single*1e6:,.0f} µs   "
+          f"pipelined {piped*1e6:,.0f} µs   one stacked request {batched*1e6:,.0f} µs")
+
+def main():
+    ap = argparse.ArgumentParser(description="verification daemon over a Unix socket")
+    ap.add_argument("cmd", choices=["serve", "bench", "games", "stop"])
+    ap.add_argument("--socket", type=Path, default=SOCKET_PATH)
+    ap.add_argument("-n", type=int, default=1000, help="bench: checks per mode")
+    args = ap.parse_args()
+
+    if args.cmd == "serve":
+        serve(args.socket)
+    elif args.cmd == "bench":
+        bench(args.socket, args.n)
+    else:
+        with Client(args.socket) as c:
+            if args.cmd == "games":
+                print(json.dumps(c.games(), indent=2))
+            else:
+                c.stop()
+
+if __name__ == "__main__":
+    main()
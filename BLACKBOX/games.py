@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+games.py  – n×n parity-game generator (MS-A / MS-B / MS-C variants)
+
+Generalises MSA/, MSB/ and MSC/code.py to any square size n and any
+parity assignment: line i < n is row i, line n + j is column j, box
+r*n + c is cell (r, c), and every row / column has its own required
+parity (the magic square is rows even, columns odd).
+
+  A : Alice line × Bob line   → both lines, equal wherever they overlap
+  B : Alice row  × Bob column → row and column, equal at the intersection
+  C : Alice line × Bob box    → Alice's line, Bob's bit at that box
+                                 (no outcomes when the box is off the line)
+
+Outcomes are produced one input pair at a time and streamed straight
+into a gametable .gtb file (or the legacy JSON layout with --json), so
+memory stays bounded by a single pair however large n gets.
+"""
+import argparse, itertools, json
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Tuple
+
+from gametable import TableWriter, load_table, vec_code
+
+class Square(NamedTuple):
+    n:          int
+    row_parity: Tuple[int, ...]
+    col_parity: Tuple[int, ...]
+
+    def line_type(self, line: int) -> str:
+        return "row" if line < self.n else "col"
+
+    def parity(self, line: int) -> int:
+        return self.row_parity[line] if line < self.n else self.col_parity[line - self.n]
+
+    def pool(self, line: int) -> List[List[int]]:
+        """Every n-bit vector with the line's parity, in binary order."""
+        want = self.parity(line)
+        return [list(v) for v in itertools.product((0, 1), repeat=self.n)
+                if sum(v) % 2 == want]
+
+def magic_square(n: int = 3) -> Square:
+    """Rows even, columns odd: no classical strategy wins every round."""
+    return Square(n, (0,)*n, (1,)*n)
+
+# ──────────────────────────  per-pair outcomes  ─────────────────
+def _overlap_ok(sq: Square, a: int, av, b: int, bv) -> bool:
+    n = sq.n
+    if (a < n) != (b < n):                        # row × column
+        return av[b % n] == bv[a % n]
+    if a == b:                                    # same line
+        return av == bv
+    return True                                   # parallel lines
+
+def outcomes_a(sq: Square, a: int, b: int) -> Iterator[dict]:
+    pool_b = sq.pool(b)
+    for av in sq.pool(a):
+        for bv in pool_b:
+            if _overlap_ok(sq, a, av, b, bv):
+                yield {"alice_type": sq.line_type(a), "alice_vec": av,
+                       "bob_type":   sq.line_type(b), "bob_vec":   bv}
+
+def outcomes_b(sq: Square, a: int, b: int) -> Iterator[dict]:
+    pool_b = sq.pool(sq.n + b)
+    for av in sq.pool(a):
+        for bv in pool_b:
+            if av[b] == bv[a]:
+                yield {"alice_vec": av, "bob_vec": bv}
+
+def outcomes_c(sq: Square, a: int, box: int) -> Iterator[dict]:
+    r, c = divmod(box, sq.n)
+    on_line = r == a if a < sq.n else c == a - sq.n
+    if not on_line:
+        return
+    for av in sq.pool(a):
+        yield {"alice_type": sq.line_type(a), "alice_vec": av,
+               "bob_bit": av[c] if a < sq.n else av[r]}
+
+VARIANTS = {
+    #      inputs (n_a, n_b)      outcomes    Bob answers a vector?
+    "A": (lambda n: (2*n, 2*n),   outcomes_a, True),
+    "B": (lambda n: (n, n),       outcomes_b, True),
+    "C": (lambda n: (2*n, n*n),   outcomes_c, False),
+}
+
+def pairs(sq: Square, variant: str) -> Iterator[Tuple[int, int, Iterator[dict]]]:
+    """(a, b, outcomes) for every input pair, in (a, b) order."""
+    size, outcomes, _ = VARIANTS[variant]
+    n_a, n_b = size(sq.n)
+    for a in range(n_a):
+        for b in range(n_b):
+            yield a, b, outcomes(sq, a, b)
+
+# ──────────────────────────  writers  ───────────────────────────
+def write_gtb(sq: Square, variant: str, dst: Path) -> Path:
+    size, _, bob_vec = VARIANTS[variant]
+    bob_bits = sq.n if bob_vec else 1
+    with TableWriter(dst, *size(sq.n), sq.n, bob_bits, bob_vec) as w:
+        for _, _, outs in pairs(sq, variant):
+            m = 0
+            for o in outs:
+                bob = vec_code(o["bob_vec"]) if bob_vec else o["bob_bit"]
+                m |= 1 << (vec_code(o["alice_vec"]) << bob_bits | bob)
+            w.write(m)
+    return dst
+
+def write_json(sq: Square, variant: str, dst: Path) -> Path:
+    """Same layout as the blackbox JSON files, written pair by pair."""
+    tmp = dst.with_suffix(".tmp")
+    with tmp.open("w") as f:
+        f.write("{")
+        for i, (a, b, outs) in enumerate(pairs(sq, variant)):
+            f.write(f'{"," if i else ""}\n  "{a},{b}": [')
+            sep = "\n    "
+            for o in outs:
+                f.write(sep + json.dumps(o))
+                sep = ",\n    "
+            f.write("]" if sep == "\n    " else "\n  ]")
+        f.write("\n}\n")
+    tmp.replace(dst)
+    return dst
+
+# ──────────────────────────  main  ──────────────────────────────
+def parse_parity(text: str, n: int, default: int) -> Tuple[int, ...]:
+    """'' → default for every line, '0101' → one parity per line."""
+    if not text:
+        return (default,)*n
+    if len(text) != n or set(text) - {"0", "1"}:
+        raise ValueError(f"parity needs {n} digits of 0/1: {text!r}")
+    return tuple(map(int, text))
+
+def main():
+    ap = argparse.ArgumentParser(description="generate n×n parity games")
+    ap.add_argument("variant", choices=sorted(VARIANTS))
+    ap.add_argument("-n", type=int, default=3, help="square size")
+    ap.add_argument("--rows", default="", help="row parities, e.g. 0000 (default even)")
+    ap.add_argument("--cols", default="", help="column parities, e.g. 1111 (default odd)")
+    ap.add_argument("-o", "--out", type=Path,
+                    help="output file (default ms<variant><n>.gtb)")
+    ap.add_argument("--json", action="store_true",
+                    help="write the legacy blackbox JSON instead of .gtb")
+    args = ap.parse_args()
+
+    try:
+        sq = Square(args.n, parse_parity(args.rows, args.n, 0),
+                    parse_parity(args.cols, args.n, 1))
+    except ValueError as e:
+        ap.error(str(e))
+    ext = ".json" if args.json else ".gtb"
+    dst = args.out or Path(f"ms{args.variant.lower()}{args.n}{ext}")
+    if args.json:
+        write_json(sq, args.variant, dst)
+    else:
+        write_gtb(sq, args.variant, dst)
+        game = load_table(dst)
+        print(f"{game.n_a}×{game.n_b} pairs, "
+              f"{sum(bin(game.mask(a, b)).count('1') for a, b in game):,} outcomes")
+    print(f"wrote {dst}  ({dst.stat().st_size:,} bytes)")
+
+if __name__ == "__main__":
+    main()
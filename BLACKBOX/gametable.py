@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+gametable.py  – compiled, memory-mapped outcome tables
+
+The blackbox JSON files list every allowed outcome of every input pair.
+compile_game() turns one into a small binary file (.gtb): a 16-byte
+header followed by an (n_a, n_b, words) little-endian uint64 array
+whose bit
+
+    alice_code << bob_bits | bob_code
+
+is set when that outcome is allowed.  Codes are the output vectors read
+as binary numbers (first entry most significant); a single-bit Bob
+answer ("bob_bit") is its own code.  load_game() maps the file read-only,
+so an acceptance test is one shift and AND against a machine word.
+
+GameTable is also a read-only mapping (a, b) → outcome dicts, so code
+written against the old json loaders keeps working unchanged.
+"""
+import argparse, json, mmap, os, struct
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+MAGIC   = b"GTBL"
+VERSION = 1
+HEADER  = struct.Struct("<4sHHHHHH")          # magic, version, n_a, n_b,
+                                              # alice_bits, bob_bits, bob_vec
+WORD    = 64
+
+# ──────────────────────────  codes  ─────────────────────────────
+def vec_code(vec: Sequence[int]) -> int:
+    n = 0
+    for bit in vec:
+        n = n << 1 | bit
+    return n
+
+def code_vec(code: int, bits: int) -> List[int]:
+    return [code >> (bits - 1 - i) & 1 for i in range(bits)]
+
+def words_for(alice_bits: int, bob_bits: int) -> int:
+    """uint64 words per input pair."""
+    return max(1, -(-(1 << (alice_bits + bob_bits)) // WORD))
+
+# ──────────────────────────  table  ─────────────────────────────
+class GameTable(Mapping):
+    """Allowed-outcome bitmasks of one game, indexed by (a, b)."""
+
+    def __init__(self, buf, n_a: int, n_b: int, alice_bits: int, bob_bits: int,
+                 bob_vec: bool):
+        self.buf        = buf            # mmap (or bytes) of the whole file
+        self.n_a        = n_a
+        self.n_b        = n_b
+        self.alice_bits = alice_bits
+        self.bob_bits   = bob_bits
+        self.bob_vec    = bob_vec
+        self.stride     = 8 * words_for(alice_bits, bob_bits)
+        self._mask:  Dict[Tuple[int, int], int]        = {}
+        self._lines: Dict[Tuple[int, int], tuple]      = {}
+        self._outs:  Dict[Tuple[int, int], List[dict]] = {}
+        self._pairs: Optional[List[Tuple[int, int]]]   = None
+
+    def mask(self, a: int, b: int) -> int:
+        """Allowed outcomes of (a, b) as one Python int."""
+        key = (a, b)
+        m = self._mask.get(key)
+        if m is None:
+            if not (0 <= a < self.n_a and 0 <= b < self.n_b):
+                raise KeyError(key)
+            off = HEADER.size + (a * self.n_b + b) * self.stride
+            m = self._mask[key] = int.from_bytes(self.buf[off:off + self.stride],
+                                                 "little")
+        return m
+
+    def code(self, alice_vec: Sequence[int], bob) -> int:
+        bob = vec_code(bob) if self.bob_vec else int(bob)
+        return vec_code(alice_vec) << self.bob_bits | bob
+
+    def accepts(self, a: int, b: int, alice_vec: Sequence[int], bob) -> bool:
+        return bool(self.mask(a, b) >> self.code(alice_vec, bob) & 1)
+
+    def pairs(self) -> List[Tuple[int, int]]:
+        """Input pairs with at least one allowed outcome, in (a, b) order."""
+        if self._pairs is None:
+            self._pairs = [(a, b) for a in range(self.n_a) for b in range(self.n_b)
+                           if self.mask(a, b)]
+        return self._pairs
+
+    def alice_lines(self, a: int, b: int) -> tuple:
+        """Distinct Alice outputs of (a, b) as lists, in code order."""
+        key = (a, b)
+        lines = self._lines.get(key)
+        if lines is None:
+            m, width = self.mask(a, b), 1 << self.bob_bits
+            lines = tuple(code_vec(x, self.alice_bits)
+                          for x in range(1 << self.alice_bits)
+                          if m >> (x * width) & ((1 << width) - 1))
+            self._lines[key] = lines
+        return lines
+
+    # ── Mapping: (a, b) → [{"alice_vec": ..., "bob_vec"/"bob_bit": ...}]
+    def __getitem__(self, key) -> List[dict]:
+        outs = self._outs.get(key)
+        if outs is None:
+            m, outs = self.mask(*key), []
+            while m:
+                low  = m & -m
+                code = low.bit_length() - 1
+                m   ^= low
+                x, y = divmod(code, 1 << self.bob_bits)
+                out  = {"alice_vec": code_vec(x, self.alice_bits)}
+                if self.bob_vec:
+                    out["bob_vec"] = code_vec(y, self.bob_bits)
+                else:
+                    out["bob_bit"] = y
+                outs.append(out)
+            self._outs[key] = outs
+        return outs
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return ((a, b) for a in range(self.n_a) for b in range(self.n_b))
+
+    def __len__(self) -> int:
+        return self.n_a * self.n_b
+
+# ──────────────────────────  compile / load  ────────────────────
+def compiled_path(src: Path) -> Path:
+    return Path(src).with_suffix(".gtb")
+
+class TableWriter:
+    """
+    Streams pair masks into a .gtb file in (a, b) order, one pair at a
+    time.  The file only appears under its final name once every pair is
+    written, so concurrent loaders never see half a table.
+    """
+
+    def __init__(self, dst: Path, n_a: int, n_b: int, alice_bits: int,
+                 bob_bits: int, bob_vec: bool):
+        self.dst     = Path(dst)
+        self.tmp     = Path(f"{dst}.{os.getpid()}.tmp")
+        self.pending = n_a * n_b
+        self.stride  = 8 * words_for(alice_bits, bob_bits)
+        self.f       = self.tmp.open("wb")
+        self.f.write(HEADER.pack(MAGIC, VERSION, n_a, n_b, alice_bits, bob_bits, bob_vec))
+
+    def write(self, mask: int):
+        if not self.pending:
+            raise ValueError(f"{self.dst}: more pairs than the header declares")
+        self.f.write(mask.to_bytes(self.stride, "little"))
+        self.pending -= 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *_):
+        self.f.close()
+        if exc_type is not None or self.pending:
+            self.tmp.unlink(missing_ok=True)
+            if exc_type is None:
+                raise ValueError(f"{self.dst}: {self.pending} pairs never written")
+            return
+        self.tmp.replace(self.dst)
+
+def write_table(dst: Path, masks: Dict[Tuple[int, int], int], n_a: int, n_b: int,
+                alice_bits: int, bob_bits: int, bob_vec: bool):
+    with TableWriter(dst, n_a, n_b, alice_bits, bob_bits, bob_vec) as w:
+        for a in range(n_a):
+            for b in range(n_b):
+                w.write(masks.get((a, b), 0))
+
+def compile_game(src: Path, dst: Path = None) -> Path:
+    """Compile a blackbox JSON file into its .gtb table."""
+    src = Path(src)
+    dst = Path(dst) if dst else compiled_path(src)
+    raw = {tuple(map(int, k.split(","))): v
+           for k, v in json.loads(src.read_text()).items()}
+    outs = [o for v in raw.values() for o in v]
+    bob_vec    = any("bob_vec" in o for o in outs)
+    alice_bits = max((len(o["alice_vec"]) for o in outs), default=0)
+    bob_bits   = max((len(o["bob_vec"]) for o in outs), default=0) if bob_vec else 1
+    n_a = max(a for a, _ in raw) + 1
+    n_b = max(b for _, b in raw) + 1
+
+    masks = {}
+    for key, v in raw.items():
+        m = 0
+        for o in v:
+            bob = vec_code(o["bob_vec"]) if bob_vec else o["bob_bit"]
+            m |= 1 << (vec_code(o["alice_vec"]) << bob_bits | bob)
+        masks[key] = m
+    write_table(dst, masks, n_a, n_b, alice_bits, bob_bits, bob_vec)
+    return dst
+
+def load_table(path: Path) -> GameTable:
+    """Memory-map a compiled .gtb table."""
+    path = Path(path)
+    with path.open("rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, n_a, n_b, alice_bits, bob_bits, bob_vec = HEADER.unpack_from(buf)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: not a version {VERSION} game table")
+    if len(buf) != HEADER.size + n_a * n_b * 8 * words_for(alice_bits, bob_bits):
+        raise ValueError(f"{path}: truncated game table")
+    return GameTable(buf, n_a, n_b, alice_bits, bob_bits, bool(bob_vec))
+
+def load_game(path: Path) -> GameTable:
+    """
+    Shared loader for every script.  A .json path is compiled on first use
+    (and again whenever the JSON is newer); the .gtb is what gets mapped.
+    """
+    path = Path(path)
+    if path.suffix != ".json":
+        return load_table(path)
+    gtb = compiled_path(path)
+    if not gtb.exists() or gtb.stat().st_mtime < path.stat().st_mtime:
+        compile_game(path, gtb)
+    return load_table(gtb)
+
+# ──────────────────────────  main  ──────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="compile blackbox JSON to .gtb tables")
+    ap.add_argument("games", type=Path, nargs="+")
+    args = ap.parse_args()
+    for src in args.games:
+        dst  = compile_game(src)
+        game = load_table(dst)
+        print(f"{src} → {dst}  ({game.n_a}×{game.n_b} pairs, "
+              f"{dst.stat().st_size:,} bytes)")
+
+if __name__ == "__main__":
+    main()
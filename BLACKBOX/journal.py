@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+journal.py  – append-only results journal and background checkpoints
+
+results.jsonl keeps every perfect hit and every checkpointed progress
+state, one JSON object per line:
+
+    {"ts": 1760700000.1, "event": "hit", "engine": "brute", "index": 180794793, ...}
+    {"ts": 1760700002.3, "event": "progress", "total_tested": 181000000, ...}
+
+Lines are only ever appended.  The search thread never touches the
+disk: CheckpointWriter's thread appends the queued records, fsyncs them
+as one group, then replaces best.json and checkpoint.json (temp file,
+fsync, rename).  Because the checkpoint is written after the records
+queued before it, it never runs ahead of the journal.  A crash loses at
+most the records not yet written, and a scan resumed from the
+checkpoint finds those hits again.  A torn last line is skipped on
+replay.  Only exit paths block, in flush().
+
+`python journal.py replay` rebuilds the checkpoint state from the
+journal; `compact` rewrites the journal as its unique hits plus the
+last progress record (stop the search first).
+"""
+import argparse, json, os, threading, time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+JOURNAL_FILE = Path("results.jsonl")
+SCAN_ENGINES = ("brute", "batch", "sharded")   # hits counted in checkpoint.json
+
+def write_atomic(path: Path, text: str):
+    """Replace `path` with `text` so readers never see a partial file."""
+    path = Path(path)
+    tmp = Path(f"{path}.{os.getpid()}.tmp")
+    with tmp.open("w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    tmp.replace(path)
+
+# ──────────────────────────  journal  ───────────────────────────
+class Journal:
+    """Append-only JSONL file, opened on first use; written by one thread."""
+
+    def __init__(self, path: Path = JOURNAL_FILE):
+        self.path = Path(path)
+        self.f    = None
+
+    def write(self, recs: List[dict]):
+        if self.f is None:
+            self.f = self.path.open("a")
+        self.f.write("".join(json.dumps(r) + "\n" for r in recs))
+
+    def sync(self):
+        if self.f is not None:
+            self.f.flush()
+            os.fsync(self.f.fileno())
+
+    def close(self):
+        if self.f is not None:
+            self.sync()
+            self.f.close()
+            self.f = None
+
+# ──────────────────────────  background writer  ─────────────────
+class CheckpointWriter:
+    """
+    Daemon thread that owns every write of a search: journal records in
+    order (one fsync per batch), then the newest text of each replaced
+    file, then the newest checkpoint.  States submitted faster than the
+    disk keeps up collapse into the newest one.
+    """
+
+    def __init__(self, path: Path, journal: Optional[Journal] = None):
+        self.path    = Path(path)
+        self.journal = journal or Journal()
+        self.cond    = threading.Condition(threading.RLock())
+        self.pending: Optional[dict] = None        # newest checkpoint state
+        self.records: List[dict] = []              # journal records, oldest first
+        self.files:   Dict[Path, str] = {}         # newest text per replaced file
+        self.busy    = False
+        self.thread: Optional[threading.Thread] = None
+
+    def _wake(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        self.cond.notify_all()
+
+    def submit(self, state: dict):
+        with self.cond:
+            self.pending = dict(state)
+            self._wake()
+
+    def append(self, event: str, **fields):
+        rec = {"ts": round(time.time(), 3), "event": event, **fields}
+        with self.cond:
+            self.records.append(rec)
+            self._wake()
+
+    def hit(self, engine: str, index: int, **tables):
+        self.append("hit", engine=engine, index=index, **tables)
+
+    def progress(self, state: dict):
+        self.append("progress", **state)
+
+    def replace(self, path: Path, text: str):
+        """write_atomic(path, text) on the writer thread."""
+        with self.cond:
+            self.files[Path(path)] = text
+            self._wake()
+
+    def _queued(self) -> bool:
+        return self.pending is not None or bool(self.records) or bool(self.files)
+
+    def flush(self, timeout: float = 30.0):
+        """Block until everything submitted so far is on disk."""
+        with self.cond:
+            self.cond.wait_for(lambda: not self._queued() and not self.busy, timeout)
+
+    def close(self):
+        self.flush()
+        self.journal.close()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(self._queued)
+                state, recs, files = self.pending, self.records, self.files
+                self.pending, self.records, self.files, self.busy = None, [], {}, True
+            try:
+                if recs:
+                    self.journal.write(recs)
+                    self.journal.sync()            # one fsync for the whole batch
+                for path, text in files.items():
+                    write_atomic(path, text)
+                if state is not None:
+                    write_atomic(self.path, json.dumps(state))
+            finally:
+                with self.cond:
+                    self.busy = False
+                    self.cond.notify_all()
+
+# ──────────────────────────  replay / compact  ──────────────────
+def records(path: Path = JOURNAL_FILE) -> List[dict]:
+    """Every complete record; a torn last line from a crash is skipped."""
+    out = []
+    if not Path(path).exists():
+        return out
+    for ln in Path(path).read_text().splitlines():
+        try:
+            out.append(json.loads(ln))
+        except ValueError:
+            continue
+    return out
+
+def replay(path: Path = JOURNAL_FILE) -> Dict:
+    """
+    Checkpoint state rebuilt from the journal: the last progress record,
+    with perfect_hits recounted from the unique scan hits it covers (a
+    scan resumed after a crash can log the same hit twice).
+    """
+    recs = records(path)
+    state = {"total_tested": 0, "perfect_hits": 0, "best_score": 0.0}
+    for r in recs:
+        if r["event"] == "progress":
+            state = {k: v for k, v in r.items() if k not in ("ts", "event")}
+    hits = {r["index"] for r in recs
+            if r["event"] == "hit" and r.get("engine") in SCAN_ENGINES}
+    state["perfect_hits"] = sum(1 for i in hits if i <= state["total_tested"])
+    return state
+
+def compact(path: Path = JOURNAL_FILE) -> int:
+    """Rewrite the journal as unique hits plus the last progress record."""
+    recs, seen, keep, last = records(path), set(), [], None
+    for r in recs:
+        if r["event"] == "progress":
+            last = r
+        elif r["event"] == "hit":
+            key = (r.get("engine"), r["index"])
+            if key not in seen:
+                seen.add(key)
+                keep.append(r)
+    if last is not None:
+        keep.append(last)
+    write_atomic(path, "".join(json.dumps(r) + "\n" for r in keep))
+    return len(recs) - len(keep)
+
+def main():
+    ap = argparse.ArgumentParser(description="replay or compact the results journal")
+    ap.add_argument("action", choices=["replay", "compact"])
+    ap.add_argument("--journal", type=Path, default=JOURNAL_FILE)
+    ap.add_argument("--write-checkpoint", type=Path, metavar="PATH",
+                    help="replay: also write the rebuilt state here (e.g. checkpoint.json)")
+    args = ap.parse_args()
+
+    if args.action == "compact":
+        print(f"dropped {compact(args.journal):,} records from {args.journal}")
+        return
+    state = replay(args.journal)
+    print(json.dumps(state))
+    if args.write_checkpoint:
+        write_atomic(args.write_checkpoint, json.dumps(state))
+
+if __name__ == "__main__":
+    main()
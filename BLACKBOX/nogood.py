@@ -0,0 +1,73 @@
+"""
+nogood.py  – learned conflicts and skip-ahead for the ordered scan
+
+A candidate index is 41 mixed-radix digits, most significant first:
+
+    fa[0..5]  fb[0..8]  ga[0..7]  gb[0..17]
+
+A rejected check of MS-C pair (a_c, box) on MS-A line ℓ only involves
+fa[a_c], fb[box], ga[p(ℓ)] and gb[s(box, ℓ)], and often fewer:
+
+    no f_B value rescues the pair once f_A(a_c) = x   →  {fa[a_c]}
+    the pair cannot be won once f_A, f_B are fixed    →  {fa[a_c], fb[box]}
+    no g_B bit goes with this g_A choice on ℓ         →  … + ga[p]
+    otherwise                                         →  … + ga[p], gb[s]
+
+Every later candidate that keeps those digits fails the same way.  In
+product order they form one block: the rest of the run in which the
+least significant conflicting digit d stays fixed, so the scan can
+resume at the next multiple of WEIGHT[d].  Everything below that index
+has been decided, so total_tested keeps its meaning.
+
+Conflicts are learned per (pair, f_A, f_B, pattern, g_A choice, g_B bit)
+the first time they are seen and looked up afterwards.
+"""
+import math
+from typing import Dict, Tuple
+
+from backtrack import N_FA, N_FB, N_GA, R_FB, _pair_ok, compile_pairs
+from space     import PATTERN_ID, SHAPE
+
+RADIX  = [r for n, r in SHAPE for _ in range(n)]
+WEIGHT = [math.prod(RADIX[d + 1:]) for d in range(len(RADIX))]
+FB0, GA0, GB0 = N_FA, N_FA + N_FB, N_FA + N_FB + N_GA
+
+class Nogoods:
+    def __init__(self, msa, msc):
+        self.pairs, self.lines, self.rel = compile_pairs(msa, msc)
+        self.learned: Dict[tuple, int] = {}       # conflict → its lowest digit
+        self.ok: Dict[Tuple[int, int, int], bool] = {}
+        self.skipped = 0
+
+    def _pair_ok(self, k: int, x: int, y: int) -> bool:
+        key = (k, x, y)
+        if key not in self.ok:
+            self.ok[key] = _pair_ok(self.rel[k], self.lines[(x, y)])
+        return self.ok[key]
+
+    def digit(self, cand, k: int, line: tuple) -> int:
+        """Least significant digit of the minimal conflict behind a failed check."""
+        a_c, box = self.pairs[k]
+        x, y = cand.fa[a_c], cand.fb[box]
+        p = PATTERN_ID[line]
+        s, ok = self.rel[k][p]
+        key = (k, x, y, p, cand.ga[p], cand.gb[s])
+        d = self.learned.get(key)
+        if d is None:
+            if not any(self._pair_ok(k, x, yy) for yy in range(R_FB)):
+                d = a_c
+            elif not self._pair_ok(k, x, y):
+                d = FB0 + box
+            elif not any(ch == cand.ga[p] for ch, _ in ok):
+                d = GA0 + p
+            else:
+                d = GB0 + s
+            self.learned[key] = d
+        return d
+
+    def next_index(self, index: int, cand, k: int, line: tuple) -> int:
+        """First index after `index` (0-based, just rejected) that can differ."""
+        w = WEIGHT[self.digit(cand, k, line)]
+        nxt = (index // w + 1) * w
+        self.skipped += nxt - index - 1
+        return nxt
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+nosignal.py  – no-signalling value of a game as a sparse LP
+
+A behaviour p(α, β | a, b) is no-signalling when Alice's marginal does
+not depend on b and Bob's does not depend on a.  The no-signalling value
+under an input distribution π is
+
+    max  Σ_ab π(a, b) Σ_{(α, β) allowed on (a, b)} p(α, β | a, b)
+    s.t. Σ_αβ p(α, β | a, b) = 1                           every (a, b)
+         Σ_β p(α, β | a, b) = Σ_β p(α, β | a, 0)          every a, α, b > 0
+         Σ_α p(α, β | a, b) = Σ_α p(α, β | 0, b)          every b, β, a > 0
+         p ≥ 0
+
+Answers that are never allowed for an input are merged away first (a
+local relabelling keeps p no-signalling and cannot lose), so each input
+only carries the codes its outcome masks use.  Polytope builds the
+equality matrix as one scipy.sparse CSR straight from the masks, with a
+NumPy pass per input pair and no object per variable, and polytope()
+keeps one per game in memory.  Only the objective depends on π, so
+re-solving for another distribution reuses the matrix and just hands
+HiGHS a new cost vector.  π defaults to uniform over the legal pairs,
+as in verify() and classical.py.
+
+check_reduction() pulls the target's optimal behaviour back through a
+reduction and reports how much the result signals and what it wins on
+the source.  A local reduction keeps it no-signalling, so its win is a
+lower bound on the source's value.  Per-pair fb / gb forms and g tables
+that read the other player's code break this.  ctoa.py's space is one
+case: g_B reads Alice's MS-A line.
+
+    python nosignal.py MSA/msa_blackbox_outputs.json --resolve 100
+"""
+import argparse, time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+
+from bnb       import games_key
+from classical import win_table
+from gametable import GameTable, load_game
+from verify    import local_rows
+
+LP_METHOD = "highs-ipm"             # ~10× faster than dual simplex on the 5×5 variants
+
+class NSValue(NamedTuple):
+    value:     float
+    behaviour: np.ndarray            # (n_a, n_b, 2^alice_bits, 2^bob_bits)
+    seconds:   float
+
+class ReductionCheck(NamedTuple):
+    target:     float                # target's NS value
+    pulled:     float                # source win probability of the pulled-back behaviour
+    source:     float                # source's NS value (bounds `pulled` when it is NS)
+    signalling: float                # largest marginal mismatch of the pulled-back behaviour
+
+# ──────────────────────────  polytope  ──────────────────────────
+class Polytope:
+    """Sparse no-signalling constraints of one game, independent of π."""
+
+    def __init__(self, game: GameTable):
+        self.game = game
+        n_a, n_b = game.n_a, game.n_b
+        allowed = win_table(game).transpose(0, 2, 1, 3)     # (a, b, α, β)
+        self.allowed = allowed
+        use_a = allowed.any(axis=(1, 3))                     # (n_a, α)
+        use_b = allowed.any(axis=(0, 2))                     # (n_b, β)
+        use_a[~use_a.any(1), 0] = True                       # an input with no wins answers 0
+        use_b[~use_b.any(1), 0] = True
+        self.alpha = [np.flatnonzero(r) for r in use_a]
+        self.beta  = [np.flatnonzero(r) for r in use_b]
+        na = np.array([len(v) for v in self.alpha])
+        nb = np.array([len(v) for v in self.beta])
+        size = np.outer(na, nb)                              # variables per pair
+        self.offset = np.concatenate([[0], np.cumsum(size)])[:-1].reshape(n_a, n_b)
+        self.n_vars = int(size.sum())
+        self.legal = allowed.any(axis=(2, 3))
+
+        rows, cols, vals, row = [], [], [], 0
+
+        def put(r, c, v):
+            rows.append(r)
+            cols.append(c)
+            vals.append(np.full(len(c), v))
+
+        self.win = np.zeros(self.n_vars)
+        self.pair = np.zeros(self.n_vars, dtype=np.intp)     # flat (a, b) of each variable
+        for a in range(n_a):
+            for b in range(n_b):
+                blk = self.offset[a, b] + np.arange(size[a, b])
+                self.win[blk] = allowed[a, b][np.ix_(self.alpha[a], self.beta[b])].ravel()
+                self.pair[blk] = a * n_b + b
+                put(np.full(len(blk), row), blk, 1.0)        # normalisation
+                row += 1
+        # Alice: Σ_β p(α_i, β | a, b) − Σ_β p(α_i, β | a, 0) = 0
+        for a in range(n_a):
+            for b in range(1, n_b):
+                for blk_b, sign in ((b, 1.0), (0, -1.0)):
+                    c = self.offset[a, blk_b] + np.arange(na[a] * nb[blk_b])
+                    put(row + (c - self.offset[a, blk_b]) // nb[blk_b], c, sign)
+                row += na[a]
+        # Bob: Σ_α p(α, β_j | a, b) − Σ_α p(α, β_j | 0, b) = 0
+        for b in range(n_b):
+            for a in range(1, n_a):
+                for blk_a, sign in ((a, 1.0), (0, -1.0)):
+                    c = self.offset[blk_a, b] + np.arange(na[blk_a] * nb[b])
+                    put(row + (c - self.offset[blk_a, b]) % nb[b], c, sign)
+                row += nb[b]
+        r, c, v = (np.concatenate(x) if x else np.zeros(0) for x in (rows, cols, vals))
+        self.a_eq = sp.csr_matrix((v, (r.astype(np.intp), c.astype(np.intp))),
+                                  shape=(row, self.n_vars))
+        self.b_eq = np.zeros(row)
+        self.b_eq[:n_a * n_b] = 1.0
+
+    def objective(self, pi: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cost vector for linprog (negated win weight of every variable)."""
+        if pi is None:
+            pi = self.legal / max(1, self.legal.sum())
+        return -np.asarray(pi, dtype=float).ravel()[self.pair] * self.win
+
+    def solve(self, pi: Optional[np.ndarray] = None, method: str = LP_METHOD) -> NSValue:
+        t0 = time.perf_counter()
+        res = linprog(self.objective(pi), A_eq=self.a_eq, b_eq=self.b_eq,
+                      bounds=(0, None), method=method)
+        if res.status != 0:
+            raise RuntimeError(f"HiGHS failed: {res.message}")
+        return NSValue(-res.fun, self.dense(res.x), time.perf_counter() - t0)
+
+    def dense(self, x: np.ndarray) -> np.ndarray:
+        """Variable vector → p[a, b, α, β] over the full code range."""
+        g = self.game
+        p = np.zeros(self.allowed.shape)
+        for a in range(g.n_a):
+            for b in range(g.n_b):
+                blk = x[self.offset[a, b]:self.offset[a, b] + len(self.alpha[a]) * len(self.beta[b])]
+                p[a, b][np.ix_(self.alpha[a], self.beta[b])] = blk.reshape(len(self.alpha[a]), -1)
+        return p
+
+_POLYTOPES: Dict[str, Polytope] = {}
+
+def polytope(game: GameTable) -> Polytope:
+    """The game's Polytope, built once per table content."""
+    key = games_key(game, game)
+    if key not in _POLYTOPES:
+        _POLYTOPES[key] = Polytope(game)
+    return _POLYTOPES[key]
+
+def ns_value(game: GameTable, pi: Optional[np.ndarray] = None) -> NSValue:
+    return polytope(game).solve(pi)
+
+# ──────────────────────────  behaviours  ────────────────────────
+def signalling(p: np.ndarray) -> float:
+    """Largest deviation of p[a, b, α, β] from no-signalling and normalisation."""
+    alice = p.sum(3)                                         # (a, b, α)
+    bob   = p.sum(2)                                         # (a, b, β)
+    return float(max(np.abs(alice - alice[:, :1]).max(), np.abs(bob - bob[:1]).max(),
+                     np.abs(p.sum((2, 3)) - 1).max()))
+
+def win_probability(game: GameTable, p: np.ndarray, pi: Optional[np.ndarray] = None) -> float:
+    allowed = polytope(game).allowed
+    if pi is None:
+        legal = allowed.any(axis=(2, 3))
+        pi = legal / max(1, legal.sum())
+    return float((pi * (p * allowed).sum((2, 3))).sum())
+
+def pullback(source: GameTable, q: np.ndarray, fa, fb, ga, gb) -> np.ndarray:
+    """Source behaviour of a verify()-form reduction run on target behaviour q."""
+    row = local_rows(fa, fb, ga, gb)
+    n_t = q.shape[2] * q.shape[3]
+    p = np.zeros((source.n_a, source.n_b, 1 << source.alice_bits, 1 << source.bob_bits))
+    for a in range(source.n_a):
+        for b in range(source.n_b):
+            x, y, g_a, g_b = row(a, b)
+            np.add.at(p[a, b], (np.asarray(g_a[:n_t]), np.asarray(g_b[:n_t])),
+                      q[x, y].ravel())
+    return p
+
+def check_reduction(source: GameTable, target: GameTable, fa, fb, ga, gb) -> ReductionCheck:
+    t = ns_value(target)
+    p = pullback(source, t.behaviour, fa, fb, ga, gb)
+    return ReductionCheck(t.value, win_probability(source, p), ns_value(source).value,
+                          signalling(p))
+
+# ──────────────────────────  main  ──────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="no-signalling value of games (sparse LP)")
+    ap.add_argument("games", type=Path, nargs="+", help="JSON or .gtb games")
+    ap.add_argument("--resolve", type=int, default=0,
+                    help="also solve this many random input distributions per game")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    for path in args.games:
+        game = load_game(path)
+        t0 = time.perf_counter()
+        poly = polytope(game)
+        built = time.perf_counter() - t0
+        v = poly.solve()
+        print(f"{path}: NS value {v.value:.6f}  ({poly.n_vars:,} variables, "
+              f"{poly.a_eq.shape[0]:,} rows, {poly.a_eq.nnz:,} nonzeros; "
+              f"built {built:.3f} s, solved {v.seconds:.3f} s, "
+              f"signalling {signalling(v.behaviour):.1e})")
+        if args.resolve:
+            vals: List[float] = []
+            t0 = time.perf_counter()
+            for _ in range(args.resolve):
+                pi = rng.random((game.n_a, game.n_b)) * poly.legal
+                vals.append(poly.solve(pi / pi.sum()).value)
+            dt = time.perf_counter() - t0
+            print(f"  {args.resolve} random π: value {min(vals):.4f} … {max(vals):.4f}, "
+                  f"{dt / args.resolve * 1e3:.1f} ms per solve")
+
+if __name__ == "__main__":
+    main()
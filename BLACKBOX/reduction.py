@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+reduction.py  – reduction search between any two compiled games
+
+ctoa.py's space is specific to MS-C → MS-A: 6 lines, 9 boxes, 8 line
+patterns and 18 g_B situations told apart by the parity of Alice's
+line.  Here the shapes come from the games themselves.  A reduction
+from a source game S to a target game T is local:
+
+    fa[a]      S Alice input → T Alice input
+    fb[b]      S Bob input   → T Bob input
+    ga[a][α]   S Alice output code from her S input and T output code
+    gb[b][β]   S Bob output code from his S input and T output code
+
+Once fa[a] and fb[b] are fixed, every T outcome (α, β) of the mapped
+pair becomes a binary constraint between the cells ga[a][α] and
+gb[b][β]: their values must be an allowed S outcome of (a, b).  A T
+pair with no outcomes loses, as in verify().
+
+Problem compiles those constraints once per (S, T) pair and caches, in
+CACHE_DIR, which mapped T pairs each S pair can survive on its own.
+Three engines run on it:
+
+  sat        one-hot CNF of every table, solved by sat.py's CDCL solver
+             (or an external one); its learnt clauses are what finds
+             MS-C → MS-A, in under a minute of pure Python.  Hits are
+             canonical as below, each followed by its blocking clause
+  backtrack  f entries in an order that closes source pairs early; each
+             closed pair's constraints are propagated into the g domains
+             and every g group they touch must still be solvable, then
+             the g cells are split into groups that share no constraint
+             and each group is solved smallest-domain first.  Hits are
+             canonical: g cells no constraint reads (T outcomes no
+             mapped pair produces) take their lowest value.  Constant g
+             tables turn any classical strategy of T into a solution of
+             the pairs fixed so far, so a partial f only fails once the
+             pairs it fixes beat the source's classical value – fine for
+             small games, hopeless for MS-C → MS-A
+  anneal     maximises the S pairs won (for games with no perfect one)
+
+Hits are confirmed with verify() on their expanded tables.
+
+    python reduction.py MSB/msb_blackbox_outputs.json MSA/msa_blackbox_outputs.json
+"""
+import argparse, json, math, random
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from anneal    import STEPS, T_END, T_START
+from bnb       import games_key
+from gametable import GameTable, load_game
+from sat       import Solver, find_external, solve_external, to_dimacs
+from verify    import verify
+
+CACHE_DIR = Path("compiled")
+
+class Reduction(NamedTuple):
+    fa: Tuple[int, ...]
+    fb: Tuple[int, ...]
+    ga: Tuple[Tuple[int, ...], ...]      # (S Alice input, T Alice code)
+    gb: Tuple[Tuple[int, ...], ...]      # (S Bob input, T Bob code)
+
+    def to_json(self) -> dict:
+        return {"fa": self.fa, "fb": self.fb, "ga": self.ga, "gb": self.gb}
+
+def _codes(mask: int) -> List[int]:
+    return [v for v in range(mask.bit_length()) if mask >> v & 1]
+
+# ──────────────────────────  compiled constraints  ──────────────
+class Problem:
+    """Constraints of one (source, target) pair, shared by every engine."""
+
+    def __init__(self, source: GameTable, target: GameTable, cache: Optional[Path] = CACHE_DIR):
+        self.source, self.target = source, target
+        self.key   = games_key(target, source)
+        self.pairs = source.pairs()
+        t_bob = (1 << target.bob_bits) - 1
+        s_bob = (1 << source.bob_bits) - 1
+        # T outcomes per T pair as (α, β) codes
+        self.outs: Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]] = {
+            (x, y): tuple((o >> target.bob_bits, o & t_bob)
+                          for o in _codes(target.mask(x, y)))
+            for x in range(target.n_a) for y in range(target.n_b)}
+        # supports: sup_a[k][sa] = S Bob codes allowed with sa, sup_b[k][sb] likewise
+        self.sup_a, self.sup_b = [], []
+        for a, b in self.pairs:
+            sa_sup = [0] * (1 << source.alice_bits)
+            sb_sup = [0] * (1 << source.bob_bits)
+            for o in _codes(source.mask(a, b)):
+                sa, sb = o >> source.bob_bits, o & s_bob
+                sa_sup[sa] |= 1 << sb
+                sb_sup[sb] |= 1 << sa
+            self.sup_a.append(sa_sup)
+            self.sup_b.append(sb_sup)
+        # S output codes that appear at all: the g cell domains
+        self.full_a = 0
+        self.full_b = 0
+        for k in range(len(self.pairs)):
+            self.full_a |= sum(1 << sa for sa, s in enumerate(self.sup_a[k]) if s)
+            self.full_b |= sum(1 << sb for sb, s in enumerate(self.sup_b[k]) if s)
+        self.n_alpha = 1 << target.alice_bits
+        self.n_beta  = 1 << target.bob_bits
+        self.by_a = [[k for k, (a, _) in enumerate(self.pairs) if a == i]
+                     for i in range(source.n_a)]
+        self.by_b = [[k for k, (_, b) in enumerate(self.pairs) if b == j]
+                     for j in range(source.n_b)]
+        self.memo: Dict[Tuple[int, int, int], Tuple[int, int]] = {}
+        self.pair_ok = self._load_pair_ok(cache)
+
+    def cons(self, k: int, x: int, y: int) -> List[Tuple[int, int, int]]:
+        """(ga cell, gb cell, pair) constraints of pair k mapped to (x, y)."""
+        a, b = self.pairs[k]
+        return [(a * self.n_alpha + al, b * self.n_beta + be, k)
+                for al, be in self.outs[(x, y)]]
+
+    def domains(self) -> Tuple[List[int], List[int]]:
+        return ([self.full_a] * (self.source.n_a * self.n_alpha),
+                [self.full_b] * (self.source.n_b * self.n_beta))
+
+    def revise(self, cons, dom_a: List[int], dom_b: List[int], pending=None) -> bool:
+        """
+        Arc consistency in place; False on a domain wipe-out.  The first
+        pass covers `pending` (default: all of `cons`, which must otherwise
+        already be consistent); after it only constraints on a cell that
+        just shrank are redone.
+        """
+        memo = self.memo
+        if pending is None:
+            pending = cons
+        while pending:
+            shrunk_a, shrunk_b = set(), set()
+            for i, j, k in pending:
+                da, db = dom_a[i], dom_b[j]
+                key = (k, da, db)
+                new = memo.get(key)
+                if new is None:
+                    new = memo[key] = self._support(k, da, db)
+                na, nb = new
+                if not na:
+                    return False
+                if na != da:
+                    dom_a[i] = na
+                    shrunk_a.add(i)
+                if nb != db:
+                    dom_b[j] = nb
+                    shrunk_b.add(j)
+            if not (shrunk_a or shrunk_b):
+                break
+            pending = [c for c in cons if c[0] in shrunk_a or c[1] in shrunk_b]
+        return True
+
+    def _support(self, k: int, da: int, db: int) -> Tuple[int, int]:
+        """(ga values, gb values) of da × db that pair k allows together."""
+        sup = self.sup_a[k]
+        na = nb = 0
+        m = da
+        while m:
+            low = m & -m
+            m ^= low
+            s = sup[low.bit_length() - 1] & db
+            if s:
+                na |= low
+                nb |= s
+        return na, nb
+
+    def _load_pair_ok(self, cache: Optional[Path]) -> np.ndarray:
+        """(P, T n_a, T n_b): pair k can be won on its own when mapped to (x, y)."""
+        path = cache / f"{self.key}.npy" if cache else None
+        shape = (len(self.pairs), self.target.n_a, self.target.n_b)
+        if path and path.exists():
+            ok = np.load(path)
+            if ok.shape == shape:
+                return ok
+        ok = np.zeros(shape, dtype=bool)
+        for k in range(len(self.pairs)):
+            for (x, y), outs in self.outs.items():
+                if outs:
+                    ok[k, x, y] = self.revise(self.cons(k, x, y), *self.domains())
+        if path:
+            path.parent.mkdir(exist_ok=True)
+            tmp = path.with_suffix(".tmp.npy")
+            np.save(tmp, ok)
+            tmp.replace(path)
+        return ok
+
+    def expand(self, red: Reduction):
+        """verify()-form tables (one candidate) of a reduction."""
+        t = self.target
+        o = np.arange(1 << (t.alice_bits + t.bob_bits))
+        ga = np.asarray(red.ga)[:, o >> t.bob_bits]
+        gb = np.asarray(red.gb)[:, o & (1 << t.bob_bits) - 1]
+        return [red.fa], [red.fb], [ga], [gb]
+
+    def wins(self, red: Reduction) -> int:
+        return int(verify(self.source, self.target, *self.expand(red)).wins[0])
+
+# ──────────────────────────  backtrack  ─────────────────────────
+def _low(d: int) -> int:
+    return (d & -d).bit_length() - 1
+
+def components(cons) -> List[list]:
+    """Constraints split into groups that share no g cell."""
+    parent: Dict[tuple, tuple] = {}
+    def find(u):
+        while parent.setdefault(u, u) != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        return u
+    for i, j, _ in cons:
+        parent[find(("a", i))] = find(("b", j))
+    groups: Dict[tuple, list] = {}
+    for c in cons:
+        groups.setdefault(find(("a", c[0])), []).append(c)
+    return list(groups.values())
+
+def solve_part(pb: "Problem", cons, dom_a: List[int], dom_b: List[int]
+               ) -> Iterator[Tuple[List[int], List[int]]]:
+    """
+    Domains with every cell of `cons` fixed, one per solution of that
+    group; the smallest open domain is branched on first.
+    """
+    cells = [(dom_a, i) for i in {c[0] for c in cons}] + \
+            [(dom_b, j) for j in {c[1] for c in cons}]
+    open_ = [(bin(d[i]).count("1"), n) for n, (d, i) in enumerate(cells) if d[i] & d[i] - 1]
+    if not open_:
+        yield dom_a, dom_b
+        return
+    d, i = cells[min(open_)[1]]
+    for v in _codes(d[i]):
+        da, db = list(dom_a), list(dom_b)
+        (da if d is dom_a else db)[i] = 1 << v
+        if pb.revise(cons, da, db):
+            yield from solve_part(pb, cons, da, db)
+
+def f_order(pb: Problem) -> List[Tuple[int, int]]:
+    """
+    f entries as (side, input), side 0 = Alice, 1 = Bob, ordered so legal
+    pairs complete as early as possible: each step takes the entry that
+    closes the most pairs with those already placed (lowest side, then
+    input, on ties).
+    """
+    s = pb.source
+    placed = [set(), set()]
+    todo = [(0, i) for i in range(s.n_a)] + [(1, j) for j in range(s.n_b)]
+    order = []
+
+    def closes(e):
+        side, i = e
+        ks = pb.by_a[i] if side == 0 else pb.by_b[i]
+        return sum(pb.pairs[k][1 - side] in placed[1 - side] for k in ks)
+
+    while todo:
+        e = max(todo, key=lambda e: (closes(e), -todo.index(e)))
+        todo.remove(e)
+        placed[e[0]].add(e[1])
+        order.append(e)
+    return order
+
+def solve(pb: Problem) -> Iterator[Reduction]:
+    """
+    Every perfect reduction with its unconstrained g cells at their lowest
+    value (one canonical representative each).
+
+    f entries are placed in f_order(), each value in increasing order.
+    When a placement completes source pairs, their constraints are
+    propagated into the running g domains.  Every g component they touch
+    must then still have a solution, so a partial f fails as soon as the
+    pairs it fixes do.
+    """
+    s, t = pb.source, pb.target
+    f = [[None] * s.n_a, [None] * s.n_b]
+    order = f_order(pb)
+    seen = [set(), set()]
+    closed = []                                  # pairs completed by each step
+    for side, i in order:
+        seen[side].add(i)
+        ks = pb.by_a[i] if side == 0 else pb.by_b[i]
+        closed.append([k for k in ks if pb.pairs[k][1 - side] in seen[1 - side]])
+
+    def solvable(cons, add, dom_a, dom_b) -> bool:
+        new = set(add)
+        return all(next(solve_part(pb, comp, dom_a, dom_b), None) is not None
+                   for comp in components(cons) if not new.isdisjoint(comp))
+
+    def place(step: int, cons, dom_a, dom_b):
+        if step == len(order):
+            yield from assign_g(components(cons), dom_a, dom_b, 0)
+            return
+        side, i = order[step]
+        for v in range(t.n_a if side == 0 else t.n_b):
+            f[side][i] = v
+            ks = closed[step]
+            xy = [(f[0][pb.pairs[k][0]], f[1][pb.pairs[k][1]]) for k in ks]
+            if not all(pb.pair_ok[k, x, y] for k, (x, y) in zip(ks, xy)):
+                continue
+            add = [c for k, (x, y) in zip(ks, xy) for c in pb.cons(k, x, y)]
+            if not add:
+                yield from place(step + 1, cons, dom_a, dom_b)
+                continue
+            da, db = list(dom_a), list(dom_b)
+            both = cons + add
+            if pb.revise(both, da, db, add) and solvable(both, add, da, db):
+                yield from place(step + 1, both, da, db)
+        f[side][i] = None
+
+    def assign_g(comps, dom_a, dom_b, i: int):
+        """One component at a time; cells no constraint reads take their lowest value."""
+        if i == len(comps):
+            ga = [_low(d) for d in dom_a]
+            gb = [_low(d) for d in dom_b]
+            yield Reduction(tuple(f[0]), tuple(f[1]),
+                            tuple(tuple(ga[a * pb.n_alpha:(a + 1) * pb.n_alpha])
+                                  for a in range(s.n_a)),
+                            tuple(tuple(gb[b * pb.n_beta:(b + 1) * pb.n_beta])
+                                  for b in range(s.n_b)))
+            return
+        for da, db in solve_part(pb, comps[i], dom_a, dom_b):
+            yield from assign_g(comps, da, db, i + 1)
+
+    yield from place(0, [], *pb.domains())
+
+# ──────────────────────────  sat  ───────────────────────────────
+class Cnf(NamedTuple):
+    n_vars:  int
+    clauses: List[List[int]]
+    fa:      List[List[int]]             # fa[a][x]
+    fb:      List[List[int]]             # fb[b][y]
+    ga:      List[List[List[int]]]       # ga[a][α][n]: ga[a][α] = vals_a[n]
+    gb:      List[List[List[int]]]
+    vals_a:  List[int]
+    vals_b:  List[int]
+
+def encode(pb: Problem) -> Cnf:
+    """
+    One-hot variables for every table entry.  Each S pair k = (a, b),
+    T pair (x, y) it cannot survive gets ¬fa[a][x] ∨ ¬fb[b][y]; on the
+    others every T outcome (α, β) and disallowed pair of values (u, w)
+    gets ¬fa[a][x] ∨ ¬fb[b][y] ∨ ¬ga[a][α]=u ∨ ¬gb[b][β]=w.
+    """
+    s, t = pb.source, pb.target
+    vals_a, vals_b = _codes(pb.full_a) or [0], _codes(pb.full_b) or [0]
+    n = 0
+    def block(rows, cols):
+        nonlocal n
+        out = [list(range(n + 1 + r*cols, n + 1 + (r + 1)*cols)) for r in range(rows)]
+        n += rows * cols
+        return out
+    fa = block(s.n_a, t.n_a)
+    fb = block(s.n_b, t.n_b)
+    ga = [block(pb.n_alpha, len(vals_a)) for _ in range(s.n_a)]
+    gb = [block(pb.n_beta, len(vals_b)) for _ in range(s.n_b)]
+
+    clauses: List[List[int]] = []
+    for lits in fa + fb + [l for g in ga + gb for l in g]:
+        clauses.append(list(lits))
+        clauses.extend([-u, -v] for i, u in enumerate(lits) for v in lits[i + 1:])
+    for k, (a, b) in enumerate(pb.pairs):
+        bad = [(iu, iw) for iu, u in enumerate(vals_a) for iw, w in enumerate(vals_b)
+               if not pb.sup_a[k][u] >> w & 1]
+        for (x, y), outs in pb.outs.items():
+            fx, fy = -fa[a][x], -fb[b][y]
+            if not outs or not pb.pair_ok[k, x, y]:
+                clauses.append([fx, fy])
+                continue
+            for al, be in outs:
+                clauses.extend([fx, fy, -ga[a][al][iu], -gb[b][be][iw]] for iu, iw in bad)
+    return Cnf(n, clauses, fa, fb, ga, gb, vals_a, vals_b)
+
+def read_cells(pb: Problem, fa, fb) -> Tuple[set, set]:
+    """(a, α) and (b, β) g cells some mapped pair's outcomes read."""
+    ra, rb = set(), set()
+    for a, b in pb.pairs:
+        for al, be in pb.outs[(fa[a], fb[b])]:
+            ra.add((a, al))
+            rb.add((b, be))
+    return ra, rb
+
+def decode(pb: Problem, cnf: Cnf, model) -> Reduction:
+    """Model → reduction, unread g cells at their lowest value as in solve()."""
+    def pick(lits):
+        return next(i for i, v in enumerate(lits) if v in model)
+    fa, fb = tuple(pick(l) for l in cnf.fa), tuple(pick(l) for l in cnf.fb)
+    ra, rb = read_cells(pb, fa, fb)
+    return Reduction(fa, fb,
+                     tuple(tuple(cnf.vals_a[pick(l) if (a, al) in ra else 0]
+                                 for al, l in enumerate(g)) for a, g in enumerate(cnf.ga)),
+                     tuple(tuple(cnf.vals_b[pick(l) if (b, be) in rb else 0]
+                                 for be, l in enumerate(g)) for b, g in enumerate(cnf.gb)))
+
+def blocking_clause(pb: Problem, cnf: Cnf, red: Reduction) -> List[int]:
+    """Excludes `red` and every reduction differing from it only in unread g cells."""
+    ra, rb = read_cells(pb, red.fa, red.fb)
+    return ([-cnf.fa[a][x] for a, x in enumerate(red.fa)]
+            + [-cnf.fb[b][y] for b, y in enumerate(red.fb)]
+            + [-cnf.ga[a][al][cnf.vals_a.index(red.ga[a][al])] for a, al in sorted(ra)]
+            + [-cnf.gb[b][be][cnf.vals_b.index(red.gb[b][be])] for b, be in sorted(rb)])
+
+def sat_solutions(pb: Problem, external: Optional[str] = None) -> Iterator[Reduction]:
+    """
+    Every perfect reduction up to unread g cells, one model at a time,
+    each followed by its blocking clause.  An empty stream proves none
+    exists.  `external` names a DIMACS solver command, as in sat.py.
+    """
+    cnf = encode(pb)
+    if external:
+        blocked: List[List[int]] = []
+        while (model := solve_external(external, to_dimacs(cnf, blocked))) is not None:
+            red = decode(pb, cnf, model)
+            yield red
+            blocked.append(blocking_clause(pb, cnf, red))
+        return
+    solver = Solver(cnf.n_vars, cnf.clauses)
+    while (model := solver.solve()) is not None:
+        red = decode(pb, cnf, model)
+        yield red
+        solver.add_clause(blocking_clause(pb, cnf, red))
+
+# ──────────────────────────  anneal  ────────────────────────────
+def anneal(pb: Problem, rng: random.Random, steps: int = STEPS) -> Tuple[int, Reduction]:
+    """Best (pairs won, reduction) of one cooling run; stops early when perfect."""
+    s, t = pb.source, pb.target
+    vals_a, vals_b = _codes(pb.full_a) or [0], _codes(pb.full_b) or [0]
+    fa = [rng.randrange(t.n_a) for _ in range(s.n_a)]
+    fb = [rng.randrange(t.n_b) for _ in range(s.n_b)]
+    ga = [[rng.choice(vals_a) for _ in range(pb.n_alpha)] for _ in range(s.n_a)]
+    gb = [[rng.choice(vals_b) for _ in range(pb.n_beta)] for _ in range(s.n_b)]
+    # variable kinds: (table, row) with the pairs a change can reach
+    kinds = [(0, s.n_a, t.n_a), (1, s.n_b, t.n_b),
+             (2, s.n_a, len(vals_a)), (3, s.n_b, len(vals_b))]
+    weights = [s.n_a, s.n_b, s.n_a * pb.n_alpha, s.n_b * pb.n_beta]
+
+    def won(k: int) -> bool:
+        a, b = pb.pairs[k]
+        outs = pb.outs[(fa[a], fb[b])]
+        sup = pb.sup_a[k]
+        return bool(outs) and all(sup[ga[a][al]] >> gb[b][be] & 1 for al, be in outs)
+
+    state = [won(k) for k in range(len(pb.pairs))]
+    wins = sum(state)
+    snap = lambda: Reduction(tuple(fa), tuple(fb), tuple(map(tuple, ga)), tuple(map(tuple, gb)))
+    best = (wins, snap())
+    cool = (T_END / T_START) ** (1 / steps)
+    temp = T_START
+    for _ in range(steps):
+        if wins == len(pb.pairs):
+            break
+        kind, rows, radix = rng.choices(kinds, weights)[0]
+        row = rng.randrange(rows)
+        if kind == 0:
+            table, idx, new, ks = fa, row, rng.randrange(radix), pb.by_a[row]
+        elif kind == 1:
+            table, idx, new, ks = fb, row, rng.randrange(radix), pb.by_b[row]
+        elif kind == 2:
+            table, idx, new, ks = ga[row], rng.randrange(pb.n_alpha), rng.choice(vals_a), pb.by_a[row]
+        else:
+            table, idx, new, ks = gb[row], rng.randrange(pb.n_beta), rng.choice(vals_b), pb.by_b[row]
+        old = table[idx]
+        if new == old:
+            continue
+        table[idx] = new
+        now = {k: won(k) for k in ks}
+        delta = sum(now.values()) - sum(state[k] for k in ks)
+        if delta >= 0 or rng.random() < math.exp(delta / temp):
+            for k, v in now.items():
+                state[k] = v
+            wins += delta
+            if wins > best[0]:
+                best = (wins, snap())
+        else:
+            table[idx] = old
+        temp *= cool
+    return best
+
+# ──────────────────────────  main  ──────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="search reductions between two games")
+    ap.add_argument("source", type=Path, help="game being reduced (JSON or .gtb)")
+    ap.add_argument("target", type=Path, help="game it is reduced to")
+    ap.add_argument("--engine", choices=["sat", "backtrack", "anneal"], default="sat")
+    ap.add_argument("--max-hits", type=int, default=1,
+                    help="sat/backtrack: stop after this many perfect reductions (0 = all)")
+    ap.add_argument("--sat-solver", default="",
+                    help="sat: external DIMACS solver command, or 'auto' to "
+                         "pick one from PATH (default: the built-in CDCL solver)")
+    ap.add_argument("--restarts", type=int, default=20, help="anneal: cooling runs")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", type=Path, help="append hits here as JSON lines")
+    ap.add_argument("--no-cache", action="store_true",
+                    help=f"do not read or write {CACHE_DIR}/")
+    args = ap.parse_args()
+
+    source, target = load_game(args.source), load_game(args.target)
+    pb = Problem(source, target, None if args.no_cache else CACHE_DIR)
+    n = len(pb.pairs)
+    print(f"{args.source} → {args.target}: {n} legal source pairs, "
+          f"{source.n_a}+{source.n_b} f entries, "
+          f"{source.n_a * pb.n_alpha}+{source.n_b * pb.n_beta} g cells")
+    out = args.out.open("a") if args.out else None
+
+    def report(red: Reduction, wins: int):
+        print(f"{wins}/{n}  {json.dumps(red.to_json())}")
+        if out:
+            out.write(json.dumps({"games": pb.key, "wins": wins, **red.to_json()}) + "\n")
+
+    if args.engine in ("sat", "backtrack"):
+        external = find_external() if args.sat_solver == "auto" else args.sat_solver or None
+        hits = 0
+        for red in (sat_solutions(pb, external) if args.engine == "sat" else solve(pb)):
+            wins = pb.wins(red)
+            if wins != n:
+                raise RuntimeError(f"verify() rejects a {args.engine} hit: {wins}/{n}")
+            report(red, wins)
+            hits += 1
+            if args.max_hits and hits >= args.max_hits:
+                break
+        print(f"{hits:,} perfect reduction(s)"
+              f"{' up to unconstrained g cells' if hits else ' – none exist'}"
+              if not args.max_hits or hits < args.max_hits else f"stopped at {hits:,}")
+    else:
+        rng, best = random.Random(args.seed), None
+        for _ in range(args.restarts):
+            wins, red = anneal(pb, rng)
+            if best is None or wins > best[0]:
+                best = (wins, red)
+            if wins == n:
+                break
+        report(best[1], pb.wins(best[1]))
+    if out:
+        out.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+sat.py  – CNF encoding of the MS-C → MS-A reduction question
+
+Variables (1-based, in this order):
+
+    fa[a][x]   f_A(a)   = x        one-hot, 6 × 6
+    fb[b][y]   f_B(box) = y        one-hot, 9 × 6
+    ga[p][ch]  g_A(p)   = ch       one-hot, 8 × 4
+    gb[s]      g_B(s)   = 1        18 plain bits
+
+For every legal MS-C pair (a_c, box), every (x, y) and every MS-A line p
+of (x, y), each (g_A choice, g_B bit) outside the MS-C allowed set gets
+one clause  ¬fa[a_c][x] ∨ ¬fb[box][y] ∨ ¬ga[p][ch] ∨ ±gb[s].  A model is
+exactly a perfect reduction; blocking its 41 table values and solving
+again enumerates the rest.
+
+The formula is solved with the small CDCL solver below, or with any
+DIMACS solver that prints competition-style "s …" / "v …" lines
+(kissat, cadical, glucose -model, …).
+"""
+import heapq, os, shutil, subprocess, tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from backtrack import Table, compile_pairs
+from space     import SHAPE
+
+N_FA, N_FB, N_GA, N_GB = (n for n, _ in SHAPE)
+R_FA, R_FB, R_GA, R_GB = (r for _, r in SHAPE)
+
+class Encoding(NamedTuple):
+    n_vars:  int
+    clauses: List[List[int]]
+    fa:      List[List[int]]
+    fb:      List[List[int]]
+    ga:      List[List[int]]
+    gb:      List[int]
+
+# ──────────────────────────  encoding  ──────────────────────────
+def _one_hot(clauses, lits):
+    clauses.append(list(lits))
+    clauses.extend([-u, -v] for i, u in enumerate(lits) for v in lits[i + 1:])
+
+def encode(msa, msc) -> Encoding:
+    pairs, lines, rel = compile_pairs(msa, msc)
+    n = 0
+    def block(rows, cols):
+        nonlocal n
+        out = [list(range(n + 1 + r*cols, n + 1 + (r + 1)*cols)) for r in range(rows)]
+        n += rows * cols
+        return out
+    fa = block(N_FA, R_FA)
+    fb = block(N_FB, R_FB)
+    ga = block(N_GA, R_GA)
+    gb = [v for (v,) in block(N_GB, 1)]
+
+    clauses: List[List[int]] = []
+    for table in (fa, fb, ga):
+        for lits in table:
+            _one_hot(clauses, lits)
+    for k, (a_c, box) in enumerate(pairs):
+        for x in range(R_FA):
+            for y in range(R_FB):
+                for p in lines[(x, y)]:
+                    s, ok = rel[k][p]
+                    ok = set(ok)
+                    for ch in range(R_GA):
+                        for bit in range(R_GB):
+                            if (ch, bit) not in ok:
+                                clauses.append([-fa[a_c][x], -fb[box][y], -ga[p][ch],
+                                                gb[s] if bit == 0 else -gb[s]])
+    return Encoding(n, clauses, fa, fb, ga, gb)
+
+def to_dimacs(enc: Encoding, extra: Sequence[Sequence[int]] = ()) -> str:
+    clauses = list(enc.clauses) + [list(c) for c in extra]
+    out = [f"p cnf {enc.n_vars} {len(clauses)}"]
+    out.extend(" ".join(map(str, c)) + " 0" for c in clauses)
+    return "\n".join(out) + "\n"
+
+def decode(enc: Encoding, model) -> Table:
+    """Model (a set of true variables) → (fa, fb, ga, gb) tables."""
+    def pick(lits):
+        return next(i for i, v in enumerate(lits) if v in model)
+    return (tuple(pick(l) for l in enc.fa), tuple(pick(l) for l in enc.fb),
+            tuple(pick(l) for l in enc.ga), tuple(int(v in model) for v in enc.gb))
+
+def blocking_clause(enc: Encoding, tables: Table) -> List[int]:
+    fa, fb, ga, gb = tables
+    return ([-enc.fa[a][x] for a, x in enumerate(fa)]
+            + [-enc.fb[b][y] for b, y in enumerate(fb)]
+            + [-enc.ga[p][c] for p, c in enumerate(ga)]
+            + [-v if bit else v for v, bit in zip(enc.gb, gb)])
+
+# ──────────────────────────  CDCL solver  ───────────────────────
+def _luby(i: int) -> int:
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while (1 << k) - 1 != i:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+class Solver:
+    """
+    Conflict-driven clause learning: two watched literals, first-UIP
+    learning, VSIDS-style activities, phase saving and Luby restarts.
+    Clauses may be added between solve() calls (blocking clauses).
+    """
+
+    def __init__(self, n_vars: int, clauses: Sequence[Sequence[int]] = ()):
+        self.n       = n_vars
+        self.value   = [0] * (n_vars + 1)          # +1 true, -1 false, 0 free
+        self.level   = [0] * (n_vars + 1)
+        self.reason: List[Optional[List[int]]] = [None] * (n_vars + 1)
+        self.phase   = [-1] * (n_vars + 1)
+        self.act     = [0.0] * (n_vars + 1)
+        self.inc     = 1.0
+        self.heap    = [(0.0, v) for v in range(1, n_vars + 1)]
+        self.watches: Dict[int, List[List[int]]] = {}
+        self.trail:  List[int] = []
+        self.limits: List[int] = []
+        self.qhead   = 0
+        self.ok      = True
+        for c in clauses:
+            self.add_clause(c)
+
+    def _val(self, lit: int) -> int:
+        v = self.value[abs(lit)]
+        return v if lit > 0 else -v
+
+    def _assign(self, lit: int, reason):
+        v = abs(lit)
+        self.value[v]  = 1 if lit > 0 else -1
+        self.level[v]  = len(self.limits)
+        self.reason[v] = reason
+        self.trail.append(lit)
+
+    def _watch(self, lit: int, clause):
+        self.watches.setdefault(lit, []).append(clause)
+
+    def add_clause(self, clause: Sequence[int]) -> bool:
+        """Add a clause at decision level 0."""
+        self._cancel(0)
+        if not self.ok:
+            return False
+        lits = []
+        for lit in dict.fromkeys(clause):
+            if -lit in lits or self._val(lit) == 1:
+                return True                            # tautology / satisfied
+            if self._val(lit) == 0:
+                lits.append(lit)
+        if not lits:
+            self.ok = False
+        elif len(lits) == 1:
+            self._assign(lits[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self._watch(lits[0], lits)
+            self._watch(lits[1], lits)
+        return self.ok
+
+    def _propagate(self) -> Optional[List[int]]:
+        while self.qhead < len(self.trail):
+            false_lit = -self.trail[self.qhead]
+            self.qhead += 1
+            ws = self.watches.get(false_lit, [])
+            keep = []
+            for i, c in enumerate(ws):
+                if c[0] == false_lit:
+                    c[0], c[1] = c[1], c[0]
+                if self._val(c[0]) == 1:
+                    keep.append(c)
+                    continue
+                for k in range(2, len(c)):
+                    if self._val(c[k]) != -1:
+                        c[1], c[k] = c[k], c[1]
+                        self._watch(c[1], c)
+                        break
+                else:
+                    keep.append(c)
+                    if self._val(c[0]) == -1:
+                        keep.extend(ws[i + 1:])
+                        self.watches[false_lit] = keep
+                        return c
+                    self._assign(c[0], c)
+            self.watches[false_lit] = keep
+        return None
+
+    def _bump(self, v: int):
+        self.act[v] += self.inc
+        if self.act[v] > 1e100:
+            self.act = [a * 1e-100 for a in self.act]
+            self.inc *= 1e-100
+            self.heap = [(-self.act[u], u) for u in range(1, self.n + 1)
+                         if not self.value[u]]
+            heapq.heapify(self.heap)
+        elif not self.value[v]:
+            heapq.heappush(self.heap, (-self.act[v], v))
+
+    def _analyze(self, conflict: List[int]):
+        seen, learnt = set(), [0]
+        here, counter, idx, p = len(self.limits), 0, len(self.trail) - 1, 0
+        clause = conflict
+        while True:
+            for q in (clause if p == 0 else clause[1:]):
+                v = abs(q)
+                if v not in seen and self.level[v] > 0:
+                    seen.add(v)
+                    self._bump(v)
+                    if self.level[v] == here:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            while abs(self.trail[idx]) not in seen:
+                idx -= 1
+            p = self.trail[idx]
+            idx -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self.reason[abs(p)]
+        learnt[0] = -p
+        back = 0
+        if len(learnt) > 1:
+            i = max(range(1, len(learnt)), key=lambda j: self.level[abs(learnt[j])])
+            learnt[1], learnt[i] = learnt[i], learnt[1]
+            back = self.level[abs(learnt[1])]
+        self.inc *= 1.05
+        return learnt, back
+
+    def _cancel(self, level: int):
+        if len(self.limits) <= level:
+            return
+        for lit in self.trail[self.limits[level]:]:
+            v = abs(lit)
+            self.phase[v] = self.value[v]
+            self.value[v] = 0
+            self.reason[v] = None
+            heapq.heappush(self.heap, (-self.act[v], v))
+        del self.trail[self.limits[level]:]
+        del self.limits[level:]
+        self.qhead = len(self.trail)
+
+    def _decide(self) -> int:
+        while self.heap:
+            _, v = heapq.heappop(self.heap)
+            if not self.value[v]:
+                return v
+        return 0
+
+    def solve(self) -> Optional[set]:
+        """Set of true variables of a model, or None when unsatisfiable."""
+        if not self.ok or self._propagate() is not None:
+            self.ok = False
+            return None
+        restarts, conflicts = 1, 0
+        budget = 100 * _luby(restarts)
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                if not self.limits:
+                    self.ok = False
+                    return None
+                conflicts += 1
+                learnt, back = self._analyze(conflict)
+                self._cancel(back)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], None)
+                else:
+                    self._watch(learnt[0], learnt)
+                    self._watch(learnt[1], learnt)
+                    self._assign(learnt[0], learnt)
+                continue
+            if conflicts >= budget:
+                restarts, conflicts = restarts + 1, 0
+                budget = 100 * _luby(restarts)
+                self._cancel(0)
+                continue
+            v = self._decide()
+            if not v:
+                model = {u for u in range(1, self.n + 1) if self.value[u] == 1}
+                self._cancel(0)
+                return model
+            self.limits.append(len(self.trail))
+            self._assign(v if self.phase[v] > 0 else -v, None)
+
+# ──────────────────────────  external solvers  ──────────────────
+EXTERNAL = ("kissat", "cadical", "cryptominisat5", "glucose")
+
+def find_external() -> Optional[str]:
+    return next((p for p in map(shutil.which, EXTERNAL) if p), None)
+
+def solve_external(cmd: str, dimacs: str) -> Optional[set]:
+    """Run a competition-format DIMACS solver; None when UNSAT."""
+    fd, path = tempfile.mkstemp(suffix=".cnf")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(dimacs)
+        res = subprocess.run([*cmd.split(), path], capture_output=True, text=True)
+    finally:
+        os.unlink(path)
+    status, model = None, set()
+    for ln in res.stdout.splitlines():
+        if ln.startswith("s "):
+            status = ln[2:].strip()
+        elif ln.startswith("v "):
+            model.update(int(t) for t in ln[2:].split() if int(t) > 0)
+    if status == "UNSATISFIABLE":
+        return None
+    if status != "SATISFIABLE":
+        raise RuntimeError(f"{cmd}: no verdict (exit {res.returncode})\n{res.stderr}")
+    return model
+
+# ──────────────────────────  enumeration  ───────────────────────
+def solutions(msa, msc, external: Optional[str] = None,
+              dimacs: Optional[Path] = None) -> Iterator[Table]:
+    """
+    Every perfect reduction, one model at a time, each followed by its
+    blocking clause.  An empty stream proves none exists.  `dimacs`
+    receives the base formula; `external` names a solver command.
+    """
+    enc = encode(msa, msc)
+    if dimacs:
+        Path(dimacs).write_text(to_dimacs(enc))
+    if external:
+        blocked: List[List[int]] = []
+        while (model := solve_external(external, to_dimacs(enc, blocked))) is not None:
+            tables = decode(enc, model)
+            yield tables
+            blocked.append(blocking_clause(enc, tables))
+        return
+    solver = Solver(enc.n_vars, enc.clauses)
+    while (model := solver.solve()) is not None:
+        tables = decode(enc, model)
+        yield tables
+        solver.add_clause(blocking_clause(enc, tables))
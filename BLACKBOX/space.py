@@ -0,0 +1,174 @@
+"""
+space.py  – shape of the MS-C → MS-A candidate space
+
+A candidate reduction is four small integer tables, in the same order
+ctoa.py feeds them to itertools.product:
+
+    fa : 6  entries in 0..5   (a_C  → MS-A Alice line)
+    fb : 9  entries in 0..5   (box  → MS-A Bob line)
+    ga : 8  entries in 0..3   (pattern id → index into its parity pool)
+    gb : 18 entries in 0..1   (g_B situation → Bob bit)
+
+Each table is a base-radix number (first entry most significant) and a
+quadruple is one mixed-radix integer over 6^6, 6^9, 4^8 and 2^18, so a
+candidate index maps straight to its tables and back.
+
+candidates_from() walks that order lazily: each dimension is decoded
+only when the one inside it wraps, and a candidate is a Candidate record
+holding the four tables, whose f_A / f_B / g_A / g_B methods read them
+directly.  Memory stays constant however far into the space a run goes.
+"""
+import itertools, math
+from typing import Callable, Iterator, List, Sequence, Tuple
+
+# ──────────────────────────  constants  ──────────────────────────
+EVEN_ROWS  = [(0,0,0),(0,1,1),(1,0,1),(1,1,0)]
+ODD_COLS   = [(0,0,1),(0,1,0),(1,0,0),(1,1,1)]
+PATTERNS   = EVEN_ROWS + ODD_COLS
+SITUATIONS = [(ln,pos) for ln in range(6) for pos in range(3)]   # 18
+PATTERN_ID = {p: i for i, p in enumerate(PATTERNS)}
+
+# (table length, radix) in product order
+SHAPE = (
+    (6, 6),     # f_A
+    (9, 6),     # f_B
+    (8, 4),     # g_A
+    (18, 2),    # g_B
+)
+RADICES = tuple(radix**length for length, radix in SHAPE)    # 6^6, 6^9, 4^8, 2^18
+TOTAL   = math.prod(RADICES)
+
+# ──────────────────────────  helpers  ────────────────────────────
+def box_coords(box: int) -> Tuple[int, int]:
+    return divmod(box, 3)
+
+def pattern_id(line) -> int:
+    return PATTERNS.index(tuple(line))
+
+def pattern_pool(p: int) -> List[Tuple[int, int, int]]:
+    return EVEN_ROWS if p < 4 else ODD_COLS
+
+def situation(box: int, line) -> int:
+    """Index into SITUATIONS of the g_B cell read for (box, line)."""
+    r, c     = box_coords(box)
+    line_idx = r if sum(line)%2==0 else 3+c
+    pos      = c if line_idx < 3 else r
+    return line_idx*3 + pos
+
+# ──────────────────────────  mixed-radix indexing  ──────────────
+def encode_table(table: Sequence[int], radix: int) -> int:
+    n = 0
+    for v in table:
+        n = n*radix + v
+    return n
+
+def decode_table(n: int, length: int, radix: int) -> Tuple[int, ...]:
+    digits = [0]*length
+    for i in range(length - 1, -1, -1):
+        n, digits[i] = divmod(n, radix)
+    return tuple(digits)
+
+def table_index(fa: Sequence[int], fb: Sequence[int],
+                ga: Sequence[int], gb: Sequence[int]) -> int:
+    """0-based position of (fa, fb, ga, gb) in itertools.product order."""
+    idx = 0
+    for table, (_, radix), size in zip((fa, fb, ga, gb), SHAPE, RADICES):
+        idx = idx*size + encode_table(table, radix)
+    return idx
+
+def split_index(index: int, shape=SHAPE) -> List[int]:
+    """Per-table indices of a candidate index over `shape` (a SHAPE prefix)."""
+    parts = []
+    for length, radix in reversed(shape):
+        index, part = divmod(index, radix**length)
+        parts.append(part)
+    if index:
+        raise ValueError("index outside the candidate space")
+    return parts[::-1]
+
+def decode_index(index: int, shape=SHAPE) -> Tuple[Tuple[int, ...], ...]:
+    """Inverse of table_index: the tables at a candidate index."""
+    return tuple(decode_table(n, length, radix)
+                 for n, (length, radix) in zip(split_index(index, shape), shape))
+
+def tables_from(length: int, radix: int, start: int = 0) -> Iterator[Tuple[int, ...]]:
+    """Tables of one dimension in product order, beginning at index `start`."""
+    if start == 0:
+        yield from itertools.product(range(radix), repeat=length)
+        return
+    digits = list(decode_table(start, length, radix))
+    for _ in range(radix**length - start):
+        yield tuple(digits)
+        i = length - 1
+        while i >= 0:
+            digits[i] += 1
+            if digits[i] < radix:
+                break
+            digits[i] = 0
+            i -= 1
+
+def product_from(index: int, shape=SHAPE) -> Iterator[Tuple[Tuple[int, ...], ...]]:
+    """
+    itertools.product over the tables of `shape`, seeking straight to
+    `index` instead of replaying everything before it.
+    """
+    starts = split_index(index, shape)
+    def level(d):
+        if d == len(shape):
+            yield ()
+            return
+        length, radix = shape[d]
+        for table in tables_from(length, radix, starts[d]):
+            for rest in level(d + 1):
+                yield (table,) + rest
+            if d + 1 < len(shape):
+                starts[d + 1] = 0
+    yield from level(0)
+
+# ──────────────────────────  candidates  ────────────────────────
+# g_B cell per (box, pattern id): the situation only depends on the line's parity
+SITUATION_OF = tuple(tuple(situation(box, p) for p in PATTERNS) for box in range(9))
+
+class Candidate:
+    """One quadruple as its integer tables; the methods are ctoa's f_A … g_B."""
+    __slots__ = ("fa", "fb", "ga", "gb")
+
+    def __init__(self, fa: Tuple[int, ...], fb: Tuple[int, ...],
+                 ga: Tuple[int, ...], gb: Tuple[int, ...]):
+        self.fa, self.fb, self.ga, self.gb = fa, fb, ga, gb
+
+    def f_A(self, a: int) -> int:
+        return self.fa[a]
+
+    def f_B(self, box: int) -> int:
+        return self.fb[box]
+
+    def g_A(self, a_c: int, line) -> List[int]:
+        p = PATTERN_ID[tuple(line)]
+        return list(pattern_pool(p)[self.ga[p]])
+
+    def g_B(self, box_c: int, line) -> int:
+        return self.gb[SITUATION_OF[box_c][PATTERN_ID[tuple(line)]]]
+
+    def closures(self) -> Tuple[Callable, ...]:
+        return self.f_A, self.f_B, self.g_A, self.g_B
+
+    def tables(self) -> Tuple[Tuple[int, ...], ...]:
+        return self.fa, self.fb, self.ga, self.gb
+
+def candidates_from(index: int = 0) -> Iterator[Candidate]:
+    """Candidates in itertools.product order, seeking straight to `index`."""
+    (fa_len, fa_r), (fb_len, fb_r), (ga_len, ga_r), (gb_len, gb_r) = SHAPE
+    i_fa, i_fb, i_ga, i_gb = split_index(index)
+    for fa in tables_from(fa_len, fa_r, i_fa):
+        for fb in tables_from(fb_len, fb_r, i_fb):
+            for ga in tables_from(ga_len, ga_r, i_ga):
+                for gb in tables_from(gb_len, gb_r, i_gb):
+                    yield Candidate(fa, fb, ga, gb)
+                i_gb = 0
+            i_ga = 0
+        i_fb = 0
+
+def to_closures(fa, fb, ga, gb) -> Tuple[Callable, ...]:
+    """Wrap integer tables as the (f_A, f_B, g_A, g_B) callables ctoa uses."""
+    return Candidate(tuple(fa), tuple(fb), tuple(ga), tuple(gb)).closures()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+symmetry.py  – automorphisms of the MS-C → MS-A reduction search
+
+Two kinds of symmetry leave the set of perfect (fa, fb, ga, gb) fixed:
+
+  * position symmetries of MS-C: a permutation σ of a_c and π of boxes
+    that maps legal pairs onto legal pairs, together with a relabelling
+    ψ_p of every g_A cell and a permutation φ + bit flip of the g_B
+    situations, such that every per-pair acceptance relation is carried
+    onto the relation of the image pair;
+  * value symmetries of MS-A: MS-A inputs whose outcome lines agree for
+    every partner input are interchangeable, so f_A / f_B values can be
+    relabelled freely inside such a class.
+
+Both are derived from the outcome tables (via backtrack.compile_pairs),
+so the group follows the games rather than a hand-written list.  The
+canonical representative of an orbit is its smallest member in
+itertools.product order.
+"""
+import argparse, itertools, json, math
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+from backtrack import compile_pairs, solve
+from gametable import load_game
+from space     import SHAPE, encode_table, table_index
+
+N_FA, N_FB, N_GA, N_GB = (n for n, _ in SHAPE)
+R_FA, R_FB, R_GA, R_GB = (r for _, r in SHAPE)
+
+class Symmetry(NamedTuple):
+    sigma: Tuple[int, ...]               # a_c  → a_c'
+    pi:    Tuple[int, ...]               # box  → box'
+    psi:   Tuple[Tuple[int, ...], ...]   # psi[p][choice] → choice'
+    phi:   Tuple[int, ...]               # situation → situation'
+    flip:  Tuple[int, ...]               # xor on the bit of each source situation
+
+class Group(NamedTuple):
+    positions: List[Symmetry]            # includes the identity
+    a_class:   Tuple[int, ...]           # MS-A Alice input → value class
+    b_class:   Tuple[int, ...]           # MS-A Bob input   → value class
+
+    @property
+    def order(self) -> int:
+        relabel = 1
+        for classes in (self.a_class, self.b_class):
+            for c in set(classes):
+                relabel *= math.factorial(classes.count(c))
+        return len(self.positions) * relabel
+
+# ──────────────────────────  group from the tables  ─────────────
+def value_classes(lines, n_a: int = R_FA, n_b: int = R_FB):
+    """Interchangeable MS-A Alice / Bob inputs (identical line sets)."""
+    def classes(sig):
+        seen: Dict[tuple, int] = {}
+        return tuple(seen.setdefault(s, len(seen)) for s in sig)
+    a_sig = [tuple(tuple(lines[(x, y)]) for y in range(n_b)) for x in range(n_a)]
+    b_sig = [tuple(tuple(lines[(x, y)]) for x in range(n_a)) for y in range(n_b)]
+    return classes(a_sig), classes(b_sig)
+
+def _psi_options(p, sigma, pi, pairs, rel):
+    """[(psi_p, {situation: (image, flip)})] consistent for pattern p."""
+    index = {k: i for i, k in enumerate(pairs)}
+    opts = []
+    for psi in itertools.permutations(range(R_GA)):
+        sit: Dict[int, Tuple[int, int]] = {}
+        ok = True
+        for i, (a_c, box) in enumerate(pairs):
+            s, src = rel[i][p]
+            t, dst = rel[index[(sigma[a_c], pi[box])]][p]
+            dst = set(dst)
+            for f in (0, 1):
+                if {(psi[ch], bit ^ f) for ch, bit in src} == dst:
+                    break
+            else:
+                ok = False
+                break
+            if not src:               # empty relation – flip is free here
+                continue
+            if sit.setdefault(s, (t, f)) != (t, f):
+                ok = False
+                break
+        if ok:
+            opts.append((psi, sit))
+    return opts
+
+def position_symmetries(pairs, rel) -> List[Symmetry]:
+    """Every (σ, π, ψ, φ, flip) that carries the acceptance relations onto themselves."""
+    legal = set(pairs)
+    lines_of = {b: frozenset(a for a, bb in pairs if bb == b) for b in range(N_FB)}
+    by_set = {v: b for b, v in lines_of.items()}
+    if len(by_set) != N_FB:
+        return []                     # boxes not told apart by their lines
+    out = []
+    for sigma in itertools.permutations(range(N_FA)):
+        pi = tuple(by_set.get(frozenset(sigma[a] for a in lines_of[b]), -1)
+                   for b in range(N_FB))
+        if -1 in pi or {(sigma[a], pi[b]) for a, b in pairs} != legal:
+            continue
+        per_p = [_psi_options(p, sigma, pi, pairs, rel) for p in range(N_GA)]
+        # combine per-pattern options whose situation maps agree
+        def combine(p, sit, chosen):
+            if p == N_GA:
+                yield tuple(chosen), dict(sit)
+                return
+            for psi, s_map in per_p[p]:
+                if all(sit.get(s, v) == v for s, v in s_map.items()):
+                    merged = {**sit, **s_map}
+                    yield from combine(p + 1, merged, chosen + [psi])
+        for psi, sit in combine(0, {}, []):
+            phi  = [sit[s][0] if s in sit else s for s in range(N_GB)]
+            flip = [sit[s][1] if s in sit else 0 for s in range(N_GB)]
+            if len(set(phi)) == N_GB:
+                out.append(Symmetry(sigma, pi, psi, tuple(phi), tuple(flip)))
+    return out
+
+def automorphisms(msa, msc) -> Group:
+    pairs, lines, rel = compile_pairs(msa, msc)
+    a_class, b_class = value_classes(lines)
+    return Group(position_symmetries(pairs, rel), a_class, b_class)
+
+# ──────────────────────────  action  ────────────────────────────
+def act(h: Symmetry, fa, fb, ga, gb):
+    """Image of a candidate under a position symmetry."""
+    fa2, fb2, gb2 = [0]*N_FA, [0]*N_FB, [0]*N_GB
+    for a in range(N_FA):
+        fa2[h.sigma[a]] = fa[a]
+    for b in range(N_FB):
+        fb2[h.pi[b]] = fb[b]
+    for s in range(N_GB):
+        gb2[h.phi[s]] = gb[s] ^ h.flip[s]
+    ga2 = tuple(h.psi[p][ga[p]] for p in range(N_GA))
+    return tuple(fa2), tuple(fb2), ga2, tuple(gb2)
+
+def relabel(values: Sequence[int], classes: Sequence[int]) -> Tuple[int, ...]:
+    """Smallest relabelling of `values` that only permutes inside classes."""
+    free = {c: [v for v in range(len(classes)) if classes[v] == c]
+            for c in set(classes)}
+    used: Dict[int, int] = {}
+    taken = {c: 0 for c in free}
+    out = []
+    for v in values:
+        if v not in used:
+            c = classes[v]
+            used[v] = free[c][taken[c]]
+            taken[c] += 1
+        out.append(used[v])
+    return tuple(out)
+
+def _prefix_key(group: Group, h: Symmetry, fa, fb):
+    fa2 = [0]*N_FA
+    fb2 = [0]*N_FB
+    for a in range(N_FA):
+        fa2[h.sigma[a]] = fa[a]
+    for b in range(N_FB):
+        fb2[h.pi[b]] = fb[b]
+    return relabel(fa2, group.a_class), relabel(fb2, group.b_class)
+
+def is_canonical_prefix(group: Group, fa, fb) -> bool:
+    key = (tuple(fa), tuple(fb))
+    return all(_prefix_key(group, h, fa, fb) >= key for h in group.positions)
+
+def stabilizer(group: Group, fa, fb) -> List[Symmetry]:
+    """Position symmetries that map the (canonical) prefix onto itself."""
+    key = (tuple(fa), tuple(fb))
+    return [h for h in group.positions if _prefix_key(group, h, fa, fb) == key]
+
+def is_canonical(group: Group, fa, fb, ga, gb, stab=None) -> bool:
+    """True when (fa, fb, ga, gb) is the smallest member of its orbit."""
+    if stab is None:
+        if not is_canonical_prefix(group, fa, fb):
+            return False
+        stab = stabilizer(group, fa, fb)
+    g = (tuple(ga), tuple(gb))
+    return all(act(h, fa, fb, ga, gb)[2:] >= g for h in stab)
+
+def canonical(group: Group, fa, fb, ga, gb):
+    """Smallest member of the orbit of a candidate."""
+    best = None
+    for h in group.positions:
+        fa2, fb2, ga2, gb2 = act(h, fa, fb, ga, gb)
+        img = (relabel(fa2, group.a_class), relabel(fb2, group.b_class), ga2, gb2)
+        if best is None or img < best:
+            best = img
+    return best
+
+# ──────────────────────────  enumeration  ───────────────────────
+def _normal_forms(length: int, classes: Sequence[int]) -> Iterator[Tuple[int, ...]]:
+    """Sequences equal to their own relabel(), in lexicographic order."""
+    members = {c: [v for v in range(len(classes)) if classes[v] == c]
+               for c in set(classes)}
+    taken = {c: 0 for c in members}
+    prefix: List[int] = []
+    def grow():
+        if len(prefix) == length:
+            yield tuple(prefix)
+            return
+        opts = set(prefix)
+        opts.update(ms[taken[c]] for c, ms in members.items() if taken[c] < len(ms))
+        for v in sorted(opts):
+            fresh = v not in prefix
+            prefix.append(v)
+            if fresh:
+                taken[classes[v]] += 1
+            yield from grow()
+            prefix.pop()
+            if fresh:
+                taken[classes[v]] -= 1
+    yield from grow()
+
+def canonical_prefixes(group: Group, start: int = 0) -> Iterator[Tuple[tuple, tuple]]:
+    """Canonical (fa, fb) in product order, from prefix index `start`."""
+    fb_forms = list(_normal_forms(N_FB, group.b_class))
+    for fa in _normal_forms(N_FA, group.a_class):
+        for fb in fb_forms:
+            if encode_table(fa, R_FA) * R_FB**N_FB + encode_table(fb, R_FB) < start:
+                continue
+            if is_canonical_prefix(group, fa, fb):
+                yield fa, fb
+
+def orbit(group: Group, fa, fb, ga, gb) -> Iterator[Tuple[tuple, ...]]:
+    """Every distinct member of the orbit of a candidate, lazily."""
+    seen = set()
+    for h in group.positions:
+        fa2, fb2, ga2, gb2 = act(h, fa, fb, ga, gb)
+        key = (relabel(fa2, group.a_class), relabel(fb2, group.b_class), ga2, gb2)
+        if key in seen:
+            continue
+        seen.add(key)
+        for fa3 in _relabellings(fa2, group.a_class):
+            for fb3 in _relabellings(fb2, group.b_class):
+                yield fa3, fb3, ga2, gb2
+
+def orbit_size(group: Group, fa, fb, ga, gb) -> int:
+    """Number of members orbit() would yield, without listing them."""
+    def count(values, classes):
+        n = 1
+        for c in set(classes):
+            size, used = classes.count(c), len({v for v in values if classes[v] == c})
+            n *= math.perm(size, used)
+        return n
+    seen = set()
+    for h in group.positions:
+        fa2, fb2, ga2, gb2 = act(h, fa, fb, ga, gb)
+        seen.add((relabel(fa2, group.a_class), relabel(fb2, group.b_class), ga2, gb2))
+    return sum(count(k[0], group.a_class) * count(k[1], group.b_class) for k in seen)
+
+def _relabellings(values: Sequence[int], classes: Sequence[int]) -> Iterator[Tuple[int, ...]]:
+    """All distinct images of `values` under in-class permutations."""
+    used = sorted(set(values))
+    choices = [[u for u in range(len(classes)) if classes[u] == classes[v]] for v in used]
+    for image in itertools.product(*choices):
+        if len(set(image)) == len(image):
+            m = dict(zip(used, image))
+            yield tuple(m[v] for v in values)
+
+def solve_canonical(msa, msc, group: Group = None) -> Iterator[Tuple[tuple, ...]]:
+    """
+    backtrack.solve restricted to canonical representatives: every perfect
+    reduction is the orbit() of exactly one candidate yielded here.
+    """
+    group = group or automorphisms(msa, msc)
+    def prefix(fa, fb):
+        if not is_canonical_prefix(group, fa, fb):
+            return None
+        stab = stabilizer(group, fa, fb)
+        return lambda ga, gb: is_canonical(group, fa, fb, ga, gb, stab)
+    yield from solve(msa, msc, prefix)
+
+# ──────────────────────────  main  ──────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="symmetry group of the MS-C → MS-A search")
+    ap.add_argument("--msa", type=Path, default="MSA/msa_blackbox_outputs.json")
+    ap.add_argument("--msc", type=Path, default="MSC/msc_blackbox_outputs.json")
+    ap.add_argument("--expand", type=Path,
+                    help="JSON file with fA/fB/gA/gB (e.g. best.json) to expand")
+    ap.add_argument("--limit", type=int, default=10, help="orbit members to print")
+    args = ap.parse_args()
+
+    group = automorphisms(load_game(args.msa), load_game(args.msc))
+    print(f"position symmetries : {len(group.positions)}")
+    print(f"value classes       : A={group.a_class}  B={group.b_class}")
+    print(f"group order         : {group.order:,}")
+
+    if args.expand:
+        hit = json.loads(args.expand.read_text())
+        cand = tuple(tuple(hit[k]) for k in ("fA", "fB", "gA", "gB"))
+        for member in itertools.islice(orbit(group, *cand), args.limit):
+            print(f"  {table_index(*member) + 1:,}  {member}")
+        print(f"orbit size          : {orbit_size(group, *cand):,}")
+
+if __name__ == "__main__":
+    main()
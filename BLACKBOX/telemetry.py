@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+telemetry.py  – JSONL progress metrics for long searches
+
+Every event is one flat JSON object on its own line:
+
+    {"ts": 1760700000.1, "run": "20261017-172900-4242", "engine": "brute",
+     "event": "progress", "done": 180794792, "rate": 61234.5, ...}
+
+so a run can be tailed live and any number of runs graphed together
+(group by "run", plot "rate" / "eta_s" against "ts").  Events:
+
+    start     engine and starting index
+    progress  done, pct, rate (window), rate_avg (run), eta_s, best,
+              gen_share / check_share (sampled split of loop time),
+              fail_depth (histogram of pairs passed before failing, in
+              the check order), checks_per_reject (brute)
+    hit       index of a perfect reduction
+    profile   top sampled stacks since the previous profile event
+    stop      final totals
+
+The hot loop only pays for a list increment per candidate and two
+perf_counter() calls every SAMPLE_EVERY candidates.
+"""
+import argparse, json, os, sys, threading, time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+METRICS_FILE = Path("metrics.jsonl")
+SAMPLE_MASK  = 63                    # time 1 in 64 candidates
+
+class Telemetry:
+    """Writer for one run's events plus the counters progress() reports."""
+
+    def __init__(self, engine: str, total: int, path: Path = METRICS_FILE,
+                 start: int = 0, depths: int = 0, profile_every: float = 0.0):
+        self.engine  = engine
+        self.total   = total
+        self.run     = time.strftime("%Y%m%d-%H%M%S-") + str(os.getpid())
+        self.f       = Path(path).open("a")
+        self.t0      = self.t_last = time.time()
+        self.start   = self.last = start
+        self.hist    = [0] * (depths + 1) if depths else None   # fail_depth counts
+        self.gen_s   = 0.0               # sampled time spent producing candidates
+        self.check_s = 0.0               # sampled time spent in the check
+        self.profiler = SamplingProfiler(profile_every) if profile_every else None
+        self.emit("start", start=start)
+
+    def emit(self, event: str, **fields):
+        rec = {"ts": round(time.time(), 3), "run": self.run, "engine": self.engine,
+               "event": event, **fields}
+        self.f.write(json.dumps(rec) + "\n")
+        self.f.flush()
+
+    def hit(self, index: int):
+        self.emit("hit", index=index)
+
+    def progress(self, done: int, **fields) -> dict:
+        """Emit a progress event and return it (for the log line)."""
+        now = time.time()
+        window = max(now - self.t_last, 1e-9)
+        rate = (done - self.last) / window
+        rate_avg = (done - self.start) / max(now - self.t0, 1e-9)
+        rec = {"done": done, "pct": 100 * done / self.total,
+               "rate": round(rate, 1), "rate_avg": round(rate_avg, 1),
+               "eta_s": round((self.total - done) / rate_avg) if rate_avg else None,
+               **fields}
+        sampled = self.gen_s + self.check_s
+        if sampled:
+            rec["gen_share"]   = round(self.gen_s / sampled, 4)
+            rec["check_share"] = round(self.check_s / sampled, 4)
+        if self.hist is not None:
+            rec["fail_depth"] = list(self.hist)
+        self.emit("progress", **rec)
+        self.t_last, self.last = now, done
+        if self.profiler:
+            self.emit("profile", top=self.profiler.drain())
+        return rec
+
+    def close(self, **fields):
+        if self.profiler:
+            self.profiler.stop()
+        self.emit("stop", elapsed_s=round(time.time() - self.t0, 3), **fields)
+        self.f.close()
+
+def describe(rec: dict) -> str:
+    """One log line for a progress record."""
+    eta = rec.get("eta_s")
+    eta = "∞" if eta is None else f"{eta / 86400 / 365.25:.3g} y" if eta > 86400*365 \
+          else f"{eta / 3600:.3g} h"
+    split = (f"  gen/check={rec['gen_share']:.0%}/{rec['check_share']:.0%}"
+             if "gen_share" in rec else "")
+    return (f"[{rec['done']:,}]  {rec['pct']:.3e}%  {rec['rate']:,.0f}/s  "
+            f"ETA {eta}{split}")
+
+# ──────────────────────────  sampling profiler  ─────────────────
+class SamplingProfiler:
+    """
+    Background thread that snapshots the main thread's stack every
+    `interval` seconds and counts (function, file:line) call paths.
+    """
+
+    def __init__(self, interval: float, depth: int = 4):
+        self.interval = interval
+        self.depth    = depth
+        self.counts: Counter = Counter()
+        self.lock     = threading.Lock()
+        self.target   = threading.main_thread().ident
+        self.halt     = threading.Event()
+        self.thread   = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while not self.halt.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            path: List[str] = []
+            while frame is not None and len(path) < self.depth:
+                code = frame.f_code
+                path.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+            if path:
+                with self.lock:
+                    self.counts[" ← ".join(path)] += 1
+
+    def drain(self, top: int = 10) -> List[Dict]:
+        with self.lock:
+            counts, self.counts = self.counts, Counter()
+        n = sum(counts.values()) or 1
+        return [{"stack": s, "share": round(c / n, 4)} for s, c in counts.most_common(top)]
+
+    def stop(self):
+        self.halt.set()
+
+# ──────────────────────────  summary  ───────────────────────────
+def summarize(path: Path) -> List[dict]:
+    """Last progress record of each run in a metrics file."""
+    runs: Dict[str, dict] = {}
+    for ln in Path(path).read_text().splitlines():
+        rec = json.loads(ln)
+        if rec["event"] in ("start", "progress", "stop"):
+            runs.setdefault(rec["run"], {}).update(rec)
+    return list(runs.values())
+
+def main():
+    ap = argparse.ArgumentParser(description="summarise metrics.jsonl runs")
+    ap.add_argument("metrics", type=Path, nargs="?", default=METRICS_FILE)
+    args = ap.parse_args()
+    for rec in summarize(args.metrics):
+        print(f"{rec['run']}  {rec['engine']:<9}  done={rec.get('done', rec.get('start', 0)):,}  "
+              f"rate_avg={rec.get('rate_avg', 0):,.0f}/s  eta_s={rec.get('eta_s')}")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
-import json
 from pathlib import Path
 
+from gametable import load_game, vec_code
+from verify    import verify
+
 
 MSA_PATH = Path("MSA/msa_blackbox_outputs.json")
 MSC_PATH = Path("MSC/msc_blackbox_outputs.json")  
@@ -13,11 +15,6 @@ PATTERNS = [
 def pattern_id_binary(bits3):
     return PATTERNS.index(tuple(bits3))
 
-def load_blackbox(path: Path):
-    raw = json.loads(path.read_text())
-    # keys are "a,b" -> convert to (int,int)
-    return {tuple(map(int, k.split(","))): v for k, v in raw.items()}
-
 def box_coords(b):  # (row, col) from 0..8
     return divmod(b, 3)
 
@@ -67,67 +64,78 @@ def gB_lookup(box, p):
     raise KeyError(f"gB has no entry for (box={box}, p={p})")
 
 
+def strategy_arrays(msa):
+    """fA/fB/gA/gB above as verify() arrays (one candidate)."""
+    n_out = 1 << (msa.alice_bits + msa.bob_bits)
+    p_of  = [o >> msa.bob_bits for o in range(n_out)]      # binary pattern id
+    fa = [[fA[a] for a in range(6)]]
+    fb = [[fB[box] for box in range(9)]]
+    ga = [[[vec_code(gA_lookup(a, p)) for p in p_of] for a in range(6)]]
+    gb = [[[gB_lookup(box, p) for p in p_of] for box in range(9)]]
+    return fa, fb, ga, gb
+
+
+def pair_failures(msa, msc, a_c, box, verbose=True, stop_on_first_fail=False):
+    """Every MS-A outcome of a lost pair that maps outside the allowed MS-C answers."""
+    a_A = fA[a_c]
+    b_A = fB[box]
+    outs_a = msa.get((a_A, b_A), [])
+    if not outs_a:
+        if verbose:
+            print(f"✗ (a_c={a_c}, box={box}) → (a_A={a_A}, b_A={b_A}) "
+                  f"MS-A returned no outcomes")
+        return [{"pair": (a_c, box), "reason": "MS-A input illegal",
+                 "a_A": a_A, "b_A": b_A}]
+
+    allowed = msc.mask(a_c, box)
+    failures = []
+    for out in outs_a:
+        raw_line = out["alice_vec"]                 # 3-bit list from MS-A
+        p = pattern_id_binary(raw_line)             # pattern id 0..7 (binary order)
+        alice_after = gA_lookup(a_c, p)             # 3-bit line Alice will output
+        bob_after   = gB_lookup(box, p)             # Bob's bit
+        if allowed >> msc.code(alice_after, bob_after) & 1:
+            continue
+        failures.append({
+            "pair": (a_c, box),
+            "reason": "mapped answer not allowed",
+            "raw_line": raw_line,
+            "pattern_id": p,
+            "alice_after": alice_after,
+            "bob_after": bob_after,
+            "one_allowed_example": next(iter({(tuple(o["alice_vec"]), o["bob_bit"])
+                                              for o in msc[(a_c, box)]})) if allowed else None
+        })
+        if verbose:
+            r, c = box_coords(box)
+            print(f"✗ (a_c={a_c}, box={box} @ r{r}c{c}) "
+                  f"MS-A line {raw_line} (p={p}) → "
+                  f"Alice {alice_after}, Bob {bob_after}  ∉ allowed")
+        if stop_on_first_fail: break
+    return failures
+
+
 def evaluate_strategy(msa, msc, verbose=True, stop_on_first_fail=False):
-    # collect the 18 legal MS-C pairs (box must lie on Alice's line)
-    legal_pairs = [(a_c, box) for (a_c, box), outs in msc.items() if outs]
-    legal_pairs.sort()
+    # verify() decides every pair at once; only lost pairs are walked outcome by outcome
+    result = verify(msc, msa, *strategy_arrays(msa))
+    # the 18 legal MS-C pairs (box must lie on Alice's line)
+    legal_pairs = result.pairs
     if verbose:
         print(f"Found {len(legal_pairs)} legal MS-C question pairs.")
 
     wins = 0
     failures = []
 
-    for a_c, box in legal_pairs:
-        a_A = fA[a_c]
-        b_A = fB[box]
-        outs_a = msa.get((a_A, b_A), [])
-        if not outs_a:
-            failures.append({
-                "pair": (a_c, box),
-                "reason": "MS-A input illegal",
-                "a_A": a_A, "b_A": b_A
-            })
-            if verbose:
-                print(f"✗ (a_c={a_c}, box={box}) → (a_A={a_A}, b_A={b_A}) "
-                      f"MS-A returned no outcomes")
-            if stop_on_first_fail: break
-            continue
-
-        allowed = {(tuple(o["alice_vec"]), o["bob_bit"]) for o in msc[(a_c, box)]}
-
-        ok_all = True
-        # Every MS-A outcome must map into an allowed MS-C answer
-        for out in outs_a:
-            raw_line = out["alice_vec"]                 # 3-bit list from MS-A
-            p = pattern_id_binary(raw_line)             # pattern id 0..7 (binary order)
-            alice_after = gA_lookup(a_c, p)             # 3-bit line Alice will output
-            bob_after   = gB_lookup(box, p)             # Bob's bit
-            if (tuple(alice_after), bob_after) not in allowed:
-                ok_all = False
-                failures.append({
-                    "pair": (a_c, box),
-                    "reason": "mapped answer not allowed",
-                    "raw_line": raw_line,
-                    "pattern_id": p,
-                    "alice_after": alice_after,
-                    "bob_after": bob_after,
-                    "one_allowed_example": next(iter(allowed)) if allowed else None
-                })
-                if verbose:
-                    r, c = box_coords(box)
-                    print(f"✗ (a_c={a_c}, box={box} @ r{r}c{c}) "
-                          f"MS-A line {raw_line} (p={p}) → "
-                          f"Alice {alice_after}, Bob {bob_after}  ∉ allowed")
-                if stop_on_first_fail: break
-
-        if ok_all:
+    for (a_c, box), ok in zip(legal_pairs, result.pair_ok[0]):
+        if ok:
             wins += 1
             if verbose:
                 r, c = box_coords(box)
                 print(f"✓ (a_c={a_c}, box={box} @ r{r}c{c}) "
-                      f"passes all {len(outs_a)} MS-A outcomes")
-
-        if stop_on_first_fail and not ok_all:
+                      f"passes all {len(msa[(fA[a_c], fB[box])])} MS-A outcomes")
+            continue
+        failures += pair_failures(msa, msc, a_c, box, verbose, stop_on_first_fail)
+        if stop_on_first_fail:
             break
 
     rate = wins / len(legal_pairs) if legal_pairs else 0.0
@@ -145,8 +153,8 @@ def evaluate_strategy(msa, msc, verbose=True, stop_on_first_fail=False):
     return rate, failures
 
 
-msa = load_blackbox(MSA_PATH)
-msc = load_blackbox(MSC_PATH)
+msa = load_game(MSA_PATH)
+msc = load_game(MSC_PATH)
 
 rate, fails = evaluate_strategy(msa, msc, verbose=True)
 
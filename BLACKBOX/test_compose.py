@@ -0,0 +1,72 @@
+"""compose.py: chaining two stored reductions end to end."""
+import random
+from pathlib import Path
+
+from bench     import plant, random_masks, save_game
+from compose   import Graph
+from gametable import load_game
+from verdicts  import VerdictCache
+from verify    import verify_one
+
+BITS = 2                                        # every game: 2-bit Alice and Bob codes
+N_OUT = 1 << 2 * BITS
+
+def _local(rng, n_in, n_target_in, n_out_codes, read):
+    """Random verify()-form f and g tables; g reads read(o) of the T outcome o."""
+    f = [rng.randrange(n_target_in) for _ in range(n_in)]
+    g = [[0] * N_OUT for _ in range(n_in)]
+    for i in range(n_in):
+        per = [rng.randrange(n_out_codes) for _ in range(1 << BITS)]
+        g[i] = [per[read(o)] for o in range(N_OUT)]
+    return f, g
+
+def _tables(rng, n_a, n_b, n_ta, n_tb):
+    fa, ga = _local(rng, n_a, n_ta, 1 << BITS, lambda o: o >> BITS)
+    fb, gb = _local(rng, n_b, n_tb, 1 << BITS, lambda o: o & (1 << BITS) - 1)
+    return fa, fb, ga, gb
+
+def _chain(tmp_path):
+    """S → M → T with a planted perfect reduction on each hop."""
+    rng = random.Random(3)
+    t = save_game(tmp_path / "t.gtb", random_masks(rng, 3, 3, N_OUT, 0.3), 3, 3, BITS, BITS, True)
+    r2 = _tables(rng, 4, 4, 3, 3)
+    m = save_game(tmp_path / "m.gtb", plant(rng, t, *r2, 4, 4, BITS, BITS, 0.1, 1.0),
+                  4, 4, BITS, BITS, True)
+    r1 = _tables(rng, 5, 5, 4, 4)
+    save_game(tmp_path / "s.gtb", plant(rng, m, *r1, 5, 5, BITS, BITS, 0.1, 0.8),
+              5, 5, BITS, BITS, True)
+    paths = [str(tmp_path / f"{n}.gtb") for n in "smt"]
+    cache = VerdictCache(tmp_path / "v.sqlite")
+    cache.add(paths[0], paths[1], *r1, label="s→m")
+    cache.add(paths[1], paths[2], *r2, label="m→t")
+    cache.commit()
+    return paths, cache, r2
+
+def test_two_hops_compose_to_a_stored_perfect_reduction(tmp_path):
+    (s, m, t), cache, _ = _chain(tmp_path)
+    graph = Graph(cache)
+    assert graph.edges() == []                  # nothing checked yet, nothing trusted
+    graph.refresh()
+    assert len(graph.edges()) == 2
+    chain, tables, res = graph.reduce(s, t)
+    assert [(e.source, e.target) for e in chain] == [(s, m), (m, t)]
+    assert res.wins[0] == len(res.pairs) > 0
+
+    graph = Graph(cache)
+    direct = graph.path(s, t)
+    assert len(direct) == 1 and direct[0].label == "composed via m"
+    again = verify_one(load_game(Path(s)), load_game(Path(t)), *graph.tables(direct[0].id))
+    assert again.wins[0] == len(again.pairs)
+
+def test_reduce_drops_an_edge_that_went_stale(tmp_path):
+    (s, m, t), cache, (fa, fb, ga, gb) = _chain(tmp_path)
+    graph = Graph(cache)
+    graph.refresh()
+    mid, tgt = load_game(Path(m)), load_game(Path(t))
+    masks = {(a, b): mid.mask(a, b) for a, b in mid.pairs()}
+    want = tgt.mask(fa[0], fb[0])
+    image = {ga[0][o] << BITS | gb[0][o] for o in range(N_OUT) if want >> o & 1}
+    masks[(0, 0)] = 1 << min(set(range(N_OUT)) - image)     # m → t now loses (0, 0)
+    save_game(Path(m), masks, 4, 4, BITS, BITS, True)
+    assert graph.reduce(s, t) is None
+    assert all(e.target != t for e in graph.edges())
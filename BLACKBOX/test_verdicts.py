@@ -0,0 +1,44 @@
+"""verdicts.py: cached verdicts stay tied to the game they were computed on."""
+import gc, random
+
+import numpy as np
+
+from bench     import random_masks, save_game
+from gametable import load_table
+from verdicts  import VerdictCache, pair_hashes
+from verify    import verify_one
+
+def _games(tmp_path):
+    rng = random.Random(0)
+    paths = []
+    for name, n_a, n_b in (("s", 3, 4), ("t", 6, 6)):
+        save_game(tmp_path / f"{name}.gtb", random_masks(rng, n_a, n_b, 16, 0.5),
+                  n_a, n_b, 2, 2, True)
+        paths.append(tmp_path / f"{name}.gtb")
+    return paths
+
+def test_hashes_follow_content_not_object_identity(tmp_path):
+    s_path, t_path = _games(tmp_path)
+    cache = VerdictCache(tmp_path / "v.sqlite")
+    for _ in range(5):                          # freed tables let CPython reuse ids
+        for path in (t_path, s_path):
+            game = load_table(path)
+            assert cache._hashes(game) == pair_hashes(game)
+            del game
+            gc.collect()
+
+def test_check_after_loading_games_one_after_the_other(tmp_path):
+    s_path, t_path = _games(tmp_path)
+    rng = np.random.default_rng(1)
+    fa, fb = rng.integers(0, 6, 3), rng.integers(0, 6, 4)
+    ga, gb = rng.integers(0, 4, (3, 16)), rng.integers(0, 4, (4, 16))
+    cache = VerdictCache(tmp_path / "v.sqlite")
+    rid = cache.add(str(s_path), str(t_path), fa, fb, ga, gb)
+    for _ in range(3):
+        load_table(t_path)                      # a freed table ahead of each pair
+        gc.collect()
+        s, t = load_table(s_path), load_table(t_path)
+        v = cache.check(rid, s, t)
+        t_wins = int(verify_one(s, t, fa, fb, ga, gb).wins[0])
+        assert v.wins == t_wins and v.pairs == len(s.pairs())
+    assert [v.wins for v in cache.refresh()] == [t_wins]
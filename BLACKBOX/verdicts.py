@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+verdicts.py  – content-addressed verdict cache with incremental re-checks
+
+Regenerating a blackbox JSON file with a small change to code.py makes
+every stored hit and leaderboard entry stale, but a reduction's verdict
+on one source pair (a, b) only depends on
+
+    S's outcomes of (a, b)      T's outcomes of (fa[a], fb[b])
+    ga[a]                       gb[b]
+
+so VERDICT_DB (SQLite) stores one row per (reduction, source pair):
+
+    reductions  id, source, target, label, tables, wins, pairs
+    verdicts    id, a, b, src_hash, tgt_hash, won
+
+`id` hashes the reduction's verify()-form tables (one candidate); the
+pair hashes cover the pair's compiled outcome mask and the game's code
+widths, i.e. exactly its outcome list.  check() re-runs pair_failure()
+only for pairs whose hashes no longer match, so after an edit that
+touches a few input pairs, refresh() re-checks those and reuses every
+other verdict.  Pairs that became legal are checked; pairs that became
+illegal are dropped.
+
+    python verdicts.py add-journal            # perfect hits in results.jsonl
+    python verdicts.py add-board              # leaderboard.json entries
+    python verdicts.py add SRC TGT hits.jsonl # reduction.py --out lines
+    python verdicts.py refresh                # re-check after a game edit
+"""
+import argparse, hashlib, json, sqlite3, time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+
+from gametable import HEADER, GameTable, load_game
+from journal   import JOURNAL_FILE, records
+from verify    import from_space, local_rows, pair_failure
+
+VERDICT_DB = Path("verdicts.sqlite")
+MSA_PATH   = "MSA/msa_blackbox_outputs.json"
+MSC_PATH   = "MSC/msc_blackbox_outputs.json"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reductions (
+    id TEXT PRIMARY KEY, source TEXT, target TEXT, label TEXT,
+    tables TEXT, wins INTEGER, pairs INTEGER);
+CREATE TABLE IF NOT EXISTS verdicts (
+    id TEXT, a INTEGER, b INTEGER, src_hash BLOB, tgt_hash BLOB, won INTEGER,
+    PRIMARY KEY (id, a, b));
+"""
+
+class Verdict(NamedTuple):
+    id:        str
+    label:     str
+    wins:      int
+    pairs:     int
+    was:       int              # wins before this check, -1 if new
+    reused:    int              # pair verdicts taken from the cache
+    rechecked: int              # pair verdicts computed now
+
+# ──────────────────────────  content hashes  ────────────────────
+def pair_hashes(game: GameTable) -> Dict[Tuple[int, int], bytes]:
+    """(a, b) → hash of that pair's outcome mask under the game's code widths."""
+    widths = bytes((game.alice_bits, game.bob_bits, game.bob_vec))
+    out = {}
+    for a, b in game:
+        at = HEADER.size + (a * game.n_b + b) * game.stride
+        out[(a, b)] = hashlib.blake2b(widths + game.buf[at:at + game.stride],
+                                      digest_size=8).digest()
+    return out
+
+def _plain(t):
+    if isinstance(t, np.ndarray):
+        return t.tolist()
+    if isinstance(t, (list, tuple)):
+        return [_plain(v) for v in t]
+    return int(t)
+
+def reduction_id(tables) -> str:
+    return hashlib.sha1(json.dumps(tables, separators=(",", ":")).encode()).hexdigest()[:16]
+
+# ──────────────────────────  cache  ─────────────────────────────
+class VerdictCache:
+    def __init__(self, path: Path = VERDICT_DB):
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(SCHEMA)
+        self.hashes: Dict[bytes, Dict[Tuple[int, int], bytes]] = {}
+
+    def _hashes(self, game: GameTable):
+        """pair_hashes(game), memoised by the whole table's content."""
+        key = hashlib.sha1(game.buf).digest()
+        h = self.hashes.get(key)
+        if h is None:
+            h = self.hashes[key] = pair_hashes(game)
+        return h
+
+    def add(self, source: str, target: str, fa, fb, ga, gb, label: str = "") -> str:
+        """Store one reduction (verify()-form tables without the K axis)."""
+        tables = [_plain(t) for t in (fa, fb, ga, gb)]
+        rid = reduction_id(tables)
+        self.db.execute("INSERT OR IGNORE INTO reductions VALUES (?,?,?,?,?,-1,0)",
+                        (rid, source, target, label, json.dumps(tables)))
+        return rid
+
+    def check(self, rid: str, source: GameTable, target: GameTable) -> Verdict:
+        """Verdict of a stored reduction, re-checking only stale pairs."""
+        label, tables, was = self.db.execute(
+            "SELECT label, tables, wins FROM reductions WHERE id=?", (rid,)).fetchone()
+        row = local_rows(*json.loads(tables))
+        hs, ht = self._hashes(source), self._hashes(target)
+        cached = {(a, b): (sh, th, won) for a, b, sh, th, won in self.db.execute(
+            "SELECT a, b, src_hash, tgt_hash, won FROM verdicts WHERE id=?", (rid,))}
+        pairs = source.pairs()
+        wins = reused = 0
+        fresh = []
+        for a, b in pairs:
+            x, y, g_a, g_b = row(a, b)
+            if (x, y) not in ht:
+                raise ValueError(f"{rid}: ({a}, {b}) maps to T pair {(x, y)} "
+                                 f"outside the {target.n_a}×{target.n_b} target")
+            key = (hs[(a, b)], ht[(x, y)])
+            hit = cached.pop((a, b), None)
+            if hit is not None and hit[:2] == key:
+                won, reused = hit[2], reused + 1
+            else:
+                won = int(pair_failure(source, target, a, b, x, y, g_a, g_b) is None)
+                fresh.append((rid, a, b) + key + (won,))
+            wins += won
+        self.db.executemany("INSERT OR REPLACE INTO verdicts VALUES (?,?,?,?,?,?)", fresh)
+        self.db.executemany("DELETE FROM verdicts WHERE id=? AND a=? AND b=?",
+                            [(rid, a, b) for a, b in cached])        # no longer legal
+        self.db.execute("UPDATE reductions SET wins=?, pairs=? WHERE id=?",
+                        (wins, len(pairs), rid))
+        return Verdict(rid, label, wins, len(pairs), was, reused, len(fresh))
+
+    def refresh(self) -> Iterable[Verdict]:
+        """Check every stored reduction against the games as they are now."""
+        games: Dict[str, GameTable] = {}
+        todo = self.db.execute("SELECT id, source, target FROM reductions "
+                               "ORDER BY source, target").fetchall()
+        for rid, src, tgt in todo:
+            for p in (src, tgt):
+                if p not in games:
+                    games[p] = load_game(Path(p))
+            yield self.check(rid, games[src], games[tgt])
+        self.db.commit()
+
+    def commit(self):
+        self.db.commit()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+# ──────────────────────────  importers  ─────────────────────────
+def _space_tables(d: dict):
+    """ctoa.py space tables (fA, fB, gA, gB) → verify()-form, one candidate."""
+    return [t[0] for t in from_space(d["fA"], d["fB"], d["gA"], d["gB"])]
+
+def from_journal(cache: VerdictCache, path: Path = JOURNAL_FILE) -> List[str]:
+    return [cache.add(MSC_PATH, MSA_PATH, *_space_tables(r),
+                      label=f"{r.get('engine', '')} hit #{r['index']}")
+            for r in records(path) if r["event"] == "hit" and "fA" in r]
+
+def from_board(cache: VerdictCache, path: Path) -> List[str]:
+    return [cache.add(MSC_PATH, MSA_PATH, *_space_tables(e),
+                      label=f"leaderboard #{e['index']}")
+            for e in json.loads(path.read_text())["entries"]]
+
+def from_reductions(cache: VerdictCache, source: str, target: str, path: Path) -> List[str]:
+    """reduction.py --out lines (local ga[a][α] / gb[b][β] form)."""
+    t = load_game(Path(target))
+    o = np.arange(1 << (t.alice_bits + t.bob_bits))
+    ids = []
+    for n, line in enumerate(path.read_text().splitlines()):
+        if line.strip():
+            d = json.loads(line)
+            ga = np.asarray(d["ga"])[:, o >> t.bob_bits]
+            gb = np.asarray(d["gb"])[:, o & (1 << t.bob_bits) - 1]
+            ids.append(cache.add(source, target, d["fa"], d["fb"], ga, gb,
+                                 label=f"{path.name}:{n + 1}"))
+    return ids
+
+# ──────────────────────────  main  ──────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="verdict cache for stored reductions")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("add-journal", help="perfect hits in the results journal")
+    p.add_argument("path", type=Path, nargs="?", default=JOURNAL_FILE)
+    p = sub.add_parser("add-board", help="bnb.py leaderboard entries")
+    p.add_argument("path", type=Path, nargs="?", default=Path("leaderboard.json"))
+    p = sub.add_parser("add", help="reduction.py --out lines")
+    p.add_argument("source")
+    p.add_argument("target")
+    p.add_argument("path", type=Path)
+    sub.add_parser("refresh", help="re-check stored reductions against the games")
+    ap.add_argument("--db", type=Path, default=VERDICT_DB)
+    args = ap.parse_args()
+
+    cache = VerdictCache(args.db)
+    if args.cmd == "add-journal":
+        ids = from_journal(cache, args.path)
+    elif args.cmd == "add-board":
+        ids = from_board(cache, args.path)
+    elif args.cmd == "add":
+        ids = from_reductions(cache, args.source, args.target, args.path)
+    if args.cmd != "refresh":
+        cache.close()
+        print(f"stored {len(ids):,} reduction(s) ({len(set(ids)):,} distinct)")
+        return
+
+    t0, n, reused, rechecked, flips = time.perf_counter(), 0, 0, 0, 0
+    for v in cache.refresh():
+        n, reused, rechecked = n + 1, reused + v.reused, rechecked + v.rechecked
+        if v.was >= 0 and v.was != v.wins:
+            flips += 1
+            print(f"{v.id}  {v.label:<28} {v.was}/{v.pairs} → {v.wins}/{v.pairs}")
+    cache.close()
+    print(f"{n:,} reduction(s): {reused:,} pair verdicts reused, {rechecked:,} "
+          f"re-checked, {flips:,} changed  ({time.perf_counter() - t0:.2f} s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+verify.py  – batch verification of reductions between two games
+
+A reduction from a source game S to a target game T (MS-C → MS-A in
+ctoa.py) is four integer tables per candidate, stacked along axis 0:
+
+    fa[k, a]        S Alice input → T Alice input
+    fb[k, b]        S Bob input   → T Bob input  (or fb[k, a, b] when the
+                                                  map depends on the pair)
+    ga[k, a, o]     S Alice output code for T outcome o
+    gb[k, b, o]     S Bob output code for T outcome o  (or gb[k, a, b, o])
+
+T outcomes and S outputs use gametable codes (o = alice_code << bob_bits
+| bob_code).  A legal S pair is won when every T outcome of its mapped
+pair lands inside S's allowed set; a T pair with no outcomes loses.
+Each S pair is one NumPy pass over all K candidates and all T outcomes.
+verify_one() gives the same Result for a single candidate with plain
+integer loops, which is the faster path when K is 1.
+"""
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from gametable import GameTable, code_vec, vec_code
+from space     import PATTERNS, SHAPE, pattern_pool, situation
+
+class Result(NamedTuple):
+    source:       GameTable
+    target:       GameTable
+    pairs:        List[Tuple[int, int]]   # legal S pairs, column order of pair_ok
+    pair_ok:      np.ndarray              # (K, P) bool
+    wins:         np.ndarray              # (K,)   pairs won
+    fail_pair:    np.ndarray              # (K,)   first lost pair (index), -1 if perfect
+    fail_target:  np.ndarray              # (K, 2) T input pair of that loss
+    fail_outcome: np.ndarray              # (K,)   T outcome code, -1 if T pair is empty
+    fail_alice:   np.ndarray              # (K,)   S Alice output code it mapped to
+    fail_bob:     np.ndarray              # (K,)   S Bob output code it mapped to
+
+    @property
+    def rate(self) -> np.ndarray:
+        return self.wins / len(self.pairs) if self.pairs else np.zeros(len(self.wins))
+
+    def failure(self, k: int) -> Optional[dict]:
+        """First failure of candidate k, decoded; None when it is perfect."""
+        i = int(self.fail_pair[k])
+        if i < 0:
+            return None
+        s, t = self.source, self.target
+        out = {"pair": self.pairs[i], "target": tuple(int(v) for v in self.fail_target[k])}
+        o = int(self.fail_outcome[k])
+        if o < 0:
+            out["reason"] = "target input illegal"
+            return out
+        alice, bob = divmod(o, 1 << t.bob_bits)
+        out.update({
+            "reason":      "mapped answer not allowed",
+            "alice_vec":   code_vec(alice, t.alice_bits),
+            "bob":         code_vec(bob, t.bob_bits) if t.bob_vec else bob,
+            "alice_after": code_vec(int(self.fail_alice[k]), s.alice_bits),
+            "bob_after":   (code_vec(int(self.fail_bob[k]), s.bob_bits) if s.bob_vec
+                            else int(self.fail_bob[k])),
+        })
+        return out
+
+# ──────────────────────────  per-pair indexes  ──────────────────
+def outcome_index(game: GameTable) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (codes, valid), both (n_a, n_b, J): the outcome codes of every pair,
+    padded to the longest pair; valid marks the real entries.
+    """
+    lists = [[[o for o in range(game.mask(a, b).bit_length()) if game.mask(a, b) >> o & 1]
+              for b in range(game.n_b)] for a in range(game.n_a)]
+    width = max(1, max(len(l) for row in lists for l in row))
+    codes = np.zeros((game.n_a, game.n_b, width), dtype=np.intp)
+    valid = np.zeros((game.n_a, game.n_b, width), dtype=bool)
+    for a, row in enumerate(lists):
+        for b, l in enumerate(row):
+            codes[a, b, :len(l)] = l
+            valid[a, b, :len(l)] = True
+    return codes, valid
+
+def allowed_index(game: GameTable, a: int, b: int) -> np.ndarray:
+    """Boolean lookup over the outcome codes of one pair."""
+    size = 1 << (game.alice_bits + game.bob_bits)
+    m = game.mask(a, b)
+    return np.array([m >> o & 1 for o in range(size)], dtype=bool)
+
+# ──────────────────────────  verify  ────────────────────────────
+def verify(source: GameTable, target: GameTable, fa, fb, ga, gb,
+           index: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Result:
+    """
+    Verify K stacked candidate reductions from `source` to `target`.
+    `index` is outcome_index(target) when the caller already holds it.
+    """
+    fa, fb, ga, gb = (np.asarray(t, dtype=np.intp) for t in (fa, fb, ga, gb))
+    n_o = 1 << (target.alice_bits + target.bob_bits)
+    if ga.shape[-1] != n_o or gb.shape[-1] != n_o:
+        raise ValueError(f"g tables must index all {n_o} target outcome codes")
+    k_all = len(fa)
+    pairs = source.pairs()
+    codes, valid = index if index is not None else outcome_index(target)
+
+    pair_ok      = np.zeros((k_all, len(pairs)), dtype=bool)
+    fail_pair    = np.full(k_all, -1, dtype=np.intp)
+    fail_target  = np.full((k_all, 2), -1, dtype=np.intp)
+    fail_outcome = np.full(k_all, -1, dtype=np.intp)
+    fail_alice   = np.full(k_all, -1, dtype=np.intp)
+    fail_bob     = np.full(k_all, -1, dtype=np.intp)
+
+    for i, (a, b) in enumerate(pairs):
+        x  = fa[:, a]
+        y  = fb[:, b] if fb.ndim == 2 else fb[:, a, b]
+        o  = codes[x, y]                                        # (K, J)
+        v  = valid[x, y]
+        sa = np.take_along_axis(ga[:, a], o, 1)
+        sb = np.take_along_axis(gb[:, b] if gb.ndim == 3 else gb[:, a, b], o, 1)
+        ok = allowed_index(source, a, b)[sa << source.bob_bits | sb] | ~v
+        won = ok.all(1) & v.any(1)
+        pair_ok[:, i] = won
+
+        new = ~won & (fail_pair < 0)
+        if new.any():
+            j = np.argmin(ok[new], 1)                           # first bad outcome
+            rows = np.flatnonzero(new)
+            empty = ~v[new].any(1)
+            fail_pair[new]    = i
+            fail_target[new]  = np.stack([x[new], y[new]], 1)
+            fail_outcome[new] = np.where(empty, -1, o[rows, j])
+            fail_alice[new]   = np.where(empty, -1, sa[rows, j])
+            fail_bob[new]     = np.where(empty, -1, sb[rows, j])
+
+    return Result(source, target, pairs, pair_ok, pair_ok.sum(1),
+                  fail_pair, fail_target, fail_outcome, fail_alice, fail_bob)
+
+def pair_failure(source: GameTable, target: GameTable, a: int, b: int, x: int, y: int,
+                 g_a: List[int], g_b: List[int]) -> Optional[Tuple[int, int, int]]:
+    """
+    None when S pair (a, b) mapped to T pair (x, y) is won, else its
+    first bad (T outcome, S Alice code, S Bob code); (-1, -1, -1) when
+    the T pair has no outcomes.
+    """
+    t, allowed, shift = target.mask(x, y), source.mask(a, b), source.bob_bits
+    if not t:
+        return -1, -1, -1
+    while t:
+        o = (t & -t).bit_length() - 1
+        t &= t - 1
+        if not allowed >> (g_a[o] << shift | g_b[o]) & 1:
+            return o, g_a[o], g_b[o]
+    return None
+
+def local_rows(fa, fb, ga, gb):
+    """
+    (a, b) → (x, y, g_a row, g_b row) over one candidate's tables, in
+    either fb / gb form, as plain ints and lists.
+    """
+    fa, fb, ga, gb = (t.tolist() if isinstance(t, np.ndarray) else t for t in (fa, fb, ga, gb))
+    per_fb, per_gb = isinstance(fb[0], list), isinstance(gb[0][0], list)
+    return lambda a, b: (fa[a], fb[a][b] if per_fb else fb[b],
+                         ga[a], gb[a][b] if per_gb else gb[b])
+
+def verify_one(source: GameTable, target: GameTable, fa, fb, ga, gb) -> Result:
+    """verify() for one candidate given without the K axis."""
+    row = local_rows(fa, fb, ga, gb)
+    pairs = source.pairs()
+    pair_ok = [True] * len(pairs)
+    fail = (-1, (-1, -1), -1, -1, -1)
+    for i, (a, b) in enumerate(pairs):
+        x, y, g_a, g_b = row(a, b)
+        bad = pair_failure(source, target, a, b, x, y, g_a, g_b)
+        if bad is not None:
+            pair_ok[i] = False
+            if fail[0] < 0:
+                fail = (i, (x, y)) + bad
+    ok = np.array([pair_ok], dtype=bool).reshape(1, len(pairs))
+    i, xy, o, sa, sb = fail
+    one = lambda v: np.array([v], dtype=np.intp)
+    return Result(source, target, pairs, ok, ok.sum(1),
+                  one(i), np.array([xy], dtype=np.intp), one(o), one(sa), one(sb))
+
+def passthrough(target: GameTable, n_a: int, n_b: int, k: int = 1):
+    """(ga, gb) where both players answer with their own T output."""
+    o  = np.arange(1 << (target.alice_bits + target.bob_bits))
+    ga = np.broadcast_to(o >> target.bob_bits, (k, n_a, len(o)))
+    gb = np.broadcast_to(o & (1 << target.bob_bits) - 1, (k, n_b, len(o)))
+    return ga, gb
+
+# ──────────────────────────  ctoa.py tables  ────────────────────
+# MS-C → MS-A candidates in space.py form: fa (K,6), fb (K,9), ga (K,8)
+# parity-pool choices per pattern id, gb (K,18) bits per situation.
+_T_BOB_BITS = 3                                 # MS-A Bob answers a line
+_N_OUT      = 1 << (3 + _T_BOB_BITS)
+_LINE_OF    = [code_vec(o >> _T_BOB_BITS, 3) for o in range(_N_OUT)]
+_P_OF       = np.array([PATTERNS.index(tuple(l)) for l in _LINE_OF])
+_POOL_CODE  = np.array([[vec_code(v) for v in pattern_pool(p)] for p in range(len(PATTERNS))])
+_S_OF       = np.array([[situation(box, l) for l in _LINE_OF] for box in range(SHAPE[1][0])])
+
+def from_space(fa, fb, ga, gb):
+    """space.py tables → the (fa, fb, ga, gb) arrays verify() takes."""
+    fa, fb, ga, gb = (np.atleast_2d(np.asarray(t, dtype=np.intp)) for t in (fa, fb, ga, gb))
+    n_fa = SHAPE[0][0]
+    ga_full = _POOL_CODE[_P_OF, ga[:, _P_OF]]                  # (K, 64)
+    ga_full = np.repeat(ga_full[:, None, :], n_fa, axis=1)     # same for every a_c
+    gb_full = gb[:, _S_OF]                                     # (K, 9, 64)
+    return fa, fb, ga_full, gb_full
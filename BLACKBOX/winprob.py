@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+winprob.py  – exact winning probability of (randomised) reductions
+
+verify.py asks whether a reduction wins each legal source pair for
+every target outcome.  Here the same reduction is scored as a
+probability:
+
+    P = Σ_ab π(a,b) Σ_xy FA[a,x] FB[b,y] Σ_o Q[x,y,o] Σ_αβ GA[a,o,α] GB[b,o,β] V[a,b,α,β]
+
+  π   source input distribution                     (n_a, n_b)
+  Q   target behaviour: outcome code given inputs   (x, y, o)
+  V   source win predicate over output codes        (n_a, n_b, α, β)
+  FA / FB / GA / GB   the reduction as stochastic matrices, rows summing
+                      to one (verify()'s integer tables are one-hot rows)
+
+FB / GB may also take verify()'s per-pair form (a, b, y) / (a, b, o, β).
+Every reduction array carries a leading batch axis R, and pair_win()
+contracts each chunk of R in two einsums.  win_probability() then scores
+all (π, reduction) combinations with one matrix product.  Mixtures of
+reduction tables (shared randomness) are weighted sums over the R axis.
+
+The default behaviour is uniform over the target's allowed outcomes,
+which is what the perfect quantum strategy of the magic square game
+produces.
+"""
+import argparse, json
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from gametable import GameTable, load_game
+from verify    import from_space
+
+CHUNK  = 256                                  # reductions per einsum
+EINSUM = ("greedy", 1 << 28)
+
+class Reduction(NamedTuple):
+    fa: np.ndarray              # (R, n_a, x)
+    fb: np.ndarray              # (R, n_b, y)        or (R, n_a, n_b, y)
+    ga: np.ndarray              # (R, n_a, o, α)
+    gb: np.ndarray              # (R, n_b, o, β)     or (R, n_a, n_b, o, β)
+
+# ──────────────────────────  game tensors  ──────────────────────
+def win_tensor(game: GameTable) -> np.ndarray:
+    """V[a, b, α, β] = 1.0 where (α, β) is an allowed output-code pair."""
+    n_alice, n_bob = 1 << game.alice_bits, 1 << game.bob_bits
+    v = np.zeros((game.n_a, game.n_b, n_alice * n_bob))
+    for a, b in game:
+        m = game.mask(a, b)
+        v[a, b] = [m >> o & 1 for o in range(n_alice * n_bob)]
+    return v.reshape(game.n_a, game.n_b, n_alice, n_bob)
+
+def uniform_behaviour(game: GameTable) -> np.ndarray:
+    """Q[x, y, o]: each allowed outcome of a pair equally likely."""
+    v = win_tensor(game).reshape(game.n_a, game.n_b, -1)
+    total = v.sum(-1, keepdims=True)
+    return np.divide(v, total, out=np.zeros_like(v), where=total > 0)
+
+def uniform_pairs(game: GameTable) -> np.ndarray:
+    """π over the pairs that have at least one allowed outcome."""
+    legal = win_tensor(game).reshape(game.n_a, game.n_b, -1).any(-1).astype(float)
+    return legal / legal.sum()
+
+# ──────────────────────────  reductions  ────────────────────────
+def _one_hot(table, n: int) -> np.ndarray:
+    return np.eye(n)[np.asarray(table, dtype=np.intp)]
+
+def deterministic(source: GameTable, target: GameTable, fa, fb, ga, gb) -> Reduction:
+    """verify()-style integer tables → one-hot stochastic matrices."""
+    return Reduction(_one_hot(fa, target.n_a), _one_hot(fb, target.n_b),
+                     _one_hot(ga, 1 << source.alice_bits),
+                     _one_hot(gb, 1 << source.bob_bits))
+
+def from_tables(source: GameTable, target: GameTable, fa, fb, ga, gb) -> Reduction:
+    """ctoa.py (space.py) tables, stacked along axis 0, as a Reduction."""
+    return deterministic(source, target, *from_space(fa, fb, ga, gb))
+
+# ──────────────────────────  contraction  ───────────────────────
+def pair_win(source: GameTable, red: Reduction, q: np.ndarray) -> np.ndarray:
+    """(R, n_a, n_b): probability that each reduction wins each source pair."""
+    v = win_tensor(source)
+    fb_sub = "rby" if red.fb.ndim == 3 else "raby"
+    gb_sub = "rboj" if red.gb.ndim == 4 else "raboj"
+    out = []
+    for lo in range(0, len(red.fa), CHUNK):
+        fa, fb, ga, gb = (t[lo:lo + CHUNK] for t in red)
+        reach = np.einsum(f"rax,{fb_sub},xyo->rabo", fa, fb, q, optimize=EINSUM)
+        score = np.einsum(f"raoi,{gb_sub},abij->rabo", ga, gb, v, optimize=EINSUM)
+        out.append((reach * score).sum(-1))
+    return np.concatenate(out) if out else np.zeros((0, source.n_a, source.n_b))
+
+def win_probability(pi: np.ndarray, wins: np.ndarray) -> np.ndarray:
+    """(P, R) for P input distributions (P, n_a, n_b) and pair_win() output."""
+    pi = np.asarray(pi, dtype=float).reshape(-1, wins.shape[1] * wins.shape[2])
+    return pi @ wins.reshape(len(wins), -1).T
+
+def mix(weights: np.ndarray, wins: np.ndarray) -> np.ndarray:
+    """pair_win() of mixtures: (M, R) weights over the R tables → (M, n_a, n_b)."""
+    return np.tensordot(np.asarray(weights, dtype=float), wins, axes=1)
+
+# ──────────────────────────  main  ──────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="winning probability of a reduction")
+    ap.add_argument("candidate", type=Path,
+                    help="JSON with fA/fB/gA/gB (best.json, anneal_best.json, …)")
+    ap.add_argument("--msa", type=Path, default="MSA/msa_blackbox_outputs.json")
+    ap.add_argument("--msc", type=Path, default="MSC/msc_blackbox_outputs.json")
+    ap.add_argument("--pi", type=Path,
+                    help=".npy (n_a, n_b) source distribution (default uniform on legal pairs)")
+    args = ap.parse_args()
+
+    msa, msc = load_game(args.msa), load_game(args.msc)
+    hit = json.loads(args.candidate.read_text())
+    red = from_tables(msc, msa, *([hit[k]] for k in ("fA", "fB", "gA", "gB")))
+    pi = np.load(args.pi) if args.pi else uniform_pairs(msc)
+    wins = pair_win(msc, red, uniform_behaviour(msa))
+    print(f"winning probability : {win_probability(pi, wins)[0, 0]:.6f}")
+
+if __name__ == "__main__":
+    main()